@@ -2,6 +2,13 @@
 # -----------------------------------------------------------------------------
 # History: MM/DD/YYYY (developer) - description
 #   04/07/2023 (htu) - initial coding
+#   10/18/2026 (htu) - 
+#     1. created the RuleBuilder for the requested standard in process; 
+#        see scripts/check_startup.py for the startup time budgets
+#     2. added --skip_unchanged to process 
+#     3. added --full_scan to get_doc_statistics 
+#     4. added --pub_concurrency to process 
+#     5. added --pub_mode to process 
 # Examples:
 # python rulebuilder.py process --r_ids none  --pub2db 1
 # python rulebuilder.py process --r_ids all  --pub2db 1
@@ -45,10 +52,11 @@ def build_rule(rule_id):
 @click.option('--db_name', type=str, help='Name of database to query.')
 @click.option('--ct_name', type=str, help='Name of container to query.')
 @click.option('--write_file', type=bool, default=True, help='Whether or not to write output to file.')
-def get_doc_statistics(db_name, ct_name, write_file):
+@click.option('--full_scan', default=0, help='A flag indicating whether to read all the documents instead of the ones changed since the last run.')
+def get_doc_statistics(db_name, ct_name, write_file, full_scan):
     rb = RuleBuilder()
     w2f = 1 if write_file else 0 
-    rb.get_doc_stats(db_name, ct_name, wrt2file=w2f)
+    rb.get_doc_stats(db_name, ct_name, wrt2file=w2f, full_scan=full_scan)
 
 
 @cli.command()
@@ -62,11 +70,16 @@ def get_doc_statistics(db_name, ct_name, write_file):
 @click.option('--get_db_rule', default=1, help='A flag indicating whether to get rules from a database.')
 @click.option('--db_name', default=None, help='The name of the database to use.')
 @click.option('--ct_name', default='core_rules_dev', help='The name of the container to use.')
+@click.option('--skip_unchanged', default=1, help='A flag indicating whether to skip the rules that have not changed since their last build.')
+@click.option('--pub_concurrency', default=8, help='The number of rules published to the database at the same time.')
+@click.option('--pub_mode', default='recreate', type=click.Choice(['recreate', 'replace']), help='recreate overwrites the rules in the database; replace only writes the rules that have not changed there since they were read.')
 def process(r_standard:str=None, r_ids:str=None, s_version:str=None, 
             s_class:str=None, s_domain:str=None, 
             wrt2log:int=1, pub2db:int=1, 
-            get_db_rule:int=0, db_name:str=None, ct_name:str=None):
-    rb = RuleBuilder()
+            get_db_rule:int=0, db_name:str=None, ct_name:str=None,
+            skip_unchanged:int=1, pub_concurrency:int=8,
+            pub_mode:str='recreate'):
+    rb = RuleBuilder(r_standard=r_standard)
     if r_ids is None:
         if s_version is None and s_class is None and s_domain is None: 
             v_ids = ["XXXX"]
@@ -82,7 +95,9 @@ def process(r_standard:str=None, r_ids:str=None, s_version:str=None,
     # print(f"Version: {len(v_ves)}: {v_ves}")
     rb.process(r_standard=r_standard,
         r_ids=v_ids, s_version=v_ves, s_class=v_cls, s_domain=v_dos,
-               wrt2log=wrt2log, pub2db=pub2db, get_db_rule=get_db_rule, db_name=db_name, ct_name=ct_name)
+               wrt2log=wrt2log, pub2db=pub2db, get_db_rule=get_db_rule, db_name=db_name, ct_name=ct_name,
+               skip_unchanged=skip_unchanged, pub_concurrency=pub_concurrency,
+               pub_mode=pub_mode)
 
 
 if __name__ == "__main__":
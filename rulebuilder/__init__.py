@@ -1,14 +1,52 @@
-from .get_authorities import get_authorities
-from .get_check import get_check
-from .get_core import get_core
-from .get_desc import get_desc
-from .echo_msg import echo_msg 
-from .get_executability import get_executability
-from .get_existing_rule import get_existing_rule
-from .get_rtype import get_rtype
-from .get_rule_guid import get_rule_guid
-from .get_scope import get_scope
-from .get_sensitivity import get_sensitivity
-from .output_rule2file import output_rule2file
-from .proc_each_sdtm_rule import proc_each_sdtm_rule
-from .proc_sdtm_rules import proc_sdtm_rules
+# Purpose: Package exports for rulebuilder
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - imported the exported functions on first access so
+#     that importing any rulebuilder module does not pull in pandas,
+#     ruamel.yaml and azure.cosmos through this package
+#
+
+import sys
+import types
+import importlib
+
+# each function is defined in a module of the same name
+__all__ = [
+    "get_authorities",
+    "get_check",
+    "get_core",
+    "get_desc",
+    "echo_msg",
+    "get_executability",
+    "get_existing_rule",
+    "get_rtype",
+    "get_rule_guid",
+    "get_scope",
+    "get_sensitivity",
+    "output_rule2file",
+    "proc_each_sdtm_rule",
+    "proc_sdtm_rules",
+]
+
+
+class _LazyPackage(types.ModuleType):
+    def __getattr__(self, name):
+        # only called when the name is not yet an attribute of the package
+        if name in __all__:
+            mod = importlib.import_module("." + name, self.__name__)
+            return getattr(mod, name)
+        raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+
+    def __getattribute__(self, name):
+        # importing rulebuilder.get_core binds the module to the package,
+        # but rulebuilder.get_core has always been the function
+        obj = super().__getattribute__(name)
+        if name in __all__ and isinstance(obj, types.ModuleType):
+            return getattr(obj, name)
+        return obj
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(__all__))
+
+
+sys.modules[__name__].__class__ = _LazyPackage
@@ -0,0 +1,103 @@
+# Purpose: Build the YAML and JSON forms of a rule in one pass
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding to replace build_rule_yaml and the
+#     rename_keys calls in build_rule_yaml and output_rule2file, which
+#     renamed the keys of the rule in place twice
+#   10/18/2026 (htu) - used get_key_styles to build both forms 
+#
+
+import os
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_yaml import dump_yaml
+from rulebuilder.get_key_styles import get_key_styles, get_key_style
+
+
+def build_rule_forms(df_rule_data, js_rule_data):
+    """
+    ================
+    build_rule_forms
+    ================
+    This method walks the rule object once and builds its YAML form with the
+    Variable, Condition and Rule comments at the top and its JSON form. The
+    rule object is not changed.
+
+    Parameters:
+    -----------
+    df_rule_data: dataframe
+        the records of the rule
+    js_rule_data: dict
+        the rule object from proc_each_yaml; its "json" holds the rule
+        with "_" in the keys, e.g., Rule_Type
+
+    returns
+    -------
+        (s_yaml, j_data):
+            s_yaml: the rule in YAML with " " in the keys, e.g., Rule Type,
+                the same as build_rule_yaml
+            j_data: a copy of the rule object with "_" in all the keys and
+                s_yaml as its content, as written by output_rule2file
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    v_msg = "Building the YAML and JSON forms of the rule..."
+    echo_msg(v_prg, v_stp, v_msg, 4)
+    df_data = df_rule_data
+    d_yaml = js_rule_data.get("json")
+
+    # 1.1 build both forms of the rule
+    v_stp = 1.1
+    y_rule, j_rule = get_key_styles(d_yaml, ["yaml", "json"])
+
+    # 1.2 build the YAML content
+    v_stp = 1.2
+    s_cmts  = "# Variable: " + df_data.iloc[0]["Variable"] + "\n"
+    s_cmts += "# Condition: " + df_data.iloc[0]["Condition"] + "\n"
+    s_cmts += "# Rule: " + df_data.iloc[0]["Rule"] + "\n"
+    ts = dump_yaml(y_rule, "rt")
+    s_yaml = ts if ts.startswith("# Variable: ") else s_cmts + ts
+
+    # 2.0 build the JSON data with the YAML content
+    v_stp = 2.0
+    j_data = get_key_style({k: (None if k == "json" else v) 
+                            for k, v in js_rule_data.items()}, "json")
+    j_data["json"] = j_rule
+    j_data["content"] = s_yaml
+    return s_yaml, j_data
+
+
+# Test cases
+if __name__ == "__main__":
+    import json
+    import pandas as pd
+    from rulebuilder.get_yaml import load_yaml
+    from rulebuilder.rename_keys import rename_keys
+    from rulebuilder.build_rule_yaml import build_rule_yaml
+    os.environ["g_lvl"] = "0"
+    s = ("# top\nCore:\n  Id: 'X'  # id\nRule Type: A  # rt\nCheck:\n"
+         "  all:\n    - name: \"A\"\n      a_b: 1\n")
+    df = pd.DataFrame({"Variable": ["V"], "Condition": ["C"], "Rule": ["R"]})
+
+    def _rule():
+        y = load_yaml(s)
+        y["Rule_Type"] = "Record Data"
+        y["Scope"] = {"Classes": {"Include": ["ALL"]}}
+        return {"id": "g", "json": y, "content": None, "status": "new"}
+
+    # Test case 1: the same YAML and JSON as build_rule_yaml and rename_keys
+    r1 = _rule()
+    s_yaml, j_data = build_rule_forms(df, r1)
+    r0 = _rule()
+    rename_keys(r0["json"], "_", " ")
+    s0 = build_rule_yaml(df, r0)
+    rename_keys(r0, " ", "_")
+    r0["content"] = s0
+    assert s_yaml == s0
+    assert json.dumps(j_data) == json.dumps(r0)
+
+    # Test case 2: the rule object is not changed
+    assert json.dumps(r1) == json.dumps(_rule())
+    print("All tests are successful!")
+
+# End of File
@@ -10,16 +10,18 @@
 #   03/29/2023 (htu) - used new rename_keys function to reserve comments
 #   03/30/2023 (htu) - check and test the commentMap
 #   04/05/2023 (htu) - added logic to skip adding comments 
+#   10/18/2026 (htu) - 
+#     1. used the shared round-trip YAML codec from get_yaml 
+#     2. used get_key_style instead of rename_keys so js_rule_data is not 
+#        changed 
 # 
 
 
 import os
-import io
-import ruamel.yaml as yaml 
-from ruamel.yaml import YAML
 from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_yaml import dump_yaml
 from rulebuilder.read_rules import read_rules
-from rulebuilder.rename_keys import rename_keys 
+from rulebuilder.get_key_styles import get_key_style
 from rulebuilder.get_creator_id import get_creator_id
 from rulebuilder.proc_each_sdtm_rule import proc_each_sdtm_rule
 
@@ -38,20 +40,15 @@ def build_rule_yaml (df_rule_data, js_rule_data):
         str: A string containing the YAML representation of the rule, including comments
         based on the values in `df_rule_data`.
     """
-    y1 = YAML()
-    y1.indent(mapping=2, sequence=4, offset=2)
-    y1.preserve_quotes = True
-
     # Only get json for YAML
     df_data = df_rule_data 
     dict_yaml = js_rule_data.get("json")
     # print(f"Dict Keys: {dict_yaml.keys()}")
     # Replace "_" with " " for columns
-    d_yaml = dict_yaml
+    d_yaml = get_key_style(dict_yaml, "yaml")
     # print(f"--------------- D_YAML1 ---------------")
     # print(type(d_yaml))
     # y1.dump(d_yaml, sys.stdout)
-    rename_keys(d_yaml, '_', ' ')
     # print(f"--------------- D_YAML2 ---------------")
     # print(type(d_yaml))
     # y1.dump(d_yaml, sys.stdout)
@@ -61,20 +58,7 @@ def build_rule_yaml (df_rule_data, js_rule_data):
     s_cmts += "# Rule: " + df_data.iloc[0]["Rule"] + "\n"
 
     # convert YAML into string
-    s_yl = yaml.YAML()
-    s_yl.indent(mapping=2, sequence=4, offset=2)
-
-    # Create an in-memory text stream
-    text_stream = io.StringIO()
-
-    # Dump the OrderedDict object into the text stream
-    s_yl.dump(d_yaml, text_stream)
-
-    # Reset the text stream position
-    text_stream.seek(0)
-
-    # Read the YAML-formatted string from the text stream
-    ts = text_stream.read()
+    ts = dump_yaml(d_yaml, "rt")
     s_yaml = ts if ts.startswith("# Variable: ") else s_cmts + ts 
     # print(s_yaml)
 
@@ -3,11 +3,11 @@ import json
 import sys
 from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap
+from rulebuilder.get_yaml import get_yaml
 
 
 def convert_json_to_yaml(json_data, output_file=None, write_to_file=False):
-    yaml = YAML()
-    yaml.indent(mapping=2, sequence=4, offset=2)
+    yaml = get_yaml("rt")
 
     data = json.loads(json_data)
 
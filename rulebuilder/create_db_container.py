@@ -3,17 +3,18 @@
 # History: MM/DD/YYYY (developer) - description
 #   03/31/2023 (htu) - initial coding based on 
 #     https://learn.microsoft.com/en-us/python/api/overview/azure/cosmos-readme?view=azure-python#create-a-container
+#   10/18/2026 (htu) - used ct_name for get_db_cfg and closed its client 
 # 
 
 # import sys 
 # import json 
 from azure.cosmos import PartitionKey, exceptions
-from rulebuilder.get_db_cfg import get_db_cfg
+from rulebuilder.get_db_cfg import get_db_cfg, close_db_clients
 
 
 db = 'library'
 ct = 'core_rules_dev'
-cfg = get_db_cfg(db_name=db, container_name=ct)
+cfg = get_db_cfg(db_name=db, ct_name=ct)
 # json.dump(cfg,sys.stdout, indent=4)
 dbc = cfg["db_conn"]
 
@@ -30,3 +31,5 @@ except exceptions.CosmosResourceNotFoundError:
     print(f"Created container - {ct} in Cosmos DB - {db}.")
 except exceptions.CosmosHttpResponseError:
     raise
+finally:
+    close_db_clients()
@@ -5,24 +5,38 @@
 #   03/23/2023 (htu) - added proc_ap_fa,dc_class and proc_exclude
 #   03/23/2023 (htu) - updated v_pat to capture spaces between not and ()
 #   03/30/2023 (htu) - commented out prints 
+#   10/18/2026 (htu) - 
+#     1. decoded all the records at once with column operations instead of 
+#        iterrows and chained df.iloc[i][...] assignments
+#     2. kept Class and Domain as they are and added Classes_Include and 
+#        Domains_Include for the decoded lists
+#     3. returned a new data frame instead of updating df_data 
 
 import os
 import re 
+import numpy as np
 import pandas as pd
 
+# the columns added by decode_classes
+SCOPE_COLUMNS = ["Classes_Include", "Classes_Exclude",
+                 "Domains_Include", "Domains_Exclude"]
+
+
 def decode_classes(df_data, df_map = None):
     """
     Decodes certain classes and domains in a Pandas DataFrame and adds the decoded values to new columns.
 
     Args:
-        df_data (pandas.DataFrame): The DataFrame to be processed.
+        df_data (pandas.DataFrame): The DataFrame to be processed. It can be the whole rule 
+            catalog so that the decoding is done once for all the rules.
         df_map (dict, optional): A lookup table for mapping certain class and domain values to their decoded values.
             Defaults to None.
 
     Returns:
-        pandas.DataFrame: The updated DataFrame with decoded values in new columns.
+        pandas.DataFrame: A copy of df_data with the lists in Classes_Include, Classes_Exclude,
+            Domains_Include and Domains_Exclude. An Exclude value is None if the record 
+            does not exclude any class or domain.
     """
-    df = df_data 
     # 1. define a lookup table
     if df_map == None: 
         df_map = {
@@ -30,121 +44,74 @@ def decode_classes(df_data, df_map = None):
                       "SPC": "SPECIAL PURPOSE", "TDM": "TRIAL DESIGN", "AP": "ASSOCIATE PERSONS"
                 },
             "fa": {"FND:FA": "FINDINGS ABOUT"},
-            "v_pat": re.compile("NOT\s*\(([\w ,]+)\)", re.IGNORECASE)
+            "v_pat": re.compile(r"NOT\s*\(([\w ,]+)\)", re.IGNORECASE)
         }
     v_pat = re.compile(
-        "NOT\s*\(([\w ,]+)\)", re.IGNORECASE) if not df_map.get("v_pat") else df_map.get("v_pat")
-
-    # 2. define sub functiokns 
-    # print(f"FF: {fa_class['FND:FA']}")
-    def proc_ap_fa (i,v_class, v_domain):
-        r_bool  = False
-        # 4.1.a process AP and ALL
-        if v_class in ("AP") and v_domain in ("ALL"):
-            df.iloc[i]["Class"] = ["ALL"]
-            df.iloc[i]["Domain"] = ["AP--"]
-            r_bool = True
-        
-        # 4.1.b process NOT (AP) and ALL
-        m1 = re.search(v_pat, v_class) 
-        m2 = re.search(v_pat, v_domain)
-        if m1:
-            s1 = m1.group(1).upper()
-            # print(f" . M1: {m1} --> {s1}") 
-            if s1 == "AP" and v_domain == "ALL":
-                df.iloc[i]["Class"] = ["ALL"]
-                df.iloc[i]["Domain"] = []
-                df.iloc[i]["Domains_Exclude"] = ["AP--"]
-                r_bool = True
-            if s1 == "FND" and v_domain == "FA":
-                k2 = s1 + ":" + v_domain
-                df.iloc[i]["Class"] = []
-                df.iloc[i]["Domain"] = ["ALL"]
-                df.iloc[i]["Classes_Exclude"] = [df_map["fa"].get(k2)] 
-                r_bool = True
-
-        # 4.1.c process FND and FA
-        k1 = v_class + ":" + v_domain
-        if k1 == "FND:FA":
-            df.iloc[i]["Class"] = [df_map["fa"].get(k1)]
-            r_bool = True
-        
-        # 4.1.d process Not (FND) and FA
-        if m2: 
-            s2 = m2.group(1).upper()
-            k2 = s2 + ":" + v_domain
-            # print(f" . M2: {m2} --> {s2}")
-            if s2 == "FND" and v_domain == "FA":
-                df.iloc[i]["Domain"] = ["ALL"]
-                df.iloc[i]["Classes_Exclude"] = [df_map["fa"].get(k2)]
-                r_bool = True
-        
-        return r_bool 
-
-
-    def dc_class(k) :
-        x = k.strip()
-        r_str = df_map["class"].get(x)
-        # print(f" . {x} --> {r_str}")
-        return x if r_str is None else r_str
-    
-    def proc_exclude(i, v_row, v_typ):
-        # v_str = ", ".join(v_str) if isinstance(v_str, list) else v_str
-        if v_typ == "class":
-            v_str = v_row.Class.upper().strip()
-        else:
-           v_str = v_row.Domain.upper().strip()
-        match = v_pat.search(v_str)
-        if match:
-            s_list = pd.Series(match.group(1).split(","))
-        else:
-            s_list = pd.Series(v_str.split(","))
-        # l_str = s_list.apply(lambda x: [dc_class(x)])
-        #l_str = s_list.apply([dc_class])
-        # print(f"Before: {s_list} ")
-        for j in range(len(s_list)):
-            s_list[j] = dc_class(s_list[j])
-        #print(f"After: {s_list} ")
-        
-        if match:
-            if v_typ == "class":
-                df.iloc[i]['Class'] = []
-                df.iloc[i]['Classes_Exclude'] = s_list.tolist()
-            if v_typ == "domain":
-                df.iloc[i]['Domain'] = []
-                df.iloc[i]['Domains_Exclude'] = s_list.tolist()
-        else:
-            if v_typ == "class":
-                df.iloc[i]['Class'] = s_list.tolist()
-            if v_typ == "domain":
-                df.iloc[i]['Domain'] = s_list.tolist()
-
-        # End of proc_exclude 
-
-    # 3. add two columns in df
-    # df['Classes_Exclude'] = pd.Series([None] * len(df))
-    # df['Domains_Exclude'] = pd.Series([None] * len(df))
-
-    df.loc[:, 'Classes_Exclude'] = pd.Series([None] * len(df))
-    df.loc[:, 'Domains_Exclude'] = pd.Series([None] * len(df))
-
-    # 4. loop through each record 
-    # for row in df.itertuples(index=False):
-    for i, row in df.iterrows():
-        v_ruleid = row.get("Rule ID")
-        v_class = row.Class.upper().strip()
-        v_domain = row.Domain.upper().strip()
-        # print(
-        #     f"{__name__}: Row {i} ({v_ruleid}) - Class: {v_class}\n    Domain: {v_domain}")
-        # 4.1 mapping AP and its domain FA and its class
-        if proc_ap_fa(i, v_class, v_domain):
-            continue
-        
-        # 4.2 process Class exclude
-        proc_exclude(i,row, "class")
-        proc_exclude(i, row, "domain")
-
-    return df 
+        r"NOT\s*\(([\w ,]+)\)", re.IGNORECASE) if not df_map.get("v_pat") else df_map.get("v_pat")
+    c_map = df_map["class"]
+    v_fa = df_map["fa"].get("FND:FA")
+
+    # 2. define sub functions 
+    def dc_list(s):
+        # decode each distinct value once; a catalog only has a few of them
+        u_map = {}
+        for u in s.unique():
+            u_map[u] = [c_map.get(x.strip(), x.strip()) for x in u.split(",")]
+        return s.map(lambda u: list(u_map[u])).astype(object)
+
+    def proc_exclude(v_str):
+        # NOT (a, b) goes to Exclude; anything else goes to Include
+        m = v_str.str.extract(v_pat, expand=False)
+        is_not = m.notna()
+        items = dc_list(m.where(is_not, v_str))
+        v_nil = pd.Series([[] for _ in items.index], index=items.index)
+        v_inc = items.where(~is_not, v_nil)
+        v_exc = items.where(is_not, None)
+        return v_inc, v_exc, m.str.upper()
+
+    df = df_data.reset_index(drop=True)
+    n = df.shape[0]
+    if n == 0:
+        return df.assign(**{c: pd.Series(dtype=object) for c in SCOPE_COLUMNS})
+
+    v_class = df["Class"].fillna("").astype(str).str.upper().str.strip()
+    v_domain = df["Domain"].fillna("").astype(str).str.upper().str.strip()
+
+    # 3. process Class and Domain includes and excludes
+    c_inc, c_exc, s1 = proc_exclude(v_class)
+    d_inc, d_exc, _ = proc_exclude(v_domain)
+    c_inc, c_exc, d_inc, d_exc = [x.to_numpy(dtype=object, copy=True)
+                                  for x in (c_inc, c_exc, d_inc, d_exc)]
+
+    # 4. mapping AP and its domain FA and its class
+    def set_rows(mask, s, v):
+        for i in np.flatnonzero(mask.to_numpy()):
+            s[i] = list(v) if v is not None else None
+
+    # 4.1.a process AP and ALL
+    m_a = (v_class == "AP") & (v_domain == "ALL")
+    # 4.1.b process NOT (AP) and ALL, and NOT (FND) and FA
+    m_b1 = (s1 == "AP") & (v_domain == "ALL")
+    m_b2 = (s1 == "FND") & (v_domain == "FA")
+    # 4.1.c process FND and FA
+    m_c = (v_class == "FND") & (v_domain == "FA")
+
+    m_all = m_a | m_b1 | m_b2 | m_c
+    for s in (c_exc, d_exc):
+        set_rows(m_all, s, None)
+    set_rows(m_a, c_inc, ["ALL"])
+    set_rows(m_a, d_inc, ["AP--"])
+    set_rows(m_b1, c_inc, ["ALL"])
+    set_rows(m_b1, d_inc, [])
+    set_rows(m_b1, d_exc, ["AP--"])
+    set_rows(m_b2, c_inc, [])
+    set_rows(m_b2, d_inc, ["ALL"])
+    set_rows(m_b2, c_exc, [v_fa])
+    set_rows(m_c, c_inc, [v_fa])
+    set_rows(m_c, d_inc, ["FA"])
+
+    return df.assign(Classes_Include=c_inc, Classes_Exclude=c_exc,
+                     Domains_Include=d_inc, Domains_Exclude=d_exc)
 
 
 # Test cases
@@ -153,16 +120,22 @@ if __name__ == "__main__":
     v_prg = __name__ + "::decode_classes"
     os.environ["g_lvl"] = "3"
 
-    d1 = {"1": "One", "2": "Two", "5": "Five"}
-
     # Sample DataFrame
-#    df_data = pd.DataFrame({"Class": ["AP", "EVT, INT,  XX ", " FND ", "Not(AP)", "NOT(APRELSUB, POOLDEF, FA)","EVT, INT"],
-#                            "Domain": ["ALL", "NOT(DS, DV, EX)", "FA", "ALL", "Domain", "NOT(AE, DS, DV, EX)"]})
-    df_data = pd.DataFrame({"Class": ["Not (AP)", "NOT (FND)","ALL"],
-                            "Domain": ["ALL","FA","Not (DS,EX,CM)"]
+    df_data = pd.DataFrame({"Class": ["Not (AP)", "NOT (FND)", "ALL", "EVT, INT,  XX ", "AP", "FND"],
+                            "Domain": ["ALL", "FA", "Not (DS,EX,CM)", "AE", "ALL", "FA"]
                         })
 
     d1 = decode_classes(df_data)
-    print(f"D1: {d1}")
-
-# End of File
\ No newline at end of file
+    print(f"D1: {d1[SCOPE_COLUMNS]}")
+    r = d1.to_dict(orient="records")
+    assert r[0]["Classes_Include"] == ["ALL"] and r[0]["Domains_Exclude"] == ["AP--"]
+    assert r[1]["Classes_Exclude"] == ["FINDINGS ABOUT"] and r[1]["Domains_Include"] == ["ALL"]
+    assert r[2]["Domains_Include"] == [] and r[2]["Domains_Exclude"] == ["DS", "EX", "CM"]
+    assert r[3]["Classes_Include"] == ["EVENTS", "INTERVENTIONS", "XX"]
+    assert r[3]["Classes_Exclude"] is None
+    assert r[4]["Domains_Include"] == ["AP--"]
+    assert r[5]["Classes_Include"] == ["FINDINGS ABOUT"]
+    assert list(df_data.columns) == ["Class", "Domain"]
+    print("All tests are successful!")
+
+# End of File
@@ -10,10 +10,10 @@
 #     2. added g_msg_lvl and g_log_lvl
 #     3. added i and n and level 1 and 2 logging 
 #   04/08/2023 (htu) - writing v_msg to all the log files 
+#   10/18/2026 (htu) - used the shared round-trip YAML codec from get_yaml 
 #
 import os
 import re
-from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap, CommentedSeq
 
 def echo_msg(prg, step, msg, lvl=0, fn=None, i:int=0, n:int=0):
@@ -143,9 +143,8 @@ def echo_msg(prg, step, msg, lvl=0, fn=None, i:int=0, n:int=0):
                 with open(ofn, "a") as f:
                     f.write(f"{v_msg}\n")
             if isinstance(msg, (dict, CommentedMap, CommentedSeq)):
-                y = YAML()
-                y.indent(mapping=2, sequence=4, offset=2)
-                y.preserve_quotes = True
+                from rulebuilder.get_yaml import get_yaml
+                y = get_yaml("rt")
                 with open(ofn, "a") as f: 
                     y.dump(msg, f)
             else: 
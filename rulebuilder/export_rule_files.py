@@ -0,0 +1,96 @@
+# Purpose: Export the rules in the local SQLite rule store to rule files
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding to write the rule store back to the
+#     orig_rules, rules_json and rules_yaml folders
+#
+
+import os
+import json
+from rulebuilder.echo_msg import echo_msg
+
+
+def export_rule_files(store_cfg: dict, out_dir: str, kind: str = "orig"):
+    """
+    =================
+    export_rule_files
+    =================
+    This method writes the rules of a kind in the rule store to files in the
+    folder layout used without a store:
+      orig: out_dir/<name>.json, as in orig_rules
+      json: out_dir/rules_json/<name>.json and out_dir/rules_yaml/<name>.yaml
+            with the content of the document, as output_rule2file writes them
+
+    Parameters:
+    -----------
+    store_cfg: dict
+        the rule store from get_store_cfg
+    out_dir: str
+        the folder to write to
+    kind: str
+        orig for the existing rules or json for the built rules
+
+    returns
+    -------
+        the number of rules exported
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    conn = (store_cfg or {}).get("st_conn")
+    if conn is None:
+        v_msg = "No rule store is provided."
+        echo_msg(v_prg, v_stp, v_msg, 0)
+        return 0
+
+    # 1.1 make the folders
+    v_stp = 1.1
+    j_dir = out_dir if kind == "orig" else out_dir + "/rules_json"
+    y_dir = None if kind == "orig" else out_dir + "/rules_yaml"
+    for d in [j_dir, y_dir]:
+        if d is not None and not os.path.exists(d):
+            v_msg = "Making dir - " + d
+            echo_msg(v_prg, v_stp, v_msg, 3)
+            os.makedirs(d)
+
+    # 2.0 write the files
+    v_stp = 2.0
+    n = 0
+    cur = conn.execute("SELECT name, doc FROM rules WHERE kind = ? "
+                       "ORDER BY name", (kind,))
+    for name, s_doc in cur:
+        doc = json.loads(s_doc)
+        with open(f"{j_dir}/{name}.json", "w") as f:
+            json.dump(doc, f, indent=4)
+        if y_dir is not None and doc.get("content") is not None:
+            with open(f"{y_dir}/{name}.yaml", "w") as f:
+                f.write(doc["content"])
+        n += 1
+    v_msg = f"Exported {n} {kind} rules to {out_dir}"
+    echo_msg(v_prg, v_stp, v_msg, 2)
+    return n
+
+
+# Test cases
+if __name__ == "__main__":
+    import tempfile
+    from rulebuilder.get_store_cfg import get_store_cfg
+    from rulebuilder.import_rule_files import import_rule_files
+    os.environ["g_lvl"] = "0"
+    t_dir = tempfile.mkdtemp()
+    cfg = get_store_cfg(t_dir + "/rules.sqlite")
+    os.makedirs(t_dir + "/in")
+    doc = {"id": "g1", "json": {"Core": {"Id": "X", "Status": "Draft"}},
+           "content": "Core:\n  Id: X\n"}
+    with open(t_dir + "/in/CG0001-Draft.json", "w") as f:
+        json.dump(doc, f, indent=4)
+    # Test case 1: the files exported are the same as the files imported
+    assert import_rule_files(cfg, t_dir + "/in", "json") == 1
+    assert export_rule_files(cfg, t_dir + "/out", "json") == 1
+    with open(t_dir + "/out/rules_json/CG0001-Draft.json") as f:
+        assert json.load(f) == doc
+    with open(t_dir + "/out/rules_yaml/CG0001-Draft.yaml") as f:
+        assert f.read() == doc["content"]
+    print("All tests are successful!")
+
+# End of File
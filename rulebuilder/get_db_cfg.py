@@ -4,13 +4,61 @@
 #   03/31/2023 (htu) - initial coding based on
 #     https://learn.microsoft.com/en-us/python/api/overview/azure/cosmos-readme?view=azure-python#create-a-container
 #   04/03/2023 (htu) - renamed container_name to ct_name 
+#   10/18/2026 (htu) - kept the clients and configurations in a registry 
+#     so that one client and its connection pool is shared in a process; 
+#     added close_db_clients 
 #
 
 import os
+import atexit
+import threading
 from dotenv import load_dotenv
 from rulebuilder.echo_msg import echo_msg
 from azure.cosmos import CosmosClient, exceptions
 
+# {(url, key): CosmosClient} and {(url, key, db_name, ct_name): db_cfg} for 
+# the accounts, databases and containers connected to in this process 
+_clients = {}
+_db_cfgs = {}
+_client_lock = threading.RLock()
+
+
+def get_db_client(url: str, key: str):
+    """
+    Returns the shared CosmosClient of the account at url, creating it on 
+    the first call. 
+    """
+    with _client_lock:
+        cln = _clients.get((url, key))
+        if cln is None:
+            cln = CosmosClient(url, credential=key)
+            _clients[(url, key)] = cln
+        return cln
+
+
+def close_db_clients():
+    """
+    Closes the shared clients and their connection pools and empties the 
+    registry; the next get_db_cfg creates new clients. It is also called 
+    when the process exits. 
+    """
+    v_prg = __name__ + ".close_db_clients"
+    v_stp = 1.0
+    with _client_lock:
+        clns = list(_clients.values())
+        _clients.clear()
+        _db_cfgs.clear()
+    for cln in clns:
+        try:
+            cln.__exit__(None, None, None)
+        except Exception as e:
+            v_msg = f"Could not close a DB client: {e}"
+            echo_msg(v_prg, v_stp, v_msg, 1)
+
+
+atexit.register(close_db_clients)
+
+
 def get_db_cfg (db_name:str='library',ct_name:str=None):
     """
     Retrieves the configuration for a database and an optional container in an Azure Cosmos DB account.
@@ -26,6 +74,10 @@ def get_db_cfg (db_name:str='library',ct_name:str=None):
     Raises:
     Nothing is raised. If the database or container does not exist, a message is printed to the console.
 
+    The client is shared by all the configurations of an account, and a 
+    complete configuration is returned from the registry (as a new dict) 
+    on later calls, until close_db_clients is called. 
+
     """
     v_prg = __name__
     v_stp = 1.0
@@ -42,11 +94,19 @@ def get_db_cfg (db_name:str='library',ct_name:str=None):
     load_dotenv()
     url = os.getenv("DEV_COSMOS_URL")
     key = os.getenv("DEV_COSMOS_KEY")
+    cfg_key = (url, key, db_name, ct_name)
+    with _client_lock:
+        db_cfg = _db_cfgs.get(cfg_key)
+    if db_cfg is not None:
+        v_stp = 1.20
+        v_msg = f"Reuse database connections for {db_name}.{ct_name}"
+        echo_msg(v_prg, v_stp, v_msg,3)
+        return dict(db_cfg)
     db_cfg = {"url": url, "key": key, "db_name": db_name, 
               "ct_name": ct_name}
     try:
         v_stp = 1.21
-        cln = CosmosClient(url, credential=key)
+        cln = get_db_client(url, key)
         v_msg = f"Create database client for {db_name}"
         db_cfg["db_client"] = cln
         echo_msg(v_prg, v_stp, v_msg,3)
@@ -89,6 +149,10 @@ def get_db_cfg (db_name:str='library',ct_name:str=None):
         v_msg = "No container name is specified."
         echo_msg(v_prg, v_stp, v_msg,0)
 
+    # 1.5 keep the configuration if it has all the connections 
+    if ct_name is None or "ct_conn" in db_cfg:
+        with _client_lock:
+            _db_cfgs[cfg_key] = dict(db_cfg)
     return db_cfg 
 
 
@@ -0,0 +1,126 @@
+# Purpose: Read the existing rule documents of many rules from a Cosmos DB
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding to prefetch the rule documents that
+#     read_db_rule reads one at a time
+#
+
+import os
+import sys
+import json
+from rulebuilder.get_db_cfg import get_db_cfg
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_doc_snapshot import get_doc_snapshot
+from azure.cosmos.exceptions import CosmosHttpResponseError
+
+# the number of document ids in one IN query; the SQL of a query is limited
+# in size and in the number of values in an IN list
+CHUNK_SIZE = 100
+
+
+def get_db_rules(rule_ids: list, db_cfg=None, r_ids=None,
+                 db_name: str = None, ct_name: str = None,
+                 chunk_size: int = CHUNK_SIZE):
+    """
+    ============
+    get_db_rules
+    ============
+    This method reads the rule documents of a list of rules in batches, one
+    query for every chunk_size documents, instead of one read_item for each
+    rule. It reads the same document read_db_rule reads for a rule: the
+    first document id of the rule in r_ids.
+
+    Parameters:
+    -----------
+    rule_ids: list
+        a list of rule ids, e.g., ["CG0001", "CG0002"]
+    db_cfg: dict
+        the DB configuration from get_db_cfg
+    r_ids: dict
+        the doc stats from get_doc_stats; the cached ones from
+        get_doc_snapshot are used if it is not provided
+    db_name: str
+        database name, used if db_cfg is not provided
+    ct_name: str
+        container name, used if db_cfg is not provided
+    chunk_size: int
+        the number of documents read in one query
+
+    returns
+    -------
+        r_docs: a dict of {doc_id: rule document}; the rules not in r_ids or
+            not read are not in it, so read_db_rule can read them one at a
+            time as before
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    v_msg = "Prefetching the existing rules from the DB..."
+    echo_msg(v_prg, v_stp, v_msg, 2)
+
+    # 1.1 get db connection
+    v_stp = 1.1
+    if db_cfg is None:
+        if db_name is not None and ct_name is not None:
+            db_cfg = get_db_cfg(db_name=db_name, ct_name=ct_name)
+        else:
+            v_msg = "No DB configuration is provided."
+            echo_msg(v_prg, v_stp, v_msg, 0)
+            return {}
+    ctc = db_cfg.get("ct_conn")
+    db = db_cfg.get("db_name")
+    ct = db_cfg.get("ct_name")
+    if ctc is None:
+        v_msg = f"No container connection for {db}.{ct}"
+        echo_msg(v_prg, v_stp, v_msg, 0)
+        return {}
+
+    # 1.2 get rule stats
+    v_stp = 1.2
+    if r_ids is None:
+        r_ids = get_doc_snapshot(db=db, ct=ct, db_cfg=db_cfg) or {}
+
+    # 2.0 get the doc id of each rule
+    v_stp = 2.0
+    d_ids = []
+    for rule_id in dict.fromkeys(rule_ids):
+        r_docs = r_ids.get(rule_id, {}).get("ids")
+        if r_docs:
+            d_ids.append(r_docs[0])
+    v_msg = f" . Found {len(d_ids)}/{len(rule_ids)} rules in {db}.{ct}"
+    echo_msg(v_prg, v_stp, v_msg, 3)
+
+    # 3.0 read the docs in chunks
+    r_docs = {}
+    chunk_size = max(1, chunk_size)
+    for i in range(0, len(d_ids), chunk_size):
+        v_stp = 3.1
+        d_chunk = d_ids[i:i + chunk_size]
+        p_names = [f"@id{j}" for j in range(len(d_chunk))]
+        qry = f"SELECT * FROM c WHERE c.id IN ({', '.join(p_names)})"
+        prm = [{"name": n, "value": d} for n, d in zip(p_names, d_chunk)]
+        try:
+            for doc in ctc.query_items(query=qry, parameters=prm,
+                                       enable_cross_partition_query=True):
+                r_docs[doc.get("id")] = doc
+        except CosmosHttpResponseError as e:
+            v_stp = 3.2
+            v_msg = f"Could not read docs {i + 1}-{i + len(d_chunk)}: {e}"
+            echo_msg(v_prg, v_stp, v_msg, 0)
+    v_stp = 3.3
+    v_msg = f"Prefetched {len(r_docs)}/{len(d_ids)} docs from {db}.{ct}"
+    echo_msg(v_prg, v_stp, v_msg, 2)
+    return r_docs
+
+
+# Test cases
+if __name__ == "__main__":
+    # set input parameters
+    os.environ["g_lvl"] = "3"
+    rule_list = ["CG0015", "CG0373", "CG0378"]
+    db = 'library'
+    ct = 'editor_rules_dev'
+    r = get_db_rules(rule_list, db_name=db, ct_name=ct)
+    json.dump(list(r.keys()), sys.stdout, indent=4)
+
+# End of File
@@ -12,6 +12,7 @@
 #     3. extracted out replace_operator function 
 #     4. extracted out get_jmsg
 #   03/22/2023 (htu) - added exist_rule_data
+#   10/18/2026 (htu) - added r_jmsg from get_rule_jmsgs 
 #    
 #
 import pandas as pd
@@ -21,7 +22,7 @@ from rulebuilder.get_jmsg import get_jmsg
 from rulebuilder.get_existing_rule import get_existing_rule
 
 
-def get_desc(rule_data, exist_rule_data: dict = {}):
+def get_desc(rule_data, exist_rule_data: dict = {}, r_jmsg: str = None):
     """
     Returns a string describing the trigger condition based on the given rule data.
 
@@ -34,6 +35,10 @@ def get_desc(rule_data, exist_rule_data: dict = {}):
         a data frame containng all the records for a rule that already developed. It 
         can be read from the existing rule folder using get_existing_rule. 
 
+    r_jmsg: str
+        the message built for the rule by get_rule_jmsgs. It is used instead 
+        of calling get_jmsg.
+
     Returns:
         A string describing the trigger condition.
 
@@ -42,7 +47,7 @@ def get_desc(rule_data, exist_rule_data: dict = {}):
     """
     v_desc = exist_rule_data.get("json",{}).get("Description")
     if v_desc == None:
-        jmsg = get_jmsg(rule_data)
+        jmsg = get_jmsg(rule_data) if r_jmsg is None else r_jmsg
         # print(f"jmsg: {jmsg}")  # Debugging print statement
         v_desc = "Trigger error when " + jmsg
         # print(f"desc: {desc}")  # Debugging print statement
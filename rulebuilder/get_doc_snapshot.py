@@ -0,0 +1,257 @@
+# Purpose: Get a snapshot of the rule ids and doc ids in a Cosmos DB
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding so that reading or publishing a single
+#     rule does not scan the whole container with get_doc_stats
+#   10/18/2026 (htu) - built the snapshot from the docs get_stat_docs keeps
+#     with a _ts watermark instead of a second cache file with a TTL
+#   10/18/2026 (htu) - kept the snapshot on disk with a TTL again, so that a
+#     new process does not query the container at all while it is fresh,
+#     and in the temp folder if output_dir is not set
+#
+
+import os
+import json
+import time
+import tempfile
+import threading
+from dotenv import load_dotenv
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_doc_stats import get_stat_docs
+from azure.cosmos.exceptions import CosmosHttpResponseError
+
+# bump this whenever the layout of the snapshot file changes
+SNAPSHOT_VERSION = "2"
+
+# the number of seconds a snapshot is used before it is read again; it can
+# be set with the doc_stats_ttl environment variable
+SNAPSHOT_TTL = 3600
+
+# {(db, ct): snapshot} for the containers read in this process; the snapshot
+# is the small rule id map read without any query while it is fresh, the
+# docs it is built from are kept by get_stat_docs with a _ts watermark so
+# that building it again only reads the docs changed since
+_snapshots = {}
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot_fn(db: str, ct: str):
+    """
+    Returns the snapshot file of db.ct in output_dir, or in the temp folder
+    if output_dir is not set.
+    """
+    load_dotenv()
+    out_dir = os.getenv("output_dir")
+    if out_dir is None:
+        out_dir = os.path.join(tempfile.gettempdir(), "crbuilder")
+    return os.path.join(out_dir, f".doc_stats-{db}.{ct}.json")
+
+
+def _read_snapshot(fn: str):
+    if not os.path.isfile(fn):
+        return None
+    try:
+        with open(fn, "r") as f:
+            snap = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return snap if snap.get("version") == SNAPSHOT_VERSION else None
+
+
+def _output_snapshot(fn: str, snap: dict):
+    os.makedirs(os.path.dirname(fn), exist_ok=True)
+    fn_tmp = fn + ".tmp"
+    with open(fn_tmp, "w") as f:
+        json.dump(snap, f)
+    os.replace(fn_tmp, fn)
+
+
+def get_snapshot_ids(s_docs: list):
+    """
+    Returns the rule id to doc ids map of the STATS_QRY fields in s_docs,
+    with the same rule ids get_doc_stats gives.
+    """
+    r_ids = {}
+    for d in s_docs:
+        r_id = d.get("r_id")
+        if r_id is None:
+            r_id = d.get("r_id2")
+        if r_id is None:
+            r_id = "NoRuleID"
+        if r_id not in r_ids:
+            r_ids[r_id] = {"cnt": 0, "ids": [], "status": []}
+        r_ids[r_id]["cnt"] += 1
+        r_ids[r_id]["ids"].append(d.get("id"))
+        r_ids[r_id]["status"].append(d.get("core_status"))
+    return r_ids
+
+
+def get_doc_snapshot(db: str = None, ct: str = None, db_cfg=None,
+                     ttl: int = None, refresh: bool = False):
+    """
+    ================
+    get_doc_snapshot
+    ================
+    This method returns the rule id to doc ids map of a container, as
+    get_doc_stats does, from a snapshot kept in memory and on disk. The
+    container is not queried while the snapshot is younger than ttl
+    seconds; after that, on refresh or after drop_doc_snapshot, the map is
+    built again from get_stat_docs, which only reads the docs changed
+    since its last run.
+
+    Parameters:
+    -----------
+    db: str
+        database name; the default is db_name in db_cfg
+    ct: str
+        container name; the default is ct_name in db_cfg
+    db_cfg: dict
+        the DB configuration from get_db_cfg; it is only needed when the
+        container is read
+    ttl: int
+        the maximum age of the snapshot in seconds; the default is the
+        doc_stats_ttl environment variable or SNAPSHOT_TTL
+    refresh: bool
+        read the changes in the container even if there is a snapshot
+
+    returns
+    -------
+        r_ids: a dict of {rule_id: {"cnt": n, "ids": [doc ids],
+            "status": [core status of each doc]}} or None if the container
+            could not be read
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    if db_cfg is not None:
+        db = db_cfg.get("db_name") if db is None else db
+        ct = db_cfg.get("ct_name") if ct is None else ct
+    if ttl is None:
+        ttl = int(os.getenv("doc_stats_ttl", SNAPSHOT_TTL))
+    key = (db, ct)
+    fn = get_snapshot_fn(db, ct)
+    now = time.time()
+
+    with _snapshot_lock:
+        # 1.1 use the snapshot in memory or in the snapshot file
+        v_stp = 1.1
+        if not refresh:
+            snap = _snapshots.get(key)
+            if snap is None or now - snap["built"] > ttl:
+                snap = _read_snapshot(fn)
+            if snap is not None and now - snap["built"] <= ttl:
+                _snapshots[key] = snap
+                v_msg = f"Using the doc stats of {db}.{ct} from " + \
+                    time.strftime("%Y-%m-%d %H:%M:%S",
+                                  time.localtime(snap["built"]))
+                echo_msg(v_prg, v_stp, v_msg, 3)
+                return snap["r_ids"]
+
+        # 2.0 read the changes in the container
+        v_stp = 2.0
+        if db_cfg is None:
+            from rulebuilder.get_db_cfg import get_db_cfg
+            db_cfg = get_db_cfg(db_name=db, ct_name=ct)
+        ctc = db_cfg.get("ct_conn")
+        if ctc is None:
+            v_msg = f"No container connection for {db}.{ct}"
+            echo_msg(v_prg, v_stp, v_msg, 0)
+            return None
+        v_msg = f"Reading the doc stats of {db}.{ct}..."
+        echo_msg(v_prg, v_stp, v_msg, 2)
+        try:
+            r_ids = get_snapshot_ids(get_stat_docs(ctc, db, ct))
+        except CosmosHttpResponseError as e:
+            v_stp = 2.1
+            v_msg = f"Could not read the doc stats of {db}.{ct}: {e}"
+            echo_msg(v_prg, v_stp, v_msg, 0)
+            return None
+
+        # 3.0 keep the snapshot
+        v_stp = 3.0
+        snap = {"version": SNAPSHOT_VERSION, "db": db, "ct": ct,
+                "built": now, "r_ids": r_ids}
+        _snapshots[key] = snap
+        try:
+            _output_snapshot(fn, snap)
+        except OSError as e:
+            v_msg = f"Could not write the doc stats to {fn}: {e}"
+            echo_msg(v_prg, v_stp, v_msg, 1)
+        v_msg = f"Found {len(r_ids)} rules in {db}.{ct}"
+        echo_msg(v_prg, v_stp, v_msg, 3)
+        return r_ids
+
+
+def drop_doc_snapshot(db: str, ct: str):
+    """
+    Drops the snapshot of db.ct, in memory and on disk, after the docs in
+    the container have been added, replaced or deleted; the next
+    get_doc_snapshot reads the docs changed since the watermark of
+    get_stat_docs.
+    """
+    with _snapshot_lock:
+        _snapshots.pop((db, ct), None)
+        fn = get_snapshot_fn(db, ct)
+        if os.path.isfile(fn):
+            os.remove(fn)
+
+
+# Test cases
+if __name__ == "__main__":
+    class _Container:
+        # a container with two docs for CG0001 and one without a rule id
+        def __init__(self):
+            self.docs = [
+                {"id": "g1", "core_status": "Draft", "r_id": "CG0001",
+                 "_ts": 1},
+                {"id": "g2", "core_status": "Published", "r_id2": "CG0001",
+                 "_ts": 2},
+                {"id": "g3", "core_status": None, "_ts": 3}]
+            self.n_qry = 0
+
+        def query_items(self, query, parameters=None, **kwargs):
+            self.n_qry += 1
+            if query.startswith("SELECT VALUE c.id"):
+                return [d["id"] for d in self.docs]
+            ts = parameters[0]["value"] if parameters else 0
+            return [d for d in self.docs if d["_ts"] >= ts]
+
+    import tempfile
+    os.environ["g_lvl"] = "0"
+    os.environ["output_dir"] = tempfile.mkdtemp()
+    ctc = _Container()
+    cfg = {"db_name": "library", "ct_name": "test", "ct_conn": ctc}
+    # Test case 1: the container is read once
+    r1 = get_doc_snapshot(db_cfg=cfg)
+    r2 = get_doc_snapshot(db_cfg=cfg)
+    assert r1 == r2 and ctc.n_qry == 1
+    assert r1["CG0001"]["ids"] == ["g1", "g2"]
+    assert r1["CG0001"]["status"] == ["Draft", "Published"]
+    assert r1["NoRuleID"]["cnt"] == 1
+
+    # Test case 2: a new process uses the snapshot file without a query
+    _snapshots.clear()
+    assert get_doc_snapshot(db_cfg=cfg) == r1 and ctc.n_qry == 1
+
+    # Test case 3: an expired, dropped or refreshed snapshot only reads
+    #   the changes since the watermark and the doc ids
+    ctc.docs[0]["r_id"] = "CG0002"
+    ctc.docs[0]["_ts"] = 4
+    r3 = get_doc_snapshot(db_cfg=cfg, ttl=-1)
+    assert ctc.n_qry == 3 and r3["CG0002"]["ids"] == ["g1"]
+    del ctc.docs[1]
+    drop_doc_snapshot("library", "test")
+    _snapshots.clear()
+    r4 = get_doc_snapshot(db_cfg=cfg)
+    assert ctc.n_qry == 5 and "CG0001" not in r4
+    get_doc_snapshot(db_cfg=cfg, refresh=True)
+    assert ctc.n_qry == 7
+
+    # Test case 4: without output_dir the snapshot is kept in the temp
+    #   folder
+    del os.environ["output_dir"]
+    assert get_snapshot_fn("library", "test").startswith(
+        tempfile.gettempdir())
+    print("All tests are successful!")
+
+# End of File
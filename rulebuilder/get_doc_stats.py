@@ -8,28 +8,256 @@
 #   04/07/2023 (htu) - 
 #     1. added job_id and populated values for doc_cnt and dup_ids 
 #     2. added db_cfg 
+#   10/18/2026 (htu) - 
+#     1. read only the fields in the stats with STATS_QRY a page at a time 
+#        and wrote the result file row by row; added out_fmt and page_size 
+#     2. kept the stats in a snapshot with a _ts watermark and only read the 
+#        docs changed since the last run; added full_scan 
+#     3. made get_stat_docs a generator that streams the docs through the 
+#        snapshot file, one doc per line, instead of holding all of them 
 #
 import os
-import pandas as pd
+import csv
+import json
+import shutil
 import datetime as dt
 from rulebuilder.get_db_cfg import get_db_cfg
 from rulebuilder.echo_msg import echo_msg
 from dotenv import load_dotenv
-from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from azure.cosmos.exceptions import CosmosHttpResponseError
+
+# bump this whenever the layout of the stats snapshot file changes
+STATS_VERSION = "2"
+
+STAT_COLUMNS = ["rule_id", "core_id",  "user_id", "guid_id", "created",
+                "changed", "rule_status", "version", "doc_cnt", "dup_ids"]
+
+# only the fields in the stats are read, not the whole documents; the rule
+# id is read with both spellings of Rule_Identifier
+STATS_QRY = (
+    "SELECT c.id, c.json.Core.Id AS core_id, "
+    "c.json.Core.Status AS core_status, c.creator.id AS user_id, "
+    "c.created, c.changed, "
+    "c.json.Authorities[0].Standards[0].References[0].Rule_Identifier.Id "
+    "AS r_id, "
+    "c.json.Authorities[0].Standards[0].References[0][\"Rule Identifier\"].Id "
+    "AS r_id2, "
+    "ARRAY(SELECT VALUE s.Version FROM a IN c.json.Authorities "
+    "JOIN s IN a.Standards) AS versions, c._ts "
+    "FROM c")
+
+
+def get_stat_fields(i: dict):
+    """
+    Returns the fields of STATS_QRY for a document i: i is returned as is if
+    it is a row of STATS_QRY or the fields are taken from it if it is a
+    whole document, e.g., from a query given to get_doc_stats.
+    """
+    if "json" not in i:
+        return i
+    j = i.get("json") or {}
+    core = j.get("Core", {}) if isinstance(j, dict) else {}
+    r_auth = j.get("Authorities") if isinstance(j, dict) else None
+    r_id = r_id2 = None
+    try:
+        r_ref = r_auth[0].get("Standards")[0].get("References")
+        r_id = (r_ref[0].get("Rule_Identifier") or {}).get("Id")
+        r_id2 = (r_ref[0].get("Rule Identifier") or {}).get("Id")
+    except Exception:
+        pass
+    v_vs = []
+    for authority in r_auth or []:
+        for standard in authority.get("Standards") or []:
+            v_vs.append(standard.get("Version"))
+    return {"id": i.get("id"), "core_id": core.get("Id"),
+            "core_status": core.get("Status"),
+            "user_id": (i.get("creator") or {}).get("id"),
+            "created": i.get("created"), "changed": i.get("changed"),
+            "r_id": r_id, "r_id2": r_id2, "versions": v_vs,
+            "_ts": i.get("_ts")}
+
+
+def get_stats_fn(db: str, ct: str):
+    """
+    Returns the stats snapshot file of db.ct in output_dir, or None if
+    output_dir is not set and the stats are always read in full.
+    """
+    load_dotenv()
+    out_dir = os.getenv("output_dir")
+    if out_dir is None:
+        return None
+    return os.path.join(out_dir, f".doc_stats-{db}.{ct}.docs.json")
+
+
+def _read_stats(fn: str):
+    # returns the header of the snapshot file fn: its first line
+    if fn is None or not os.path.isfile(fn):
+        return None
+    try:
+        with open(fn, "r") as f:
+            snap = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snap, dict) or snap.get("version") != STATS_VERSION:
+        return None
+    return snap
+
+
+def _merge_stats(fn: str, c_docs: dict, d_ids: set, cnt: dict):
+    # yields the docs in the snapshot file fn, a line at a time, with the
+    # changed docs in c_docs applied and the docs not in d_ids dropped
+    with open(fn, "r") as f:
+        f.readline()
+        for ln in f:
+            d = json.loads(ln)
+            k = d.get("id")
+            if k not in d_ids:
+                cnt["del"] += 1
+                continue
+            yield c_docs.pop(k, d)
+    for k, d in c_docs.items():
+        if k in d_ids:
+            yield d
+
+
+def _output_stats(fn: str, snap: dict, fn_docs: str):
+    # writes the header snap and the doc lines in fn_docs to fn
+    fn_tmp = fn + ".new"
+    with open(fn_tmp, "w") as f, open(fn_docs, "r") as f_docs:
+        f.write(json.dumps(snap) + "\n")
+        shutil.copyfileobj(f_docs, f)
+    os.replace(fn_tmp, fn)
+
+
+def get_stat_docs(ctc, db: str, ct: str, full_scan: int = 0,
+                  page_size: int = 1000):
+    """
+    Yields the STATS_QRY fields of all the docs in the container, in the 
+    order they were first read, a page at a time. The docs are also written 
+    to a snapshot file in output_dir, one doc per line, with the latest _ts 
+    read (the watermark); the next call only reads the docs changed since 
+    the watermark and the ids of all the docs, to drop the deleted ones, 
+    and streams the others from the snapshot file. All the docs are read 
+    if full_scan is 1 or there is no snapshot. Only the changed docs and 
+    the ids of all the docs are held in memory; without output_dir the 
+    docs are read in full every time and not kept. 
+    """
+    v_prg = __name__ + ".get_stat_docs"
+    v_stp = 1.0
+    fn = get_stats_fn(db, ct)
+    snap = None if full_scan == 1 else _read_stats(fn)
+    opts = {"enable_cross_partition_query": True, "max_item_count": page_size}
+    cnt = {"del": 0}
+    if snap is not None:
+        # 1.1 read the docs changed since the watermark; a doc changed in 
+        # the same second as the watermark is read again 
+        v_stp = 1.1
+        ts = snap["ts"]
+        qry = STATS_QRY + " WHERE c._ts >= @ts"
+        prm = [{"name": "@ts", "value": ts}]
+        c_docs = {}
+        for i in ctc.query_items(query=qry, parameters=prm, **opts):
+            d = get_stat_fields(i)
+            c_docs[d.get("id")] = d
+        n_chg = len(c_docs)
+        # 1.2 read the ids of all the docs to drop the deleted ones 
+        v_stp = 1.2
+        d_ids = set(ctc.query_items(query="SELECT VALUE c.id FROM c", **opts))
+        docs = _merge_stats(fn, c_docs, d_ids, cnt)
+    else:
+        # 1.3 read all the docs 
+        v_stp = 1.3
+        ts = 0
+        docs = (get_stat_fields(i) for i in
+                ctc.query_items(query=STATS_QRY, **opts))
+
+    # 2.0 yield the docs and write them to the new snapshot as they come 
+    v_stp = 2.0
+    fn_docs = None if fn is None else fn + ".tmp"
+    f = None
+    n_docs = 0
+    try:
+        if fn_docs is not None:
+            try:
+                os.makedirs(os.path.dirname(fn_docs), exist_ok=True)
+                f = open(fn_docs, "w")
+            except OSError as e:
+                v_msg = f"Could not write the stats snapshot to {fn}: {e}"
+                echo_msg(v_prg, v_stp, v_msg, 1)
+        for d in docs:
+            n_docs += 1
+            ts = max(ts, d.get("_ts") or 0)
+            if f is not None:
+                f.write(json.dumps(d) + "\n")
+            yield d
+        if snap is not None:
+            v_msg = f"Applied {n_chg} changed and {cnt['del']} deleted " \
+                f"docs in {db}.{ct}"
+        else:
+            v_msg = f"Read all {n_docs} docs in {db}.{ct}"
+        echo_msg(v_prg, v_stp, v_msg, 2)
+
+        # 2.1 keep the snapshot 
+        v_stp = 2.1
+        if f is not None:
+            f.close()
+            f = None
+            try:
+                _output_stats(fn, {"version": STATS_VERSION, "db": db,
+                                   "ct": ct, "ts": ts}, fn_docs)
+            except OSError as e:
+                v_msg = f"Could not write the stats snapshot to {fn}: {e}"
+                echo_msg(v_prg, v_stp, v_msg, 1)
+    finally:
+        # a scan that failed or was not read to the end is not kept 
+        if f is not None:
+            f.close()
+        if fn_docs is not None and os.path.isfile(fn_docs):
+            os.remove(fn_docs)
+
+
+def _open_report(fn: str):
+    # returns the functions to write a row to and to close the report file;
+    # rows are written as they come in, an xlsx in openpyxl write-only mode
+    if fn.endswith(".csv"):
+        f = open(fn, "w", newline="")
+        wrt = csv.writer(f)
+        wrt.writerow(STAT_COLUMNS)
+        return wrt.writerow, f.close
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(STAT_COLUMNS)
+    return ws.append, lambda: wb.save(fn)
 
 
 def get_doc_stats(qry: str = None, db: str = 'library', 
                   ct: str = 'editor_rules_dev', wrt2file:int=0, 
-                  job_id: str=None,db_cfg = None):
+                  job_id: str=None,db_cfg = None, out_fmt: str = "xlsx",
+                  page_size: int = 1000, full_scan: int = 0):
     """
     Retrieves statistics from a Cosmos DB container.
 
     Parameters:
-    qry (str): the SQL query to execute on the container (default is "SELECT * FROM c")
+    qry (str): the SQL query to execute on the container (default is STATS_QRY,
+        which only reads the fields in the statistics)
     db (str): the name of the Cosmos DB database to connect to (default is "library")
     ct (str): the name of the Cosmos DB container to connect to (default is "editor_rules_dev")
     wrt2file (int): whether to write the result to an Excel file (1) or not (0) (default is 0)
     db_cfg (dict): database configuration 
+    out_fmt (str): the format of the result file: xlsx (default) or csv 
+    page_size (int): the number of documents read in one page 
+    full_scan (int): whether to read all the documents (1) or only the ones 
+        changed since the last run (0) (default is 0) 
+
+    With the default query, the stats of the documents are kept in a 
+    snapshot in output_dir and only the documents changed since the last 
+    run are read; the others are streamed from the snapshot file (see 
+    get_stat_docs). A query given in qry is always run in 
+    full, a page at a time. Each row is written to the result file as it 
+    is processed. 
+    doc_cnt and dup_ids in a row are the counts and ids of the rule so far:
+    the last row of a rule has all its documents. 
 
     Returns:
     A dictionary containing document statistics, where each key is a rule ID and the 
@@ -41,7 +269,7 @@ def get_doc_stats(qry: str = None, db: str = 'library',
     # 1.0 check parameters
 
     if qry is None:
-        qry = "SELECT * FROM c"
+        qry = STATS_QRY
     # query_options = {'enable_cross_partition_query': True}
 
     # . 2.0 get DB configuration
@@ -53,112 +281,76 @@ def get_doc_stats(qry: str = None, db: str = 'library',
     else: 
         cfg = db_cfg 
     ctc = cfg["ct_conn"]
+    db = cfg.get("db_name") or db
+    ct = cfg.get("ct_name") or ct
 
-    # 3.0 Execute the query
-    doc_list = list()
-    try:
-        v_stp = 3.1
-        doc_list = list(
-            ctc.query_items(query=qry,
-                            enable_cross_partition_query=True
-                            # ,partition_key=PartitionKey('id')
-                            ))
-    except CosmosResourceNotFoundError:
-        v_stp = 3.2
-        v_msg = f"Could not run query - {qry}"
-        echo_msg(v_prg, v_stp, v_msg, 0)
-        return
-
-    # 4.0 process the results
-    df_log = pd.DataFrame(columns=["rule_id", "core_id",  "user_id", "guid_id", 
-                                   "created", "changed", "rule_status", "version", 
-                                   "doc_cnt", "dup_ids"])
-    v_stp = 4.1
-    v_msg = "Processing each doc..."
-    echo_msg(v_prg, v_stp, v_msg, 2)
-    r_ids = {}                  # contain a list of rule ids 
-    r_key_with_space = {}
-    rows = []
-    for i in doc_list:
-        df_row = {"rule_id": None, "core_id": None,  "user_id": None, "guid_id": None,
-              "created": None, "changed": None, "rule_status": None, "version": None,
-              "doc_cnt":None, "dup_ids": None}
-
-        doc_id = i.get("id")
-        core_id = i.get("json", {}).get("Core", {}).get("Id")
-        core_status = i.get("json", {}).get("Core", {}).get("Status")
-        # get rule id 
-        try: 
-            r_auth = i.get("json", {}).get("Authorities")
-            r_ref = r_auth[0].get("Standards")[0].get("References")
-            r_id = r_ref[0].get("Rule_Identifier", {}).get("Id")    # rule id 
-        except Exception as e:
-            print(f"Error: {e}\n . DocID: {doc_id},  CoreID: {core_id}")
-            r_id = None 
-        if r_id is None:
-            r_id = r_ref[0].get("Rule Identifier", {}).get("Id")    # wrong way to have rule id 
-            if r_id is not None:
-                if r_id not in r_key_with_space.keys():
-                    r_key_with_space[r_id] = []
-                r_key_with_space[r_id].append(doc_id)
-        if r_id is None:                 # if rule id is still None,
-            r_id = "NoRuleID"            # we assigned "NoRuleID" to it
-        if r_id not in r_ids.keys():
-            r_ids[r_id] = {"cnt":0, "ids": []}
-        r_ids[r_id]["cnt"] += 1
-        r_ids[r_id]["ids"].append(doc_id)
-        df_row.update({"rule_id": r_id})
-        # get a list of IG versions 
-        v_vs = []
-        v_vers = None
-        if r_auth is not None: 
-            for authority in r_auth:
-                for standard in authority['Standards']:
-                    v_vs.append(standard['Version'])
-        v_vers = ", ".join(v_vs)
-        df_row.update({"version": v_vers})
-
-        df_row.update({"core_id": core_id})
-        df_row.update({"user_id": i.get("creator", {}).get("id")})
-        df_row.update({"guid_id": doc_id})
-        df_row.update({"created": i.get("created")})
-        df_row.update({"changed": i.get("changed")})
-        df_row.update({"rule_status": core_status})
-        df_row.update({"doc_cnt": r_ids[r_id]["cnt"]})
-        df_row.update({"dup_ids": r_ids[r_id]["ids"]})
-
-        rows.append(df_row)
-
-    # End of for i in doc_list
-
-    v_stp = 4.2
-    v_msg = "Get doc cnt and dup doc ids..."
-    echo_msg(v_prg, v_stp, v_msg, 2)
-
-
-    df_log = pd.DataFrame.from_records(rows)
-    grouped_data = df_log.groupby("rule_id")
-
-    for rule_id, grp in grouped_data:
-        if grp.shape[0] > 1:  
-            v_msg = f"RuleID: {rule_id}:\n{grp}"
-            echo_msg(v_prg, v_stp, v_msg, 6)
-
-    v_stp = 4.3 
+    # 3.0 open the result file 
+    v_stp = 3.0
+    wrt_row, close_rpt = None, None
     if wrt2file == 1: 
-        v_stp = 4.31
+        v_stp = 3.01
         load_dotenv()
         log_dir = os.getenv("log_dir")
         tm = dt.datetime.now()
         s_dir = tm.strftime("/%Y/%m/%d/")
         if job_id is None: 
             job_id = tm.strftime("%Y%m%d_%H%M%S")
-        rst_fn = log_dir + s_dir + f"job-{job_id}-stat.xlsx"
+        rst_fn = log_dir + s_dir + f"job-{job_id}-stat.{out_fmt}"
         v_msg = "Output result to " + rst_fn + "..." 
         echo_msg(v_prg, v_stp, v_msg,2)
-        df_log.to_excel(rst_fn, index=False)
-    else:
-        v_stp = 4.32
+        wrt_row, close_rpt = _open_report(rst_fn)
+
+    # 4.0 execute the query and process each doc as it is read 
+    v_stp = 4.1
+    v_msg = "Processing each doc..."
+    echo_msg(v_prg, v_stp, v_msg, 2)
+    r_ids = {}                  # contain a list of rule ids 
+    r_key_with_space = {}
+    n_docs = 0
+    try:
+        v_stp = 4.11
+        if qry == STATS_QRY:
+            docs = get_stat_docs(ctc, db, ct, full_scan=full_scan,
+                                 page_size=page_size)
+        else:
+            docs = ctc.query_items(query=qry,
+                                   enable_cross_partition_query=True,
+                                   max_item_count=page_size)
+        for i in docs:
+            n_docs += 1
+            d = get_stat_fields(i)
+            doc_id = d.get("id")
+            r_id = d.get("r_id")
+            if r_id is None:
+                r_id = d.get("r_id2")      # wrong way to have rule id 
+                if r_id is not None:
+                    if r_id not in r_key_with_space.keys():
+                        r_key_with_space[r_id] = []
+                    r_key_with_space[r_id].append(doc_id)
+            if r_id is None:                 # if rule id is still None,
+                r_id = "NoRuleID"            # we assigned "NoRuleID" to it
+            if r_id not in r_ids.keys():
+                r_ids[r_id] = {"cnt":0, "ids": []}
+            r_ids[r_id]["cnt"] += 1
+            r_ids[r_id]["ids"].append(doc_id)
+            if wrt_row is not None:
+                v_vers = ", ".join(str(v) for v in d.get("versions") or [])
+                wrt_row([r_id, d.get("core_id"), d.get("user_id"), doc_id,
+                         d.get("created"), d.get("changed"),
+                         d.get("core_status"), v_vers, r_ids[r_id]["cnt"],
+                         str(r_ids[r_id]["ids"])])
+    except CosmosHttpResponseError as e:
+        v_stp = 4.12
+        v_msg = f"Could not run query - {qry}: {e}"
+        echo_msg(v_prg, v_stp, v_msg, 0)
+        return
+    finally:
+        if close_rpt is not None:
+            close_rpt()
+
+    v_stp = 4.2
+    v_msg = f"Get doc cnt and dup doc ids of {n_docs} docs..."
+    echo_msg(v_prg, v_stp, v_msg, 2)
 
     n = len(r_ids)
     for i in r_ids:
@@ -9,6 +9,11 @@
 #   04/05/2023 (htu) - added db_cfg, db_name, ct_name and r_ids and reading from a DB
 #   04/06/2023 (htu) - commented out "transformer.transformer"
 #   04/07/2023 (htu) - added steps 2.11 and 2.12 to back up the rule read from the DB
+#   10/18/2026 (htu) - 
+#     1. used the shared round-trip YAML codec from get_yaml 
+#     2. parsed the content through the content cache of get_rule_content 
+#     3. added store_cfg to read and back up the rule in the rule store 
+#     4. added r_docs for the rule docs prefetched by get_db_rules 
 #    
 
 import os
@@ -16,18 +21,22 @@ import sys
 from datetime import datetime, timezone
 import uuid
 import json 
-from ruamel.yaml import YAML, parser, scanner
+from ruamel.yaml import parser, scanner
 # from transformer.transformer import Transformer
 from dotenv import load_dotenv
 from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_rule_content import get_rule_content
 from rulebuilder.read_fn_rule import read_fn_rule
 from rulebuilder.read_db_rule import read_db_rule
+from rulebuilder.read_store_rule import read_store_rule
+from rulebuilder.output_rule2store import output_rule2store
 
 
 def get_existing_rule(rule_id, in_rule_folder, 
                       get_db_rule:int = 0, db_cfg = None, r_ids = None, 
                       db_name:str=None, ct_name:str=None,
-                      use_yaml_content:bool=True):
+                      use_yaml_content:bool=True, store_cfg = None,
+                      r_docs = None):
     """
     Get an existing rule based on the given rule_id from a specified folder.
     * If the rule file is found, it returns a dictionary containing the 
@@ -40,6 +49,11 @@ def get_existing_rule(rule_id, in_rule_folder,
     :param in_rule_folder: The folder where the rule files are located.
     :param use_yaml_content: A boolean indicating whether to process and 
            return the YAML content of the rule.
+    :param store_cfg: The rule store from get_store_cfg. If provided, the 
+           existing rules are read from and backed up to the store instead 
+           of in_rule_folder.
+    :param r_docs: The rule docs prefetched by get_db_rules. The rule is 
+           read from the DB only if it is not in r_docs.
     :return: A dictionary containing the rule's metadata and, 
              if use_yaml_content is True, the processed YAML content.
     """
@@ -55,20 +69,34 @@ def get_existing_rule(rule_id, in_rule_folder,
         v_msg = f"Getting rule doc from {ct_name}.{db_name}..."
         echo_msg(v_prg, v_stp, v_msg, 2)
         json_data = read_db_rule(rule_id=rule_id, db_cfg=db_cfg,r_ids=r_ids,
-                                 db_name=db_name,ct_name=ct_name)
+                                 db_name=db_name,ct_name=ct_name,
+                                 r_docs=r_docs)
         v_stp = 2.11
-        if not os.path.exists(in_rule_folder):
-            v_msg = "Making dir - " + in_rule_folder
-            echo_msg(v_prg, v_stp, v_msg, 3)
-            os.makedirs(in_rule_folder)
-        v_stp = 2.12
         v_status = json_data.get(
             "json", {}).get("Core", {}).get("Status")
-        ofn = in_rule_folder + "/" + rule_id + "-" + v_status + ".json"
-        v_msg = f"Backing up the rule to {ofn}..."
+        if store_cfg is not None:
+            v_stp = 2.13
+            v_msg = "Backing up the rule to the rule store..."
+            echo_msg(v_prg, v_stp, v_msg, 2)
+            output_rule2store(store_cfg, "orig", rule_id + "-" + v_status,
+                              json_data, rule_id=rule_id)
+        else:
+            if not os.path.exists(in_rule_folder):
+                v_msg = "Making dir - " + in_rule_folder
+                echo_msg(v_prg, v_stp, v_msg, 3)
+                os.makedirs(in_rule_folder)
+            v_stp = 2.12
+            ofn = in_rule_folder + "/" + rule_id + "-" + v_status + ".json"
+            v_msg = f"Backing up the rule to {ofn}..."
+            echo_msg(v_prg, v_stp, v_msg, 2)
+            with open(ofn, 'w') as f:
+                json.dump(json_data, f, indent=4)
+    elif store_cfg is not None:
+        v_stp = 2.3
+        v_msg = f"Getting rule from {store_cfg.get('store_fn')}..."
         echo_msg(v_prg, v_stp, v_msg, 2)
-        with open(ofn, 'w') as f:
-            json.dump(json_data, f, indent=4)
+        json_data = read_store_rule(rule_id=rule_id, store_cfg=store_cfg,
+                                    kind="orig")
     else: 
         v_stp = 2.2
         v_msg = f"Getting rule file from {in_rule_folder}..."
@@ -108,16 +136,13 @@ def get_existing_rule(rule_id, in_rule_folder,
         if r1 is None or r1 == "null":
             r_json["json"] = {}
     
-    yaml_loader = YAML()
-    yaml_loader.indent(mapping=2, sequence=4, offset=2)
-    yaml_loader.preserve_quotes = True
-
     v_c = r_json.get("content")
     v_stp = 3.3 
     v_msg = "V Content Obj Type: " + str(type(v_c)) 
     echo_msg(v_prg, v_stp, v_msg, 5)
 
-    y_content = {} if v_c is None else yaml_loader.load(v_c)
+    # the parsed content is cached for proc_each_yaml 
+    y_content = {} if v_c is None else get_rule_content(v_c, copy_obj=False)
     v_stp = 3.4 
     v_msg = "Y Content Obj Type: " + str(type(y_content))
     echo_msg(v_prg, v_stp, v_msg, 5)
@@ -135,7 +160,7 @@ def get_existing_rule(rule_id, in_rule_folder,
         echo_msg(v_prg, v_stp, v_msg, 5)
         # print(f"JSON Content: {r_json['content']}")
 
-        y_content = yaml_loader.load(r_json["content"]) or {}
+        y_content = get_rule_content(r_json["content"], copy_obj=False) or {}
          
         # r_json["json"] = Transformer.spaces_to_underscores(
         #    safe_load(r_json["content"]))
@@ -0,0 +1,51 @@
+# Purpose: Get a content hash for a source file
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding for validating the rule definition cache
+#
+
+import os
+import hashlib
+
+
+def get_file_hash(fn: str, blk_size: int = 1024 * 1024):
+    """
+    ===============
+    get_file_hash
+    ===============
+    This method computes a SHA-256 hash of the content of a file.
+
+    Parameters:
+    -----------
+    fn: str
+        a file name with full path
+    blk_size: int
+        number of bytes read at a time (default is 1 MB)
+
+    returns
+    -------
+        a hex string of the hash or None if the file does not exist
+
+    """
+    if fn is None or not os.path.isfile(fn):
+        return None
+    h = hashlib.sha256()
+    with open(fn, "rb") as f:
+        for blk in iter(lambda: f.read(blk_size), b""):
+            h.update(blk)
+    return h.hexdigest()
+
+
+# Test cases
+if __name__ == "__main__":
+    # Test case 1: a file that does not exist
+    assert get_file_hash("./no_such_file.yaml") is None
+
+    # Test case 2: the same file gives the same hash
+    h1 = get_file_hash(__file__)
+    h2 = get_file_hash(__file__)
+    assert h1 == h2 and len(h1) == 64
+
+    print("All tests are successful!")
+
+# End of File
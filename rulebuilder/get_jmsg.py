@@ -3,6 +3,7 @@
 # History: MM/DD/YYYY (developer) - description
 #   03/21/2023 (htu) - extracted out from get_desc 
 #   03/22/2023 (htu) - added exist_rule_data 
+#   10/18/2026 (htu) - added r_jmsg from get_rule_jmsgs 
 #
 
 import pandas as pd
@@ -11,7 +12,7 @@ from rulebuilder.echo_msg import echo_msg
 from rulebuilder.replace_operator import replace_operator
 
 
-def get_jmsg(rule_data, exist_rule_data: dict = {}):
+def get_jmsg(rule_data, exist_rule_data: dict = {}, r_jmsg: str = None):
     """
     Returns a JSON message string based on the given rule data.
 
@@ -24,6 +25,10 @@ def get_jmsg(rule_data, exist_rule_data: dict = {}):
         a data frame containng all the records for a rule that already developed. It 
         can be read from the existing rule folder using get_existing_rule. 
 
+    r_jmsg: str
+        the message built for the rule by get_rule_jmsgs. It is used instead 
+        of building the message from rule_data.
+
     Returns:
         A JSON message string.
 
@@ -35,6 +40,8 @@ def get_jmsg(rule_data, exist_rule_data: dict = {}):
     v_msg = "Getting Message for json.Message..."
     echo_msg(v_prg, v_stp, v_msg, 3)
     r_str = exist_rule_data.get("json", {}).get("Message")
+    if r_str is None and r_jmsg is not None:
+        r_str = r_jmsg
     if r_str is None: 
         r_condition = rule_data.iloc[0]["Condition"]
         r_rule = rule_data.iloc[0]["Rule"]
@@ -0,0 +1,179 @@
+# Purpose: Get copies of a rule with the keys in the YAML or JSON style
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding to replace rename_keys and
+#     convert_keys, which renamed the keys of a rule in place recursively
+#
+
+import os
+from ruamel.yaml.comments import CommentedMap, CommentedSeq, Comment
+
+# style: (a, b) - the a in the keys is replaced with b
+#   yaml: the keys in the YAML files, e.g., Rule Type
+#   json: the keys in the JSON files and the database, e.g., Rule_Type
+KEY_STYLES = {"yaml": ("_", " "), "json": (" ", "_")}
+
+# {style: {key: new key}}; the rules share a small set of keys, so each key
+# is only translated once
+_key_tables = {k: {} for k in KEY_STYLES}
+
+
+def _rename_keys(keys: list, style: str, c_items: dict = None):
+    # returns {new key: key} in the order rename_keys leaves them: a renamed
+    # key is moved to the end unless the new key is already there. The
+    # comments in c_items follow their keys.
+    a, b = KEY_STYLES[style]
+    tbl = _key_tables[style]
+    d = dict(zip(keys, keys))
+    c = None if c_items is None else dict(c_items)
+    for k in keys:
+        nk = tbl.get(k)
+        if nk is None:
+            nk = k.replace(a, b) if isinstance(k, str) else k
+            tbl[k] = nk
+        if nk == k:
+            continue
+        d[nk] = d.pop(k)
+        if c is not None:
+            c[nk] = c.get(k)
+            c.pop(k, None)
+    return d, c
+
+
+def _new_forms(obj, n: int):
+    # empty containers of the same type as obj, one for each style, with
+    # the format and comments of obj; None if obj is not a container
+    if isinstance(obj, CommentedMap):
+        forms = [CommentedMap() for _ in range(n)]
+    elif isinstance(obj, dict):
+        forms = [{} for _ in range(n)]
+    elif isinstance(obj, CommentedSeq):
+        forms = [CommentedSeq() for _ in range(n)]
+    elif isinstance(obj, list):
+        forms = [[] for _ in range(n)]
+    else:
+        return None
+    if isinstance(obj, (CommentedMap, CommentedSeq)):
+        for f in forms:
+            obj.copy_attributes(f)
+    return forms
+
+
+def get_key_styles(obj, styles: list = ["json"]):
+    """
+    ==============
+    get_key_styles
+    ==============
+    This method copies obj once for each style in styles, with the keys of
+    all the nested maps renamed. Each style is applied to the keys of the
+    style before it, e.g., ["yaml", "json"] gives the YAML form and the JSON
+    form written from it. The copies are built in one pass without
+    recursion, keep the comments of CommentedMaps and CommentedSeqs, and
+    obj is not changed.
+
+    Parameters:
+    -----------
+    obj: dict, CommentedMap, list or CommentedSeq
+        the rule or any part of it
+    styles: list
+        the names in KEY_STYLES
+
+    returns
+    -------
+        a list of the copies of obj, one for each style; the scalars are
+        shared with obj
+
+    """
+    n = len(styles)
+    root = _new_forms(obj, n)
+    if root is None:
+        return [obj] * n
+
+    # {id of a container in obj: its copies}, so a container that appears
+    # more than once in obj is copied once
+    memo = {id(obj): root}
+    stack = [(obj, root)]
+    while stack:
+        src, forms = stack.pop()
+        if isinstance(src, dict):
+            keys = list(src.keys())
+            # {key: (value, its copies or None for a scalar)}
+            vals = {}
+            for k in keys:
+                v = src[k]
+                c = memo.get(id(v))
+                if c is None:
+                    c = _new_forms(v, n)
+                    if c is not None:
+                        memo[id(v)] = c
+                        stack.append((v, c))
+                vals[k] = (v, c)
+            # src.ca would add a Comment to src if it does not have one
+            ca0 = getattr(src, Comment.attrib, None)
+            c_items = None if ca0 is None else ca0.items
+            for i, style in enumerate(styles):
+                d, c_items = _rename_keys(keys, style, c_items)
+                f = forms[i]
+                for nk, k in d.items():
+                    v, c = vals[k]
+                    f[nk] = v if c is None else c[i]
+                if ca0 is not None:
+                    ca = Comment()
+                    ca.comment = ca0.comment
+                    ca._post = ca0._post
+                    ca._pre = ca0._pre
+                    ca._items = c_items
+                    setattr(f, Comment.attrib, ca)
+                # the next style renames the keys of this one
+                keys = list(d.keys())
+                vals = {nk: vals[k] for nk, k in d.items()}
+        else:
+            for v in src:
+                c = memo.get(id(v))
+                if c is None:
+                    c = _new_forms(v, n)
+                    if c is not None:
+                        memo[id(v)] = c
+                        stack.append((v, c))
+                for i in range(n):
+                    forms[i].append(v if c is None else c[i])
+    return root
+
+
+def get_key_style(obj, style: str = "json"):
+    """
+    Returns a copy of obj with the keys in the style (see get_key_styles).
+    """
+    return get_key_styles(obj, [style])[0]
+
+
+# Test cases
+if __name__ == "__main__":
+    import json
+    import copy
+    from rulebuilder.rename_keys import rename_keys
+    from rulebuilder.get_yaml import load_yaml, dump_yaml
+    os.environ["g_lvl"] = "0"
+    s = ("# top\nCore:\n  Id: 'X'  # id\nRule Type: A  # rt\nCheck:\n"
+         "  all:\n    - name: \"A\"\n      a_b: 1\n      a b: 2\n")
+    y = load_yaml(s)
+    y["Rule_Type"] = "Record Data"
+    y["Scope"] = {"Classes_X": {"Include": ["ALL"]}}
+    y0 = dump_yaml(y)
+
+    # Test case 1: the same keys, order and comments as rename_keys
+    y_rule, j_rule = get_key_styles(y, ["yaml", "json"])
+    r0 = copy.deepcopy(y)
+    rename_keys(r0, "_", " ")
+    assert dump_yaml(y_rule) == dump_yaml(r0)
+    rename_keys(r0, " ", "_")
+    assert json.dumps(j_rule) == json.dumps(r0)
+    assert dump_yaml(j_rule) == dump_yaml(r0)
+
+    # Test case 2: obj is not changed
+    assert dump_yaml(y) == y0
+    assert get_key_style(["a_b"], "yaml") == ["a_b"]
+    assert get_key_style({"a_b": [{"c d": 1}]}) == {"a_b": [{"c_d": 1}]}
+    print("All tests are successful!")
+
+# End of File
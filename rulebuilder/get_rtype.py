@@ -7,6 +7,7 @@
 #   03/21/2023 (htu) -
 #     10. Rule Type and Sensitivity should be left null
 #   03/22/2023 (htu) - added exist_rule_data
+#   10/18/2026 (htu) - added r_type from get_rule_types 
 #    
 
 import re 
@@ -17,7 +18,7 @@ from rulebuilder.read_rules import read_rules
 # from rulebuilder.get_existing_rule import get_existing_rule
 
 
-def get_rtype(rule_data, exist_rule_data: dict = {}):
+def get_rtype(rule_data, exist_rule_data: dict = {}, r_type: dict = None):
     """
     ===============
     get_rtype
@@ -34,6 +35,10 @@ def get_rtype(rule_data, exist_rule_data: dict = {}):
         a data frame containing all the records for a rule that already developed. It 
         can be read from the existing rule folder using get_existing_rule. 
 
+    r_type: dict 
+        the Rule_Type and Sensitivity of the rule from get_rule_types. It is 
+        used instead of searching the Condition in rule_data.
+
 
     returns
     -------
@@ -69,6 +74,8 @@ def get_rtype(rule_data, exist_rule_data: dict = {}):
         echo_msg(v_prg, v_stp, v_msg, 0)
         return None
     r_str = exist_rule_data.get("json", {}).get("Rule_Type")
+    if r_str is None and r_type is not None:
+        return r_type.get("Rule_Type")
     if r_str is None: 
         r_condition = rule_data.iloc[0]["Condition"]
         # r_rule = rule_data.iloc[0]["Rule"]
@@ -0,0 +1,105 @@
+# Purpose: Get the Authorities standards for all the selected rules 
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding based on get_yaml_authorities to build
+#     the standards of all the rules from column arrays in one pass
+#    
+
+import os
+import pandas as pd
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_rule_index import get_rule_index
+
+# the rule definition columns used in the Authorities
+AUTHO_COLUMNS = ["Rule ID", "SDTMIG Version", "Rule Version", 
+                 "Cited Guidance", "Document", "Item", "Section"]
+
+
+def get_rule_authorities(df_data, r_idx: dict = None):
+    """
+    ====================
+    get_rule_authorities
+    ====================
+    This method builds the standards in json.Authorities, one for each rule
+    definition record, for every rule in df_data. The columns are taken out
+    once so no rows are built with iterrows. get_yaml_authorities replaces
+    a standard with the one in the existing rule that has the same version.
+
+    Parameters:
+    -----------
+    df_data: dataframe
+        the selected rule definitions
+    r_idx: dict
+        the {rule_id: row positions} index from get_rule_index on df_data;
+        it is built if not provided
+
+    returns
+    -------
+        r_stds: a dict of {rule_id: [standard, ...]}
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    if df_data is None or df_data.shape[0] == 0:
+        v_msg = "No rule data is provided."
+        echo_msg(v_prg, v_stp, v_msg, 2)
+        return {}
+    if r_idx is None:
+        r_idx = get_rule_index(df_data)
+
+    # 2.0 take the columns out once
+    v_stp = 2.0
+    n = df_data.shape[0]
+    cols = {c: df_data[c].to_numpy(dtype=object) if c in df_data.columns 
+            else [None] * n for c in AUTHO_COLUMNS}
+    r_stds = {}
+    for rule_id, r_pos in r_idx.items():
+        a_stds = []
+        for i in r_pos:
+            # 2.1 build a citation 
+            v_item = cols["Item"][i]
+            r_a_cit = {"Cited_Guidance": cols["Cited Guidance"][i],
+                       "Document": cols["Document"][i],
+                       "Item": v_item,
+                       "Section": cols["Section"][i]
+                       }
+            if not v_item:  # Check if "Item" is empty
+                del r_a_cit["Item"]
+
+            # 2.2 build a reference and a standard 
+            r_a_ref = {"Origin": "SDTM and SDTMIG Conformance Rules",
+                       "Rule_Identifier": {
+                           "Id": cols["Rule ID"][i],
+                           "Version": cols["Rule Version"][i]
+                       },
+                       "Version": "2.0",
+                       "Citations": [r_a_cit]
+                       }
+            a_stds.append({"Name": "SDTMIG",
+                           "Version": cols["SDTMIG Version"][i],
+                           "References": [r_a_ref]
+                           })
+        r_stds[rule_id] = a_stds
+
+    v_msg = f" . Built Authorities for {len(r_stds)} rules."
+    echo_msg(v_prg, v_stp, v_msg, 3)
+    return r_stds
+
+
+# Test cases
+if __name__ == "__main__":
+    os.environ["g_lvl"] = "3"
+    # Test case 1: a rule with two IG versions
+    df = pd.DataFrame({"Rule ID": ["CG0001", "CG0001"],
+                       "SDTMIG Version": ["3.2", "3.3"],
+                       "Rule Version": ["1", "1"],
+                       "Cited Guidance": ["A", "B"],
+                       "Document": ["IG v3.2", "IG v3.3"],
+                       "Item": ["", "1"],
+                       "Section": ["4.1", "4.1"]})
+    r_stds = get_rule_authorities(df)
+    assert [s["Version"] for s in r_stds["CG0001"]] == ["3.2", "3.3"]
+    assert "Item" not in r_stds["CG0001"][0]["References"][0]["Citations"][0]
+    print("All tests are successful!")
+
+# End of File
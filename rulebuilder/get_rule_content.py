@@ -0,0 +1,87 @@
+# Purpose: Get the parsed YAML content of an existing rule
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding to parse the content of a rule once
+#     and share it between get_existing_rule and proc_each_yaml
+#
+
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from rulebuilder.get_yaml import get_yaml
+
+# the number of parsed contents to keep; a rule is parsed by
+# get_existing_rule and read again shortly after by proc_each_yaml
+CONTENT_CACHE_SIZE = 256
+
+# {hash of content: parsed CommentedMap}, least recently used first
+_content_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_content_key(content: str):
+    """
+    Returns the key of content in the content cache.
+    """
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_rule_content(content: str, copy_obj: bool = True):
+    """
+    ================
+    get_rule_content
+    ================
+    This method parses the YAML content of a rule with the round-trip codec
+    and keeps the result in a cache keyed by the hash of the content, so the
+    same content is only parsed once.
+
+    Parameters:
+    -----------
+    content: str
+        the content of a rule in YAML
+    copy_obj: bool
+        if True, return a deep copy that the caller can change; if False,
+        return the cached object, which must not be changed
+
+    returns
+    -------
+        y_content: a CommentedMap of the content or None if the content is
+            None or empty
+
+    """
+    if content is None:
+        return None
+    k = get_content_key(content)
+    with _cache_lock:
+        y_content = _content_cache.get(k)
+        if y_content is not None:
+            _content_cache.move_to_end(k)
+    if y_content is None:
+        y_content = get_yaml("rt").load(content)
+        if y_content is None:
+            return None
+        with _cache_lock:
+            _content_cache[k] = y_content
+            while len(_content_cache) > CONTENT_CACHE_SIZE:
+                _content_cache.popitem(last=False)
+    return copy.deepcopy(y_content) if copy_obj else y_content
+
+
+# Test cases
+if __name__ == "__main__":
+    from rulebuilder.get_yaml import dump_yaml
+    s = "# rule\nCore:\n  Id: 'CG0001'  # id\n  Status: Draft\n"
+    # Test case 1: the content is parsed once and the copy keeps comments
+    y1 = get_rule_content(s, copy_obj=False)
+    y2 = get_rule_content(s)
+    assert y1 is get_rule_content(s, copy_obj=False) and y2 is not y1
+    assert dump_yaml(y2) == s
+
+    # Test case 2: changing the copy does not change the cached content
+    y2["Core"]["Status"] = "Published"
+    assert get_rule_content(s)["Core"]["Status"] == "Draft"
+    assert get_rule_content("") is None and get_rule_content(None) is None
+    print("All tests are successful!")
+
+# End of File
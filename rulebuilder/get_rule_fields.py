@@ -0,0 +1,227 @@
+# Purpose: Field builders for the json elements of a rule
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding to replace the fixed sequence of get_*
+#     calls in proc_each_yaml with a registry of field builders
+#   10/18/2026 (htu) - added batch_kw and b_args to pass the existing rules
+#     and the cached Condition matches to get_rule_types
+#
+
+import os
+import pandas as pd
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_core import get_core
+from rulebuilder.get_desc import get_desc
+from rulebuilder.get_jmsg import get_jmsg
+from rulebuilder.get_rtype import get_rtype
+from rulebuilder.get_check import get_check
+from rulebuilder.get_scope import get_scope
+from rulebuilder.get_sensitivity import get_sensitivity
+from rulebuilder.get_executability import get_executability
+from rulebuilder.get_yaml_authorities import get_yaml_authorities
+from rulebuilder.get_rule_index import get_rule_index
+from rulebuilder.get_rule_jmsgs import get_rule_jmsgs
+from rulebuilder.get_rule_types import get_rule_types
+from rulebuilder.get_rule_scopes import get_rule_scopes
+from rulebuilder.get_rule_authorities import get_rule_authorities
+
+# Each builder gets a context with rule_id, rule_data, rule_obj (the existing
+# rule) and y2 (the existing rule content). Any other name it reads from the
+# context is another entry in RULE_FIELDS and is built on first use, so each
+# value is computed once per rule.
+#   inputs: the entries the builder reads from the context
+#   build:  builds the value of one rule from the context
+#   batch:  builds the values of all the rules from (df_data, r_idx); the
+#           value of a rule is None if it should be built with build
+#   batch_kw: the names in b_args of get_rule_fields passed to batch
+#   exist:  the key in the existing json; if it is there, the builder is
+#           skipped and its value is used (through from_exist if given)
+#   key:    the json element the value goes to; entries without a key are
+#           intermediate values. Elements are set in the order listed here.
+RULE_FIELDS = {
+    # intermediate values
+    "r_stds": {"inputs": [], "build": lambda c: None,
+               "batch": get_rule_authorities},
+    "r_jmsg": {"inputs": [], "build": lambda c: get_jmsg(c["rule_data"]),
+               "batch": get_rule_jmsgs},
+    "r_type": {"inputs": [], "build": lambda c: None,
+               "batch": get_rule_types, "batch_kw": ["r_exist", "c_types"]},
+    "r_scope": {"inputs": [], "build": lambda c: None,
+                "batch": get_rule_scopes},
+    # json elements
+    "Authorities": {
+        "inputs": ["r_stds"], "key": "Authorities",
+        "build": lambda c: get_yaml_authorities(
+            c["rule_data"], c["y2"], r_stds=c["r_stds"])},
+    "Core": {
+        "inputs": [], "key": "Core", "exist": "Core",
+        "build": lambda c: get_core(c["rule_id"], exist_rule_data=c["rule_obj"])},
+    "Description": {
+        "inputs": ["r_jmsg"], "key": "Description", "exist": "Description",
+        "build": lambda c: get_desc(c["rule_data"], r_jmsg=c["r_jmsg"])},
+    "Outcome": {
+        "inputs": ["r_jmsg"], "key": "Outcome", "exist": "Message",
+        "from_exist": lambda v: {"Message": v},
+        "build": lambda c: {"Message": get_jmsg(c["rule_data"],
+                                                r_jmsg=c["r_jmsg"])}},
+    "Rule_Type": {
+        "inputs": ["r_type"], "key": "Rule_Type", "exist": "Rule_Type",
+        "build": lambda c: get_rtype(c["rule_data"], r_type=c["r_type"])},
+    "Sensitivity": {
+        "inputs": ["r_type"], "key": "Sensitivity", "exist": "Sensitivity",
+        "build": lambda c: get_sensitivity(c["rule_data"], r_type=c["r_type"])},
+    "Scope": {
+        "inputs": ["r_scope"], "key": "Scope",
+        "build": lambda c: get_scope(c["rule_data"], r_scope=c["r_scope"])},
+    "Executability": {
+        "inputs": [], "key": "Executability",
+        "build": lambda c: get_executability(c["rule_data"])},
+    "Check": {
+        "inputs": [], "key": "Check",
+        "build": lambda c: get_check(c["rule_data"], exist_rule_data=c["y2"])},
+}
+
+
+class _RuleContext(dict):
+    # builds a missing entry from RULE_FIELDS the first time it is read
+    def __missing__(self, name):
+        v = RULE_FIELDS[name]["build"](self)
+        self[name] = v
+        return v
+
+
+def get_rule_fields(df_data, r_idx: dict = None, fields: list = None,
+                    b_args: dict = None):
+    """
+    ===============
+    get_rule_fields
+    ===============
+    This method runs the batch builders in RULE_FIELDS that the fields need,
+    directly or through their inputs, once for all the rules in df_data.
+
+    Parameters:
+    -----------
+    df_data: dataframe
+        the selected rule definitions
+    r_idx: dict
+        the {rule_id: row positions} index from get_rule_index on df_data;
+        it is built if not provided
+    fields: list
+        the names in RULE_FIELDS to build (default is all)
+    b_args: dict
+        the extra arguments of the batch builders, e.g., {"r_exist":
+        {rule_id: existing json}, "c_types": RuleBuilder.rule_types}; each
+        builder only gets the ones in its batch_kw
+
+    returns
+    -------
+        r_fields: a dict of {rule_id: {name: value}} to be passed to
+            build_rule_fields (through proc_each_yaml) for each rule
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    if df_data is None or df_data.shape[0] == 0:
+        v_msg = "No rule data is provided."
+        echo_msg(v_prg, v_stp, v_msg, 2)
+        return {}
+    if r_idx is None:
+        r_idx = get_rule_index(df_data)
+
+    # 1.1 collect the fields and their inputs
+    v_stp = 1.1
+    names = []
+    todo = list(RULE_FIELDS.keys()) if fields is None else list(fields)
+    while todo:
+        k = todo.pop(0)
+        if k in names:
+            continue
+        names.append(k)
+        todo.extend(RULE_FIELDS[k]["inputs"])
+
+    # 2.0 run each batch builder once
+    v_stp = 2.0
+    r_fields = {k: {} for k in r_idx.keys()}
+    for k in names:
+        f_batch = RULE_FIELDS[k].get("batch")
+        if f_batch is None:
+            continue
+        v_msg = f" . Building {k} for {len(r_idx)} rules..."
+        echo_msg(v_prg, v_stp, v_msg, 3)
+        kw = {a: b_args[a] for a in RULE_FIELDS[k].get("batch_kw", [])
+              if b_args is not None and a in b_args}
+        for rule_id, v in f_batch(df_data, r_idx, **kw).items():
+            r_fields[rule_id][k] = v
+    return r_fields
+
+
+def build_rule_fields(y2, rule_id: str, rule_data, rule_obj: dict = {},
+                      r_fields: dict = None):
+    """
+    =================
+    build_rule_fields
+    =================
+    This method sets the json elements of a rule in y2 in the order of
+    RULE_FIELDS. The values from get_rule_fields are used as they are and
+    anything else is built once when a builder needs it.
+
+    Parameters:
+    -----------
+    y2: CommentedMap
+        the existing rule content; it is updated in place
+    rule_id: str
+        the rule id
+    rule_data: dataframe
+        all the records for the rule
+    rule_obj: dict
+        the existing rule from get_existing_rule
+    r_fields: dict
+        the values of the rule from get_rule_fields
+
+    returns
+    -------
+        y2: the updated rule content
+
+    """
+    c = _RuleContext(r_fields or {})
+    c.update({"rule_id": rule_id, "rule_data": rule_data,
+              "rule_obj": rule_obj, "y2": y2})
+    d2_json = rule_obj.get("json") or {}
+    for k, f in RULE_FIELDS.items():
+        if f.get("key") is None:
+            continue
+        v_exist = d2_json.get(f["exist"]) if f.get("exist") else None
+        if v_exist is not None:
+            v = f.get("from_exist", lambda x: x)(v_exist)
+        else:
+            v = c[k]
+        y2[f["key"]] = v
+    return y2
+
+
+# Test cases
+if __name__ == "__main__":
+    os.environ["g_lvl"] = "3"
+    # Test case 1: the batch values are used and the existing one is kept
+    df = pd.DataFrame({"Rule ID": ["CG0001", "CG0001"],
+                       "Class": ["EVT", "INT"], "Domain": ["AE", "CM"],
+                       "Condition": ["AESER = Y", "x"], "Rule": ["AEOUT", "y"],
+                       "SDTMIG Version": ["3.2", "3.3"], "Rule Version": ["1", "1"],
+                       "Cited Guidance": ["A", "B"], "Document": ["IG", "IG"],
+                       "Item": ["", ""], "Section": ["4", "4"],
+                       "Variable": ["AESER", "AESER"]})
+    r_fields = get_rule_fields(df)
+    rule_obj = {"json": {"Sensitivity": "Dataset"}}
+    y2 = build_rule_fields({}, "CG0001", df, rule_obj, r_fields["CG0001"])
+    assert list(y2.keys())[:3] == ["Authorities", "Core", "Description"]
+    assert y2["Outcome"] == {"Message": "AESER = Y and AEOUT"}
+    assert y2["Sensitivity"] == "Dataset"
+    assert y2["Scope"]["Classes"]["Include"] == ["EVENTS", "INTERVENTIONS"]
+
+    # Test case 2: the rules with existing values are not classified
+    r_exist = {"CG0001": {"Rule_Type": "Record Data", "Sensitivity": "Dataset"}}
+    r_fields = get_rule_fields(df, b_args={"r_exist": r_exist})
+    assert "r_type" not in r_fields["CG0001"]
+    print("All tests are successful!")
+
+# End of File
@@ -0,0 +1,228 @@
+# Purpose: Get an index of the rule files in a folder
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding so read_fn_rule can find a rule file
+#     by rule id or doc id without listing and reading the whole folder
+#
+
+import os
+import json
+import threading
+from rulebuilder.echo_msg import echo_msg
+
+# bump this whenever the layout of the index file changes
+INDEX_VERSION = "1"
+
+# {rule_dir: index} for the folders indexed in this process
+_indexes = {}
+_index_lock = threading.Lock()
+
+
+def get_index_fn(rule_dir: str):
+    """
+    Returns the index file of rule_dir. It is kept next to the folder, not
+    in it, so the folder only has rule files, e.g., the index of
+    ./data/output/rules_json is ./data/output/.rules_json.index.json
+    """
+    d = os.path.abspath(rule_dir)
+    return os.path.join(os.path.dirname(d), "." + os.path.basename(d) +
+                        ".index.json")
+
+
+def get_file_rule_ids(fn: str):
+    """
+    Returns the rule ids a rule file name stands for: CG0001.json and
+    CG0001-Draft.json are both for CG0001.
+    """
+    stem = fn[:-5] if fn.endswith(".json") else fn
+    r_ids = [stem]
+    if "-" in stem:
+        r_ids.append(stem.rsplit("-", 1)[0])
+    return r_ids
+
+
+def _read_doc(fp: str):
+    # returns the GUID and the core status of a rule file
+    try:
+        with open(fp, "r") as f:
+            r_json = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    if not isinstance(r_json, dict):
+        return None, None
+    j = r_json.get("json") or {}
+    status = j.get("Core", {}).get("Status") if isinstance(j, dict) else None
+    return r_json.get("id"), status
+
+
+def _build_keys(idx: dict):
+    # rebuilds the {rule_id: [files]} and {doc_id: [files]} lookups, with
+    # the latest file first
+    rules, docs = {}, {}
+    files = sorted(idx["files"].items(), key=lambda x: -x[1]["mtime"])
+    for fn, e in files:
+        for r_id in get_file_rule_ids(fn):
+            rules.setdefault(r_id, []).append(fn)
+        if e.get("id") is not None:
+            docs.setdefault(e["id"], []).append(fn)
+    idx["rules"] = rules
+    idx["docs"] = docs
+
+
+def _scan(rule_dir: str, idx: dict, with_ids: bool):
+    # stats all the rule files and only reads the new and changed ones
+    files = {}
+    n_read = 0
+    with os.scandir(rule_dir) as it:
+        for de in it:
+            if not de.name.endswith(".json") or de.name.startswith("."):
+                continue
+            if not de.is_file():
+                continue
+            st = de.stat()
+            e = idx["files"].get(de.name)
+            if e is None or e["mtime"] != st.st_mtime_ns or e["size"] != st.st_size:
+                e = {"mtime": st.st_mtime_ns, "size": st.st_size,
+                     "loaded": False, "id": None, "status": None}
+            if with_ids and not e["loaded"]:
+                e["id"], e["status"] = _read_doc(de.path)
+                e["loaded"] = True
+                n_read += 1
+            files[de.name] = e
+    idx["files"] = files
+    idx["dir_mtime"] = os.stat(rule_dir).st_mtime_ns
+    _build_keys(idx)
+    return n_read
+
+
+def _save(rule_dir: str, idx: dict):
+    fn = get_index_fn(rule_dir)
+    d = {k: idx[k] for k in ("version", "dir_mtime", "files")}
+    try:
+        fn_tmp = fn + ".tmp"
+        with open(fn_tmp, "w") as f:
+            json.dump(d, f)
+        os.replace(fn_tmp, fn)
+    except OSError:
+        # the index is only a cache; the folder may be read-only
+        pass
+
+
+def _load(rule_dir: str):
+    fn = get_index_fn(rule_dir)
+    idx = {"version": INDEX_VERSION, "dir_mtime": None, "files": {}}
+    if os.path.isfile(fn):
+        try:
+            with open(fn, "r") as f:
+                d = json.load(f)
+            if d.get("version") == INDEX_VERSION:
+                idx.update(d)
+        except (OSError, ValueError):
+            pass
+    _build_keys(idx)
+    return idx
+
+
+def get_rule_file_index(rule_dir: str, with_ids: bool = False):
+    """
+    ===================
+    get_rule_file_index
+    ===================
+    This method returns the index of the rule files (*.json) in rule_dir.
+    The index is kept in memory and in a file next to rule_dir. The folder
+    is only scanned again when its mtime has changed, and only the new and
+    changed files are read.
+
+    Parameters:
+    -----------
+    rule_dir: str
+        the folder with the rule files
+    with_ids: bool
+        if True, read the GUID and the core status of each file that has not
+        been read yet; they are only needed for looking up by doc id
+
+    returns
+    -------
+        idx: a dict with
+            files: {file name: {mtime, size, id, status}}
+            rules: {rule_id: [file names]}, the latest file first
+            docs:  {doc_id: [file names]}, the latest file first
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    k = os.path.abspath(rule_dir)
+    with _index_lock:
+        idx = _indexes.get(k)
+        if idx is None:
+            idx = _load(rule_dir)
+            _indexes[k] = idx
+        dir_mtime = os.stat(rule_dir).st_mtime_ns
+        need_ids = with_ids and not all(
+            e["loaded"] for e in idx["files"].values())
+        if idx["dir_mtime"] != dir_mtime or need_ids:
+            v_stp = 1.1
+            n_read = _scan(rule_dir, idx, with_ids)
+            v_msg = (f" . Indexed {len(idx['files'])} files in {rule_dir} "
+                     f"(read {n_read}).")
+            echo_msg(v_prg, v_stp, v_msg, 3)
+            _save(rule_dir, idx)
+    return idx
+
+
+def check_rule_file(rule_dir: str, fn: str, with_ids: bool = False):
+    """
+    Returns the index entry of the file fn in rule_dir after checking that
+    the file has not changed since it was indexed; a changed file is
+    indexed again and a removed file is dropped from the index (None).
+    """
+    idx = get_rule_file_index(rule_dir)
+    fp = os.path.join(rule_dir, fn)
+    with _index_lock:
+        try:
+            st = os.stat(fp)
+        except OSError:
+            idx["files"].pop(fn, None)
+            _build_keys(idx)
+            return None
+        e = idx["files"].get(fn)
+        if e is None or e["mtime"] != st.st_mtime_ns or e["size"] != st.st_size:
+            e = {"mtime": st.st_mtime_ns, "size": st.st_size,
+                 "loaded": False, "id": None, "status": None}
+            idx["files"][fn] = e
+            if with_ids:
+                e["id"], e["status"] = _read_doc(fp)
+                e["loaded"] = True
+            _build_keys(idx)
+        return e
+
+
+# Test cases
+if __name__ == "__main__":
+    import tempfile
+    os.environ["g_lvl"] = "0"
+    d = os.path.join(tempfile.mkdtemp(), "rules_json")
+    os.makedirs(d)
+    for r_id, guid in [("CG0001", "a"), ("CG00010", "b")]:
+        with open(f"{d}/{r_id}-Draft.json", "w") as f:
+            json.dump({"id": guid, "json": {"Core": {"Status": "Draft"}}}, f)
+    # Test case 1: exact rule ids from the file names
+    idx = get_rule_file_index(d)
+    assert idx["rules"]["CG0001"] == ["CG0001-Draft.json"]
+    assert "CG000" not in idx["rules"]
+
+    # Test case 2: doc ids are read on request and kept in the index file
+    idx = get_rule_file_index(d, with_ids=True)
+    assert idx["docs"]["b"] == ["CG00010-Draft.json"]
+    _indexes.clear()
+    assert get_rule_file_index(d)["docs"]["a"] == ["CG0001-Draft.json"]
+
+    # Test case 3: a file changed in place is indexed again
+    with open(f"{d}/CG0001-Draft.json", "w") as f:
+        json.dump({"id": "c", "json": {"Core": {"Status": "Published"}}}, f)
+    e = check_rule_file(d, "CG0001-Draft.json", with_ids=True)
+    assert e["id"] == "c" and e["status"] == "Published"
+    assert "a" not in get_rule_file_index(d)["docs"]
+    print("All tests are successful!")
+
+# End of File
@@ -0,0 +1,101 @@
+# Purpose: Get a content fingerprint for building a rule
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding to skip the rules whose inputs have not
+#     changed since they were last built
+#
+
+import os
+import json
+import hashlib
+import pandas as pd
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.decode_classes import SCOPE_COLUMNS
+
+# bump this whenever a change in the builders changes the rules they build
+BUILDER_VERSION = "1"
+
+
+def get_rule_fingerprint(rule_data, rule_obj: dict = None):
+    """
+    ====================
+    get_rule_fingerprint
+    ====================
+    This method hashes everything a rule is built from: the rule definition
+    records, the content and json of the existing rule and BUILDER_VERSION.
+    A rule with the same fingerprint as its last build does not need to be
+    built, written or published again.
+
+    Parameters:
+    -----------
+    rule_data: dataframe
+        all the records for the rule
+    rule_obj: dict
+        the existing rule from get_existing_rule
+
+    returns
+    -------
+        a hex string of the SHA-256 hash
+
+    """
+    rule_obj = {} if rule_obj is None else rule_obj
+    cols = [c for c in rule_data.columns if c not in SCOPE_COLUMNS]
+    d = {"builder": BUILDER_VERSION,
+         "rows": rule_data[cols].to_dict(orient="records"),
+         "content": rule_obj.get("content"),
+         "json": rule_obj.get("json")}
+    s = json.dumps(d, sort_keys=True, default=str)
+    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+
+
+def read_rule_fingerprints(fn: str):
+    """
+    Returns the {rule_id: entry} fingerprints saved in fn, or an empty dict
+    if the file does not exist or can not be read.
+    """
+    v_prg = __name__ + ".read_rule_fingerprints"
+    v_stp = 1.0
+    if fn is None or not os.path.isfile(fn):
+        return {}
+    try:
+        with open(fn, "r") as f:
+            r_fps = json.load(f)
+    except (OSError, ValueError) as e:
+        v_msg = f"Could not read fingerprints from {fn}: {e}"
+        echo_msg(v_prg, v_stp, v_msg, 1)
+        return {}
+    if r_fps.get("builder") != BUILDER_VERSION:
+        return {}
+    return r_fps.get("rules", {})
+
+
+def output_rule_fingerprints(fn: str, r_fps: dict):
+    """
+    Writes the {rule_id: entry} fingerprints to fn through a temporary file.
+    """
+    v_prg = __name__ + ".output_rule_fingerprints"
+    v_stp = 1.0
+    fn_tmp = fn + ".tmp"
+    with open(fn_tmp, "w") as f:
+        json.dump({"builder": BUILDER_VERSION, "rules": r_fps}, f,
+                  indent=1, default=str)
+    os.replace(fn_tmp, fn)
+    v_msg = f"Writing {len(r_fps)} fingerprints to: {fn}"
+    echo_msg(v_prg, v_stp, v_msg, 2)
+
+
+# Test cases
+if __name__ == "__main__":
+    os.environ["g_lvl"] = "3"
+    df = pd.DataFrame({"Rule ID": ["CG0001"], "Condition": ["a = b"]})
+    # Test case 1: the same inputs give the same fingerprint
+    h1 = get_rule_fingerprint(df, {"content": "Core:\n  Id: x\n"})
+    h2 = get_rule_fingerprint(df.copy(), {"content": "Core:\n  Id: x\n"})
+    assert h1 == h2
+
+    # Test case 2: a change in the existing rule changes the fingerprint
+    h3 = get_rule_fingerprint(df, {"content": "Core:\n  Id: y\n"})
+    assert h1 != h3
+    print("All tests are successful!")
+
+# End of File
@@ -0,0 +1,62 @@
+# Purpose: Get a Rule ID to row position index for the rule definitions
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding to replace the per-rule re-filtering
+#     of df_data in proc_rules, proc_sdtm_rules and proc_each_yaml
+#
+
+import os
+import pandas as pd
+from rulebuilder.echo_msg import echo_msg
+
+
+def get_rule_index(df_data, key: str = "Rule ID"):
+    """
+    ==============
+    get_rule_index
+    ==============
+    This method partitions the rule definitions by rule id in one pass and
+    returns the row positions of each rule, so the rows of a rule can be
+    taken with df_data.iloc[r_idx[rule_id]] instead of scanning the whole
+    data frame for every rule.
+
+    Parameters:
+    -----------
+    df_data: dataframe
+        the rule definitions
+    key: str
+        the column to partition by (default is "Rule ID")
+
+    returns
+    -------
+        r_idx: a dict of {rule_id: array of row positions} sorted by rule id,
+            the same order as df_data.groupby(key)
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    if df_data is None or key not in df_data.columns:
+        v_msg = f"Could not find column {key} in the rule data."
+        echo_msg(v_prg, v_stp, v_msg, 2)
+        return {}
+    r_idx = df_data.groupby(key, sort=True).indices
+    v_msg = f" . Indexed {df_data.shape[0]} records for {len(r_idx)} rules."
+    echo_msg(v_prg, v_stp, v_msg, 3)
+    return r_idx
+
+
+# Test cases
+if __name__ == "__main__":
+    os.environ["g_lvl"] = "3"
+    # Test case 1: rows of each rule are in their original order
+    df = pd.DataFrame({"Rule ID": ["CG0002", "CG0001", "CG0002"],
+                       "Domain": ["AE", "DM", "CM"]})
+    r_idx = get_rule_index(df)
+    assert list(r_idx.keys()) == ["CG0001", "CG0002"]
+    assert list(df.iloc[r_idx["CG0002"]]["Domain"]) == ["AE", "CM"]
+
+    # Test case 2: no Rule ID column
+    assert get_rule_index(pd.DataFrame()) == {}
+    print("All tests are successful!")
+
+# End of File
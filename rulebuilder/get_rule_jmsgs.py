@@ -0,0 +1,87 @@
+# Purpose: Get json.Outcome.Message for all the selected rules
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding based on get_jmsg to build the messages
+#     of all the rules in one pass over the Condition and Rule columns
+#
+
+import os
+import pandas as pd
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_rule_index import get_rule_index
+from rulebuilder.replace_operator import get_rewriter
+
+
+def get_rule_jmsgs(df_data, r_idx: dict = None, i_dict: dict = None):
+    """
+    ==============
+    get_rule_jmsgs
+    ==============
+    This method builds the message of every rule in df_data from the
+    Condition and Rule of its first record, the same way as get_jmsg, with
+    one replace over each column. get_jmsg and get_desc (as "Trigger error
+    when " + message) then just use the message of the rule.
+
+    Parameters:
+    -----------
+    df_data: dataframe
+        the selected rule definitions
+    r_idx: dict
+        the {rule_id: row positions} index from get_rule_index on df_data;
+        it is built if not provided
+    i_dict: dict
+        the operator dictionary for replace_operator (default is
+        OPERATOR_MAP)
+
+    returns
+    -------
+        r_jmsgs: a dict of {rule_id: message}
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    if df_data is None or df_data.shape[0] == 0:
+        v_msg = "No rule data is provided."
+        echo_msg(v_prg, v_stp, v_msg, 2)
+        return {}
+    if r_idx is None:
+        r_idx = get_rule_index(df_data)
+
+    # 2.0 take the first record of each rule
+    v_stp = 2.0
+    r_ids = list(r_idx.keys())
+    i_pos = [r_idx[k][0] for k in r_ids]
+    pattern, repl = get_rewriter(i_dict)
+
+    def rewrite(c):
+        s = df_data[c].iloc[i_pos].reset_index(drop=True).astype(object)
+        s = s.where(s.notna(), None)
+        return s.str.replace(pattern, repl, regex=True).where(s.notna(), None)
+
+    # 2.1 replace operators in the columns
+    v_stp = 2.1
+    r_desc1 = rewrite("Condition").tolist()
+    r_desc2 = rewrite("Rule").tolist()
+    r_jmsgs = {}
+    for k, d1, d2 in zip(r_ids, r_desc1, r_desc2):
+        r_jmsgs[k] = d2 if d1 is None else d1 if d2 is None else d1 + " and " + d2
+
+    v_msg = f" . Built messages for {len(r_jmsgs)} rules."
+    echo_msg(v_prg, v_stp, v_msg, 3)
+    return r_jmsgs
+
+
+# Test cases
+if __name__ == "__main__":
+    os.environ["g_lvl"] = "3"
+    # Test case 1: the message comes from the first record of each rule
+    df = pd.DataFrame({"Rule ID": ["CG0002", "CG0001", "CG0002"],
+                       "Condition": ["a = b", None, "x"],
+                       "Rule": ["c in (1, 2)", "d = e", "y"]})
+    i_dict = {"=": "not equal to", "in": "not in"}
+    r_jmsgs = get_rule_jmsgs(df, i_dict=i_dict)
+    assert r_jmsgs == {"CG0001": "d not equal to e",
+                       "CG0002": "a not equal to b and c not in (1, 2)"}
+    print("All tests are successful!")
+
+# End of File
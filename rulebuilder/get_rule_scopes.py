@@ -0,0 +1,90 @@
+# Purpose: Get json.Scope for all the selected rules 
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding based on get_scope to build the Scope
+#     of all the rules in one pass before looping through each rule
+#    
+
+import os
+from itertools import chain
+import pandas as pd
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_rule_index import get_rule_index
+from rulebuilder.decode_classes import decode_classes, SCOPE_COLUMNS
+
+
+def get_rule_scopes(df_data, r_idx: dict = None):
+    """
+    ===============
+    get_rule_scopes
+    ===============
+    This method builds json.Scope for every rule in df_data in one pass over
+    the decoded class and domain columns, so proc_each_yaml can look up the
+    Scope of a rule instead of building it from its records.
+
+    Parameters:
+    -----------
+    df_data: dataframe
+        the selected rule definitions. Classes and domains are decoded with
+        decode_classes if the Include/Exclude columns are not there.
+    r_idx: dict
+        the {rule_id: row positions} index from get_rule_index on df_data;
+        it is built if not provided
+
+    returns
+    -------
+        r_scopes: a dict of {rule_id: {"Classes": {...}, "Domains": {...}}}
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    if df_data is None or df_data.shape[0] == 0:
+        v_msg = "No rule data is provided."
+        echo_msg(v_prg, v_stp, v_msg, 2)
+        return {}
+    df = df_data
+    if not all(c in df.columns for c in SCOPE_COLUMNS):
+        df = decode_classes(df)
+        r_idx = None                    # decode_classes resets the index
+    if r_idx is None:
+        r_idx = get_rule_index(df)
+
+    # 2.0 take the columns out once and work on plain lists
+    v_stp = 2.0
+    cols = {c: df[c].to_numpy(dtype=object) for c in SCOPE_COLUMNS}
+    keys = [("Classes", "Include", "Classes_Include"),
+            ("Classes", "Exclude", "Classes_Exclude"),
+            ("Domains", "Include", "Domains_Include"),
+            ("Domains", "Exclude", "Domains_Exclude")]
+    r_scopes = {}
+    for rule_id, r_pos in r_idx.items():
+        r_json = {"Classes": {}, "Domains": {}}
+        for c2, k, c1 in keys:
+            v = cols[c1][r_pos]
+            # the first record decides whether the key is in the Scope
+            if len(v) > 0 and v[0] is not None:
+                r_json[c2][k] = list(dict.fromkeys(chain.from_iterable(
+                    x for x in v if x is not None)))
+        r_scopes[rule_id] = r_json
+
+    v_msg = f" . Built Scope for {len(r_scopes)} rules."
+    echo_msg(v_prg, v_stp, v_msg, 3)
+    return r_scopes
+
+
+# Test cases
+if __name__ == "__main__":
+    os.environ["g_lvl"] = "3"
+    # Test case 1: two rules
+    df = pd.DataFrame({"Rule ID": ["CG0001", "CG0002", "CG0001"],
+                       "Class": ["EVT", "ALL", "INT"],
+                       "Domain": ["AE", "Not (DS, EX)", "CM"]})
+    r_scopes = get_rule_scopes(df)
+    assert r_scopes["CG0001"] == {
+        "Classes": {"Include": ["EVENTS", "INTERVENTIONS"]},
+        "Domains": {"Include": ["AE", "CM"]}}
+    assert r_scopes["CG0002"]["Domains"] == {"Include": [],
+                                             "Exclude": ["DS", "EX"]}
+    print("All tests are successful!")
+
+# End of File
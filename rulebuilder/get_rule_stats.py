@@ -2,6 +2,8 @@
 # -----------------------------------------------------------------------------
 # History: MM/DD/YYYY (developer) - description
 #   03/29/2023 (htu) - initial coding based on get  get_existing_rule 
+#   10/18/2026 (htu) - added store_cfg to count the files and the status of 
+#     the existing rules with two queries of the rule store 
 #    
 
 import os
@@ -14,12 +16,14 @@ from rulebuilder.read_rules import read_rules
 from rulebuilder.get_existing_rule import get_existing_rule
 
 
-def get_rule_stats(rule_data, in_rule_folder):
+def get_rule_stats(rule_data, in_rule_folder, store_cfg = None):
     """
     Get statistics about existing rules.
 
     :param rule_data: The rule definitions in a pandas DataFrame.
     :param in_rule_folder: The folder where the rule files are located.
+    :param store_cfg: The rule store from get_store_cfg. If provided, the 
+           existing rules in the store are used instead of in_rule_folder.
     :return: A dictionary containing the rule statistics.
     """
     v_prg = __name__
@@ -29,10 +33,20 @@ def get_rule_stats(rule_data, in_rule_folder):
     echo_msg(v_prg, v_stp, v_msg, 3)
 
     grouped_data = rule_data.groupby("Rule ID")
-    listed_files = os.listdir(in_rule_folder)
+    r_status = None
+    if store_cfg is not None:
+        # the status of the latest existing rule for each rule id 
+        conn = store_cfg.get("st_conn")
+        n_files = conn.execute(
+            "SELECT count(*) FROM rules WHERE kind = 'orig'").fetchone()[0]
+        r_status = dict(conn.execute(
+            "SELECT rule_id, status FROM rules WHERE kind = 'orig' "
+            "ORDER BY updated").fetchall())
+    else:
+        n_files = len(os.listdir(in_rule_folder))
     r_cnt = {}
     r_cnt["total_rule_records"] = rule_data.shape[0]
-    r_cnt["total_files"] = len(listed_files)
+    r_cnt["total_files"] = n_files
     r_cnt["total_rules"] = 0
     r_cnt["rules"] = []
     r_cnt["Version"] = {}
@@ -57,10 +71,15 @@ def get_rule_stats(rule_data, in_rule_folder):
             k = i.strip()
             r_cnt["Domain"].setdefault(k, 0)
             r_cnt["Domain"][k] += 1
-        json_data = get_existing_rule(rule_id, in_rule_folder)
-        v_status = json_data.get("json", {}).get("Core", {}).get("Status")
-        if v_status is None:
-            v_status = json_data.get("status")
+        if r_status is not None:
+            # the same as get_existing_rule: new if there is no rule, 
+            # exist if the rule has no core status 
+            v_status = r_status.get(rule_id, "new") or "exist"
+        else:
+            json_data = get_existing_rule(rule_id, in_rule_folder)
+            v_status = json_data.get("json", {}).get("Core", {}).get("Status")
+            if v_status is None:
+                v_status = json_data.get("status")
         r_cnt["Status"].setdefault(v_status, 0)
         r_cnt["Status"][v_status] += 1
         
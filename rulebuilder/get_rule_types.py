@@ -0,0 +1,187 @@
+# Purpose: Get json.Rule_Type and json.Sensitivity for all the selected rules
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding based on get_rtype and get_sensitivity
+#     to classify all the rules in one pass over the Condition column
+#   10/18/2026 (htu) - skipped the rules with existing values and added
+#     get_cond_types to keep the matches of each Condition with the rules
+#
+
+import os
+import re
+import json
+import pandas as pd
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_rule_index import get_rule_index
+
+RTYPE_PATTERN = r"^(Dataset Metadata Check|Define-XML)"
+SENSITIVITY_PATTERN = r"^(dataset|record)"
+
+
+def get_cond_types(conds, c_types: dict = None):
+    """
+    Returns the {Condition: [Rule_Type match, Sensitivity match]} of the
+    distinct conditions in conds, with None for no match. Only the
+    conditions that are not in c_types yet are searched and they are
+    added to c_types, so it can be kept with the rule table and used again.
+    """
+    c_types = {} if c_types is None else c_types
+    s = pd.Series(list(dict.fromkeys(
+        c for c in conds if isinstance(c, str) and c not in c_types)),
+        dtype=object)
+    if s.shape[0] == 0:
+        return c_types
+    m1 = s.str.extract(RTYPE_PATTERN, flags=re.IGNORECASE, expand=False)
+    m2 = s.str.extract(SENSITIVITY_PATTERN, flags=re.IGNORECASE, expand=False)
+    m1 = m1.astype(object).where(m1.notna(), None)
+    m2 = m2.astype(object).where(m2.notna(), None)
+    for c, t, v in zip(s.tolist(), m1.tolist(), m2.tolist()):
+        c_types[c] = [t, v]
+    return c_types
+
+
+def cond_types2meta(c_types: dict):
+    """
+    Returns c_types as a JSON string to be stamped on the rule cache with
+    the patterns they were matched with.
+    """
+    return json.dumps({"patterns": [RTYPE_PATTERN, SENSITIVITY_PATTERN],
+                       "conds": c_types})
+
+
+def meta2cond_types(v: str):
+    """
+    Returns the c_types stamped on the rule cache by cond_types2meta, or
+    None if there are none or they were matched with other patterns.
+    """
+    if v is None:
+        return None
+    try:
+        d = json.loads(v)
+    except ValueError:
+        return None
+    if d.get("patterns") != [RTYPE_PATTERN, SENSITIVITY_PATTERN]:
+        return None
+    return d.get("conds")
+
+
+def get_rule_types(df_data, r_idx: dict = None, r_exist: dict = None,
+                   c_types: dict = None):
+    """
+    ==============
+    get_rule_types
+    ==============
+    This method gets Rule_Type and Sensitivity of the rules in df_data from
+    the Condition of their first record. The rules whose existing json
+    already has both are skipped, as build_rule_fields keeps the existing
+    values, and only the conditions not in c_types are searched. The rules
+    without a Condition or a Sensitivity match are reported in one message
+    each, leaving out the rules whose existing json has that value.
+
+    Parameters:
+    -----------
+    df_data: dataframe
+        the selected rule definitions
+    r_idx: dict
+        the {rule_id: row positions} index from get_rule_index on df_data;
+        it is built if not provided
+    r_exist: dict
+        the {rule_id: json} of the existing rules, e.g., from
+        get_existing_rule; the rules not in it are all classified
+    c_types: dict
+        the {Condition: matches} from get_cond_types kept with the rule
+        table, e.g., RuleBuilder.rule_types; it is updated in place
+
+    returns
+    -------
+        r_types: a dict of {rule_id: {"Rule_Type": str, "Sensitivity": str}}
+            for the rules that are not skipped. Rule_Type is None if the
+            rule has no Condition.
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    if df_data is None or df_data.shape[0] == 0:
+        v_msg = "No rule data is provided."
+        echo_msg(v_prg, v_stp, v_msg, 2)
+        return {}
+    if r_idx is None:
+        r_idx = get_rule_index(df_data)
+    r_exist = {} if r_exist is None else r_exist
+
+    # 2.0 take the Condition of the first record of each rule that does
+    #     not have both values in its existing json
+    v_stp = 2.0
+    r_keys = {}
+    for k in r_idx.keys():
+        j = r_exist.get(k) or {}
+        r_keys[k] = [x for x in ("Rule_Type", "Sensitivity")
+                     if j.get(x) is None]
+    r_ids = [k for k in r_idx.keys() if r_keys[k]]
+    if len(r_ids) < len(r_idx):
+        v_msg = f" . Skipped {len(r_idx) - len(r_ids)} rules with an " \
+            "existing Rule_Type and Sensitivity."
+        echo_msg(v_prg, v_stp, v_msg, 3)
+    conds = df_data["Condition"].iloc[[r_idx[k][0] for k in r_ids]]
+    conds = [c if isinstance(c, str) else None
+             for c in conds.astype(object).tolist()]
+
+    # 2.1 classify the conditions that have not been classified before
+    v_stp = 2.1
+    c_types = get_cond_types(conds, c_types)
+    r_types = {}
+    a_ids = []
+    u_msg = []
+    for k, c in zip(r_ids, conds):
+        m1, m2 = c_types.get(c, [None, None]) if c is not None else \
+            [None, None]
+        t = None if c is None else (
+            "Record Data" if m1 is None else m1.lower().capitalize())
+        v = "Record" if m2 is None else m2.lower().capitalize()
+        r_types[k] = {"Rule_Type": t, "Sensitivity": v}
+        if c is None and "Rule_Type" in r_keys[k]:
+            a_ids.append(k)
+        if c is not None and m2 is None and "Sensitivity" in r_keys[k]:
+            u_msg.append(f"  {k}: {c}")
+
+    # 3.0 report the conditions without a match in one message
+    v_stp = 3.0
+    if a_ids:
+        v_msg = f"No Condition is found in {len(a_ids)} rules: {', '.join(a_ids)}"
+        echo_msg(v_prg, v_stp, v_msg, 2)
+    if u_msg:
+        v_msg = f"No Sensitivity match found in {len(u_msg)} rules:\n"
+        v_msg += "\n".join(u_msg)
+        echo_msg(v_prg, v_stp, v_msg, 2)
+    return r_types
+
+
+# Test cases
+if __name__ == "__main__":
+    os.environ["g_lvl"] = "3"
+    # Test case 1: a match, no match and no condition
+    df = pd.DataFrame({"Rule ID": ["CG0001", "CG0002", "CG0003"],
+                       "Condition": ["Dataset Metadata Check: x", "AESER = Y",
+                                     None]})
+    r_types = get_rule_types(df)
+    assert r_types["CG0001"] == {"Rule_Type": "Dataset metadata check",
+                                 "Sensitivity": "Dataset"}
+    assert r_types["CG0002"] == {"Rule_Type": "Record Data",
+                                 "Sensitivity": "Record"}
+    assert r_types["CG0003"] == {"Rule_Type": None, "Sensitivity": "Record"}
+
+    # Test case 2: the rules with existing values are skipped and only the
+    #   new conditions are searched
+    c_types = get_cond_types(df["Condition"])
+    assert c_types["AESER = Y"] == [None, None]
+    r_exist = {"CG0001": {"Rule_Type": "Define-XML", "Sensitivity": "Record"},
+               "CG0002": {"Sensitivity": "Record"}}
+    c_types["AESER = Y"] = ["Define-XML", "Record"]
+    r_types = get_rule_types(df, r_exist=r_exist, c_types=c_types)
+    assert "CG0001" not in r_types
+    assert meta2cond_types(cond_types2meta(c_types)) == c_types
+    assert r_types["CG0002"] == {"Rule_Type": "Define-xml",
+                                 "Sensitivity": "Record"}
+    print("All tests are successful!")
+
+# End of File
@@ -4,76 +4,43 @@
 #   03/14/2023 (htu) - ported from proc_rules_sdtm and modulized as get_scope
 #   03/22/2023 (htu) - added exist_rule_data, docstring and test cases
 #   03/24/2023 (htu) - added set_scope sub function
+#   10/18/2026 (htu) - 
+#     1. read the Include/Exclude columns added by decode_classes over the 
+#        whole rule table and only decoded rule_data if they are missing
+#     2. kept the first-seen order of classes and domains and skipped the 
+#        records without any value 
+#     3. added r_scope from get_rule_scopes and used get_rule_scopes to 
+#        build the Scope from rule_data 
 #    
 
 
 import os
 import json
-from itertools import chain
 from rulebuilder.echo_msg import echo_msg
 from rulebuilder.read_rules import read_rules
-from rulebuilder.decode_classes import decode_classes
+from rulebuilder.decode_classes import decode_classes, SCOPE_COLUMNS
+from rulebuilder.get_rule_scopes import get_rule_scopes
 from rulebuilder.get_existing_rule import get_existing_rule
 
-def get_scope(rule_data, exist_rule_data: dict = {}):
+def get_scope(rule_data, exist_rule_data: dict = {}, r_scope: dict = None):
     
     r_json = exist_rule_data.get("json", {}).get("Scope")
     if r_json is not None: 
         return r_json
-    else:
-        r_json = {
-            "Classes": {},
-            "Domains": {}
-        }
+    # the Scope built for all the rules by get_rule_scopes 
+    if r_scope is not None:
+        return r_scope
     df_rules = rule_data
-    df = decode_classes(df_rules) 
+    if all(c in df_rules.columns for c in SCOPE_COLUMNS):
+        df = df_rules
+    else:
+        df = decode_classes(df_rules) 
     # print(f"{__name__}:\n  Class: {df['Class']}\n  Domains: {df['Domain']}")
     # print(f"  C_Exc: {df['Classes_Exclude']}\n  D_Exc: {df['Domains_Exclude']}")
 
-    def set_scope (k, c1="Class", c2="Classes"):
-        if df[c1].iloc[0] is not None:
-            v = list(set(chain.from_iterable(df[c1])))
-            r_json[c2][k] = v
-        else:
-            if k in r_json[c2]:
-                del r_json[c2][k]
-    # End of subfunction set_scope 
-    
-    # v_ci = list(set(chain.from_iterable(df['Class'])))
-    # v_ce = list(set(chain.from_iterable(df["Classes_Exclude"])))
-    # v_di = list(set(chain.from_iterable(df["Domain"])))
-    # v_de = list(set(chain.from_iterable(df["Domains_Exclude"])))
-    set_scope("Include", c1="Class", c2="Classes") 
-    set_scope("Exclude", c1="Classes_Exclude",c2="Classes")
-    set_scope("Include", c1="Domain", c2="Domains")
-    set_scope("Exclude", c1="Domains_Exclude", c2="Domains")
-
-    # if df["Class"].iloc[0] is not None:
-    #     r_json["Classes"]["Include"] = list(set(chain.from_iterable(df['Class'])))
-    # else:
-    #    if "Include" in r_json["Classes"]:
-    #        del r_json["Classes"]["Include"]
-    
-    # if df["Classes_Exclude"].iloc[0] is not None: 
-    #     r_json["Classes"]["Exclude"] = list(set(chain.from_iterable(df["Classes_Exclude"])))
-    # else:
-    #     if "Exclude" in r_json["Classes"]:
-    #            del r_json["Classes"]["Exclude"]
-
-    
-    # if df["Domain"].iloc[0] is not None:
-    #     r_json["Domains"]["Include"] = list(set(chain.from_iterable(df["Domain"])))
-    # else:
-    #     if "Include" in r_json["Domains"]:
-    #         del r_json["Domains"]["Include"]
-
-
-    # if df["Domains_Exclude"].iloc[0] is not None:  
-    #     r_json["Domains"]["Exclude"] = list(set(chain.from_iterable(df["Domains_Exclude"])))
-    # else:
-    #     if "Include" in r_json["Domains"]:
-    #         del r_json["Domains"]["Include"]
-
+    # all the records in rule_data are for the same rule 
+    r_json = get_rule_scopes(df, {"_": list(range(df.shape[0]))}).get(
+        "_", {"Classes": {}, "Domains": {}})
     return r_json
 
 
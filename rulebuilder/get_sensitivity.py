@@ -6,6 +6,9 @@
 #   03/21/2023 (htu) - added docstring and test cases
 #     10. Rule Type and Sensitivity should be left null
 #   03/22/2023 (htu) - added exist_rule_data
+#   10/18/2026 (htu) - 
+#     1. added r_type from get_rule_types 
+#     2. used echo_msg instead of print for the condition without a match
 #    
 
 import os
@@ -16,7 +19,7 @@ from rulebuilder.echo_msg import echo_msg
 from rulebuilder.read_rules import read_rules
 
 
-def get_sensitivity(rule_data, exist_rule_data: dict = {}):
+def get_sensitivity(rule_data, exist_rule_data: dict = {}, r_type: dict = None):
     """
     ===============
     get_sensitivity
@@ -33,6 +36,10 @@ def get_sensitivity(rule_data, exist_rule_data: dict = {}):
         a data frame containng all the records for a rule that already developed. It 
         can be read from the existing rule folder using get_existing_rule. 
 
+    r_type: dict 
+        the Rule_Type and Sensitivity of the rule from get_rule_types. It is 
+        used instead of searching the Condition in rule_data.
+
 
     returns
     -------
@@ -57,7 +64,10 @@ def get_sensitivity(rule_data, exist_rule_data: dict = {}):
     if rule_data.empty:
         return None
 
+    v_prg = __name__
     r_str = exist_rule_data.get("json", {}).get("Sensitivity")
+    if r_str is None and r_type is not None:
+        return r_type.get("Sensitivity")
     if r_str is None: 
         r_condition = rule_data.iloc[0]["Condition"]
         # r_rule = rule_data.iloc[0]["Rule"]
@@ -73,7 +83,9 @@ def get_sensitivity(rule_data, exist_rule_data: dict = {}):
                 r_str = match.group(1).lower().capitalize()
             else:
                 # No match found
-                print(f"No match found from {r_condition}")
+                v_stp = 2.2
+                v_msg = f"No match found from {r_condition}"
+                echo_msg(v_prg, v_stp, v_msg, 4)
     return r_str
 
 
@@ -0,0 +1,128 @@
+# Purpose: Get the configuration of a local SQLite rule store
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding for a rule store that can be used
+#     instead of the orig_rules, rules_json and rules_yaml folders
+#
+
+import os
+import sqlite3
+from dotenv import load_dotenv
+from rulebuilder.echo_msg import echo_msg
+
+# bump this whenever the layout of the rules table changes
+STORE_VERSION = "1"
+
+# kind: the folder the rules of the kind are kept in without a store
+#   orig: the existing rules, e.g., ./data/output/orig_rules
+#   json: the built rules, e.g., ./data/output/rules_json and rules_yaml;
+#         the YAML of a built rule is its content
+RULE_KINDS = {"orig": "existing_rule_dir", "json": "rule_json_dir"}
+
+STORE_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS rules (
+        kind TEXT NOT NULL,
+        name TEXT NOT NULL,
+        rule_id TEXT,
+        core_id TEXT,
+        guid TEXT,
+        status TEXT,
+        changed TEXT,
+        content_hash TEXT,
+        updated REAL,
+        doc TEXT NOT NULL,
+        PRIMARY KEY (kind, name))""",
+    "CREATE INDEX IF NOT EXISTS rules_rule_id "
+    "ON rules (kind, rule_id, updated)",
+    "CREATE INDEX IF NOT EXISTS rules_core_id ON rules (kind, core_id)",
+    "CREATE INDEX IF NOT EXISTS rules_guid ON rules (kind, guid, updated)",
+    "CREATE INDEX IF NOT EXISTS rules_status ON rules (kind, status)",
+    "CREATE TABLE IF NOT EXISTS store_meta (k TEXT PRIMARY KEY, v TEXT)",
+]
+
+
+def get_store_cfg(store_fn: str = None):
+    """
+    =============
+    get_store_cfg
+    =============
+    This method opens the SQLite rule store, creating it if it does not
+    exist, in the same way get_db_cfg connects to a Cosmos DB container.
+
+    Parameters:
+    -----------
+    store_fn: str
+        the store file name with full path; the default is the rule_store
+        environment variable or rules.sqlite in output_dir
+
+    returns
+    -------
+        store_cfg: a dict with store_fn and st_conn (the sqlite3 connection)
+            or {} if the store could not be opened
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    v_msg = "Configuring the rule store..."
+    echo_msg(v_prg, v_stp, v_msg, 2)
+
+    # 1.1 get the store file name
+    v_stp = 1.1
+    if store_fn is None:
+        load_dotenv()
+        store_fn = os.getenv("rule_store")
+    if store_fn is None:
+        out_dir = os.getenv("output_dir")
+        if out_dir is None:
+            v_msg = "No rule store nor output_dir is provided."
+            echo_msg(v_prg, v_stp, v_msg, 0)
+            return {}
+        store_fn = out_dir + "/rules.sqlite"
+    s_dir = os.path.dirname(store_fn)
+    if s_dir and not os.path.exists(s_dir):
+        v_msg = "Making dir - " + s_dir
+        echo_msg(v_prg, v_stp, v_msg, 3)
+        os.makedirs(s_dir)
+
+    # 1.2 open the store and create the tables
+    v_stp = 1.2
+    try:
+        conn = sqlite3.connect(store_fn)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            for sql in STORE_SCHEMA:
+                conn.execute(sql)
+            row = conn.execute(
+                "SELECT v FROM store_meta WHERE k = 'version'").fetchone()
+            if row is None:
+                conn.execute("INSERT INTO store_meta VALUES ('version', ?)",
+                             (STORE_VERSION,))
+            elif row[0] != STORE_VERSION:
+                v_msg = (f"Rule store {store_fn} is version {row[0]}, "
+                         f"not {STORE_VERSION}.")
+                echo_msg(v_prg, v_stp, v_msg, 0)
+                conn.close()
+                return {}
+    except sqlite3.Error as e:
+        v_msg = f"Could not open rule store {store_fn}: {e}"
+        echo_msg(v_prg, v_stp, v_msg, 0)
+        return {}
+    v_msg = f"Opened rule store - {store_fn}"
+    echo_msg(v_prg, v_stp, v_msg, 3)
+    return {"store_fn": store_fn, "st_conn": conn}
+
+
+# Test cases
+if __name__ == "__main__":
+    import tempfile
+    os.environ["g_lvl"] = "0"
+    # Test case 1: a new store is created with the rules table
+    fn = os.path.join(tempfile.mkdtemp(), "rules.sqlite")
+    cfg = get_store_cfg(fn)
+    assert cfg["store_fn"] == fn
+    n = cfg["st_conn"].execute("SELECT count(*) FROM rules").fetchone()[0]
+    assert n == 0
+    print("All tests are successful!")
+
+# End of File
@@ -0,0 +1,99 @@
+# Purpose: Get the shared YAML codecs used to read and write rules
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding to configure the ruamel YAML instances
+#     once per thread instead of on every call
+#
+# Example: python scripts/bench_yaml.py
+
+import threading
+from io import StringIO
+from ruamel.yaml import YAML
+
+# rt:   round-trip, keeps comments, quotes and key order; used for the rule
+#       content (CommentedMap) that is written back to the rule files
+# safe: plain dicts and lists without comments; uses the C-based loader and
+#       dumper when ruamel.yaml.clib is installed. Use it to read data files
+#       whose comments and quotes do not need to be preserved.
+YAML_TYPES = ["rt", "safe"]
+
+# each thread gets its own instances as ruamel YAML objects are not
+# thread-safe
+_local = threading.local()
+
+
+def _new_yaml(typ: str):
+    if typ == "rt":
+        y = YAML()
+        y.indent(mapping=2, sequence=4, offset=2)
+        y.preserve_quotes = True
+    elif typ == "safe":
+        y = YAML(typ="safe")
+        y.default_flow_style = False
+    else:
+        raise ValueError(f"Unknown YAML type: {typ}; expected one of {YAML_TYPES}")
+    return y
+
+
+def get_yaml(typ: str = "rt"):
+    """
+    ========
+    get_yaml
+    ========
+    This method returns the YAML instance of the current thread for typ. It
+    is created and configured on first use and reused afterwards.
+
+    Parameters:
+    -----------
+    typ: str
+        rt (round-trip) or safe (see YAML_TYPES)
+
+    returns
+    -------
+        a ruamel.yaml YAML instance
+
+    """
+    c = _local.__dict__
+    y = c.get(typ)
+    if y is None:
+        y = _new_yaml(typ)
+        c[typ] = y
+    return y
+
+
+def load_yaml(s, typ: str = "rt"):
+    """
+    Returns the data loaded from the YAML string or stream s.
+    """
+    return get_yaml(typ).load(s)
+
+
+def dump_yaml(data, typ: str = "rt"):
+    """
+    Returns data dumped as a YAML string.
+    """
+    buf = StringIO()
+    get_yaml(typ).dump(data, buf)
+    return buf.getvalue()
+
+
+# Test cases
+if __name__ == "__main__":
+    s = "# rule\nCore:\n  Id: 'CG0001'  # id\n  Status: Draft\nList:\n  - a\n"
+    # Test case 1: round-trip keeps comments and quotes
+    assert dump_yaml(load_yaml(s)) == s
+    assert get_yaml() is get_yaml("rt")
+
+    # Test case 2: safe returns plain dicts
+    d = load_yaml(s, "safe")
+    assert type(d) is dict and d["Core"]["Id"] == "CG0001"
+
+    # Test case 3: each thread has its own instance
+    r = {}
+    t = threading.Thread(target=lambda: r.update(y=get_yaml()))
+    t.start()
+    t.join()
+    assert r["y"] is not get_yaml()
+    print("All tests are successful!")
+
+# End of File
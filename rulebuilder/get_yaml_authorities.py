@@ -3,6 +3,11 @@
 # History: MM/DD/YYYY (developer) - description
 #   03/29/2023 (htu) - initial coding based on get_authorities module
 #   03/30/2023 (htu) - added code to compare versions 
+#   10/18/2026 (htu) - 
+#     1. indexed the existing standards by version once instead of scanning
+#        them for every record 
+#     2. added r_stds and used get_rule_authorities to build the standards 
+#        from column arrays instead of iterrows 
 #    
 
 import os 
@@ -11,10 +16,11 @@ import pandas as pd
 from rulebuilder.echo_msg import echo_msg
 from rulebuilder.read_rules import read_rules
 from rulebuilder.get_existing_rule import get_existing_rule
+from rulebuilder.get_rule_authorities import get_rule_authorities
 from ruamel.yaml.comments import CommentedMap
 
 
-def get_yaml_authorities(rule_data, exist_rule_data):
+def get_yaml_authorities(rule_data, exist_rule_data, r_stds: list = None):
     """
     ===============
     get_authorities
@@ -29,6 +35,9 @@ def get_yaml_authorities(rule_data, exist_rule_data):
     existing_rule_data: dict
         a data frame containng all the records for a rule that already developed. It 
         can be read from the existing rule folder using get_existing_rule. 
+    r_stds: list
+        the standards built for the rule by get_rule_authorities. They are 
+        built from rule_data if not provided.
     
     returns
     -------
@@ -46,109 +55,48 @@ def get_yaml_authorities(rule_data, exist_rule_data):
     echo_msg(v_prg, v_stp, v_msg,2)
     v_stp = 1.1
     v_msg = "Input parameter rule_data is empty."
-    if len(rule_data) == 0:
+    if r_stds is None and len(rule_data) == 0:
         echo_msg(v_prg, v_stp, v_msg,0)
         return {}
 
-    # print(f"get_authorities: Rule Data: {rule_data}")
-    # create a sample dataframe
-    df_rules = rule_data
+    # 1.2 build the standards from rule definition records 
+    v_stp = 1.2
+    if r_stds is None:
+        # all the records in rule_data are for the same rule 
+        r_stds = get_rule_authorities(
+            rule_data, {"_": list(range(len(rule_data)))}).get("_", [])
     d2_rules = exist_rule_data      # data from content 
     d2_auth  = d2_rules.get("Authorities") 
-    # print(f"Authorities: {d2_auth}")
 
+    # 2.0 index the standards in the existing rule by version. If more than 
+    #     one authority has a version, the last one is used; within an 
+    #     authority, the first standard with the version is used.
     v_stp = 2.0
-    v_msg = "Looping through each row of the rule records..."
+    v_msg = "Indexing the standards in the existing rule..."
     echo_msg(v_prg, v_stp, v_msg,2)
+    v_idx = {}
+    for auth_std in (d2_auth or []):
+        a_idx = {}
+        for standard in auth_std.get("Standards") or []:
+            a_idx.setdefault(standard.get("Version"), standard)
+        v_idx.update(a_idx)
+
+    # 2.1 we use the existing standard that has the same version as the rule 
+    #     definition 
+    v_stp = 2.1
     r_json = []         # for Authorities
-    r_stds = []         # for Standards 
-    r_refs = []         # for References
-    r_cits = []         # for Citations 
-    # r_json.append(CommentedMap({"Organization": "CDISC", "Standards": r_stds}))
-
-    # i = -1
-    # print(f"DF_RULES: {df_rules}")
-    # for row in df_rules.itertuples(index=False):
-    for i, row in df_rules.iterrows():
-    
-    # for row in df_rules:
-        # i += 1 
-        # print(f"{i} - {row}")
-
-        # 2.1 build a citation 
-        v_stp = 2.1
-        v_item = row.get("Item")
-        rule_id = row.get("Rule ID")
-        v_sdtmig_version = row.get("SDTMIG Version")
-        v_msg = f"  {i:02d} Rule ID - {rule_id}: {v_sdtmig_version}"
-        echo_msg(v_prg, v_stp, v_msg,4)
-        r_a_cit = {"Cited_Guidance": row.get("Cited Guidance"),
-                   "Document": row.get("Document"),
-                   "Item": v_item,
-                   "Section": row.get("Section")
-                   }
-        
-        # 2.2 append citation 
-        v_stp = 2.2
-        if not v_item:  # Check if "Item" is empty
-            del r_a_cit["Item"]  # Remove "Item" key from r_a_cit dictionary
-        r_cits.append(r_a_cit) 
-
-        # 2.3 build a reference and append it to r_refs 
-        v_stp = 2.3
-        v_msg = "Row (" + str(i) + "): " + str(r_a_cit)
-        echo_msg(v_prg, v_stp, v_msg,5)
-        # print(f"Row {i}: {r_a_cit}") 
-        v_rule_version = row.get("Rule Version")
-        r_a_ref = {"Origin": "SDTM and SDTMIG Conformance Rules",
-                   "Rule_Identifier": {
-                       "Id": rule_id,
-                       "Version": v_rule_version
-                   },
-                   "Version": "2.0",
-                   "Citations": [r_a_cit]
-                   }
-        r_refs.append(r_a_ref) 
-
-        # 2.4 we build a standard from rule definition 
-        v_stp = 2.4
-        # v_sdtmig_version = df_rules.iloc[i]["SDTMIG Version"]
-        
-        r_a_std = {"Name": "SDTMIG",
-                   "Version": v_sdtmig_version,
-                   "References": [r_a_ref]
-                   }
-        
-        # 2.5 we check standards in the existing rule 
-        if d2_auth is not None:
-            v_stp = 2.5
-            # Iterate over each authority and their standards
-            # if we find a standard and it has the same version as rule definition,
-            # we will use it 
-            for auth_std in d2_auth:
-                for standard in auth_std["Standards"]:
-                    # Check the version of the standard
-                    d2_sdtmig_version = standard.get('Version')
-                    if d2_sdtmig_version == v_sdtmig_version:
-                        v_msg = " . SDTMIG Versions matched: " + \
-                            str(v_sdtmig_version) + "->" + str(d2_sdtmig_version)
-                        echo_msg(v_prg, v_stp, v_msg, 3)
-                        r_a_std = standard
-                        d2_sdtmig_version = None  
-                        break 
-
-                # End of loop through existing standards 
-        # r_stds.append(CommentedMap(r_a_std))
-        # print(f"R_STDS: {r_a_std}")
-        r_stds.append(r_a_std)
-        
-    # End of loop through rule definition records 
-
-    # r_json.append(CommentedMap(
-    #        {"Organization": "CDISC", "Standards": r_stds}))
-    r_json.append( {"Organization": "CDISC", "Standards": r_stds})
-    # print(f"R_JSON: {r_json}")
-
+    a_stds = []         # for Standards 
+    for r_a_std in r_stds:
+        v_sdtmig_version = r_a_std.get("Version")
+        standard = v_idx.get(v_sdtmig_version)
+        if standard is not None:
+            v_msg = " . SDTMIG Versions matched: " + \
+                str(v_sdtmig_version) + "->" + str(standard.get("Version"))
+            echo_msg(v_prg, v_stp, v_msg, 3)
+            r_a_std = standard
+        a_stds.append(r_a_std)
+
+    r_json.append( {"Organization": "CDISC", "Standards": a_stds})
     return r_json 
 
 
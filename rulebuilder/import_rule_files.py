@@ -0,0 +1,86 @@
+# Purpose: Import the rule files in a folder to the local SQLite rule store
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding to load the orig_rules and rules_json
+#     folders to the rule store in bulk
+#
+
+import os
+import json
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.output_rule2store import get_store_row, STORE_COLUMNS
+
+
+def import_rule_files(store_cfg: dict, rule_dir: str, kind: str = "orig",
+                      batch_size: int = 500):
+    """
+    =================
+    import_rule_files
+    =================
+    This method adds the rule documents (*.json) in rule_dir to the rule
+    store, replacing the ones with the same kind and name, in batches in
+    one transaction. The YAML files of the built rules are not needed: the
+    YAML of a rule is the content of its json document.
+
+    Parameters:
+    -----------
+    store_cfg: dict
+        the rule store from get_store_cfg
+    rule_dir: str
+        the folder with the rule files, e.g., ./data/output/orig_rules for
+        orig or ./data/output/rules_json for json
+    kind: str
+        orig for the existing rules or json for the built rules
+    batch_size: int
+        the number of rules written at a time
+
+    returns
+    -------
+        the number of rules imported
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    conn = (store_cfg or {}).get("st_conn")
+    if conn is None:
+        v_msg = "No rule store is provided."
+        echo_msg(v_prg, v_stp, v_msg, 0)
+        return 0
+    if rule_dir is None or not os.path.isdir(rule_dir):
+        v_msg = f"Could not find rule_dir: {rule_dir}"
+        echo_msg(v_prg, v_stp, v_msg, 0)
+        return 0
+
+    # 2.0 read the files and write them in batches
+    v_stp = 2.0
+    cols = ", ".join(STORE_COLUMNS)
+    marks = ", ".join("?" * len(STORE_COLUMNS))
+    sql = f"INSERT OR REPLACE INTO rules ({cols}) VALUES ({marks})"
+    n, rows = 0, []
+    with conn:
+        for fn in sorted(os.listdir(rule_dir)):
+            if not fn.endswith(".json") or fn.startswith("."):
+                continue
+            try:
+                with open(os.path.join(rule_dir, fn), "r") as f:
+                    doc = json.load(f)
+            except (OSError, ValueError) as e:
+                v_stp = 2.1
+                v_msg = f" . Skipped {fn}: {e}"
+                echo_msg(v_prg, v_stp, v_msg, 1)
+                continue
+            rows.append(get_store_row(kind, fn[:-5], doc))
+            if len(rows) >= batch_size:
+                conn.executemany(sql, rows)
+                n += len(rows)
+                rows = []
+        if rows:
+            conn.executemany(sql, rows)
+            n += len(rows)
+    v_stp = 2.2
+    v_msg = f"Imported {n} {kind} rules from {rule_dir}"
+    echo_msg(v_prg, v_stp, v_msg, 2)
+    return n
+
+
+# End of File
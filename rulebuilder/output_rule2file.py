@@ -8,16 +8,25 @@
 #   03/23/2023 (htu) - added echo_msg to display dir and file creation 
 #   03/24/2023 (htu) - added "status" to track if a rule a new rule
 #   04/04/2023 (htu) - added rename_keys for json file 
+#   10/18/2026 (htu) - 
+#     1. returned the names of the files written 
+#     2. added rename to skip renaming the keys for the JSON form from 
+#        build_rule_forms 
+#     3. used get_key_style instead of rename_keys so json_data is not 
+#        changed 
+#     4. added store_cfg to write the rule to the rule store instead 
 #
 
 import os
 import json
 from rulebuilder.echo_msg import echo_msg
-from rulebuilder.rename_keys import rename_keys
+from rulebuilder.get_key_styles import get_key_style
+from rulebuilder.output_rule2store import output_rule2store
 from ruamel.yaml import YAML
 
 
-def output_rule2file(rule_id, json_data, yaml_data, output_dir) -> None:
+def output_rule2file(rule_id, json_data, yaml_data, output_dir, 
+                     rename: bool = True, store_cfg = None):
     """
     Writes YAML and JSON data to files in the specified output directory.
 
@@ -26,9 +35,14 @@ def output_rule2file(rule_id, json_data, yaml_data, output_dir) -> None:
     json_data (dict): Dictionary containing JSON data.
     yaml_data (str): String containing YAML data.
     output_dir (str): Path to the output directory where files will be written.
+    rename (bool): If True, change the spaces in the keys of json_data to 
+        underscores; use False if json_data is from build_rule_forms.
+    store_cfg (dict): The rule store from get_store_cfg. If provided, the 
+        rule is written to the store instead of output_dir.
 
     Returns:
-    None.
+    tuple: the YAML and JSON file names with full path, or (None, None) if
+        the rule is written to the rule store.
     """
     v_prg = __name__
     # Form a file name 
@@ -37,6 +51,14 @@ def output_rule2file(rule_id, json_data, yaml_data, output_dir) -> None:
     if v_status != "new": 
         v_status = json_data.get("json", {}).get("Core", {}).get("Status")
     yaml_fn = rule_id + "-" + v_status + ".yaml"
+
+    if store_cfg is not None:
+        v_stp = 1.1
+        j_data = get_key_style(json_data, "json") if rename else json_data
+        j_data["content"] = yaml_data
+        output_rule2store(store_cfg, "json", rule_id + "-" + v_status, 
+                          j_data, rule_id=rule_id)
+        return None, None
     # Write YAML data to a file
     yaml_path = output_dir + '/rules_yaml'
     
@@ -55,7 +77,8 @@ def output_rule2file(rule_id, json_data, yaml_data, output_dir) -> None:
     # Write JSON data to a file
     j_data = json_data
     # we need to change the spaces in keys to underscores 
-    rename_keys(j_data, ' ', '_')
+    if rename:
+        j_data = get_key_style(json_data, "json")
     j_data["content"] = yaml_data
     j_path = output_dir + '/rules_json'
     j_fn = rule_id + "-" + v_status + ".json"
@@ -70,6 +93,7 @@ def output_rule2file(rule_id, json_data, yaml_data, output_dir) -> None:
         v_msg = "Writing to: " + fn_json  
         echo_msg(v_prg, v_stp, v_msg, 3)
         json.dump(j_data, f, indent=4)
+    return fn_yaml, fn_json
 
 
 if __name__ == '__main__':
@@ -0,0 +1,83 @@
+# Purpose: Output rule documents to the local SQLite rule store
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding to keep the rules in the rule store
+#     instead of one json and one yaml file per rule
+#
+
+import os
+import json
+import time
+import hashlib
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_rule_file_index import get_file_rule_ids
+
+STORE_COLUMNS = ["kind", "name", "rule_id", "core_id", "guid", "status",
+                 "changed", "content_hash", "updated", "doc"]
+
+
+def get_store_row(kind: str, name: str, doc: dict, rule_id: str = None):
+    """
+    Returns the values of STORE_COLUMNS for the rule document doc. name is
+    the file name of the rule without .json, e.g., CG0001-Draft; rule_id
+    is taken from name if not provided.
+    """
+    if rule_id is None:
+        rule_id = get_file_rule_ids(name)[-1]
+    j = doc.get("json") or {}
+    core = j.get("Core", {}) if isinstance(j, dict) else {}
+    content = doc.get("content")
+    c_hash = None if content is None else hashlib.sha256(
+        content.encode("utf-8")).hexdigest()
+    status = core.get("Status") or doc.get("status")
+    return (kind, name, rule_id, core.get("Id"), doc.get("id"), status,
+            doc.get("changed"), c_hash, time.time(), json.dumps(doc))
+
+
+def output_rule2store(store_cfg: dict, kind: str, name: str, doc: dict,
+                      rule_id: str = None):
+    """
+    =================
+    output_rule2store
+    =================
+    This method adds a rule document to the rule store or replaces the one
+    with the same kind and name.
+
+    Parameters:
+    -----------
+    store_cfg: dict
+        the rule store from get_store_cfg
+    kind: str
+        orig for the existing rules or json for the built rules
+    name: str
+        the name of the rule file without .json, e.g., CG0001-Draft
+    doc: dict
+        the rule document
+    rule_id: str
+        the rule id; it is taken from name if not provided
+
+    returns
+    -------
+        the name of the rule in the store or None if it was not written
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    conn = (store_cfg or {}).get("st_conn")
+    if conn is None:
+        v_msg = "No rule store is provided."
+        echo_msg(v_prg, v_stp, v_msg, 0)
+        return None
+    v_stp = 2.0
+    row = get_store_row(kind, name, doc, rule_id)
+    cols = ", ".join(STORE_COLUMNS)
+    marks = ", ".join("?" * len(STORE_COLUMNS))
+    with conn:
+        conn.execute(f"INSERT OR REPLACE INTO rules ({cols}) VALUES ({marks})",
+                     row)
+    v_msg = f"Writing {kind}/{name} to: {store_cfg.get('store_fn')}"
+    echo_msg(v_prg, v_stp, v_msg, 3)
+    return name
+
+
+# End of File
@@ -0,0 +1,114 @@
+# Purpose: Output rule definitions to a columnar (Parquet) cache file
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - 
+#     1. initial coding to replace the pickled rule definitions
+#     2. added x_meta 
+#     3. logged a cache that could not be written instead of raising, as 
+#        the rule definitions were read anyway 
+#
+
+import os
+import pyarrow as pa
+import pyarrow.parquet as pq
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_file_hash import get_file_hash
+from rulebuilder.read_rule_cache import CACHE_VERSION
+
+
+def output_rule_cache(df, fn_cache: str, fn_src: str, src_hash: str = None,
+                      x_meta: dict = None):
+    """
+    =================
+    output_rule_cache
+    =================
+    This method writes the rule definitions to a Parquet cache file and
+    stamps it with the cache version and the hash of the source file.
+
+    Parameters:
+    -----------
+    df: dataframe
+        the rule definitions read from the source file
+    fn_cache: str
+        the cache file name with full path
+    fn_src: str
+        the source file (.yaml or .xlsx) the rule definitions were read from
+    src_hash: str
+        the hash of the source file if it is already known
+    x_meta: dict
+        extra key/value strings to stamp on the cache, e.g., the hash of the
+        xlsx file a YAML source was converted from
+
+    returns
+    -------
+        True if the cache was written, otherwise False, e.g., when an object
+        column has mixed types that Parquet can not store or the cache
+        folder is read-only; the rules are then read from fn_src next time
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    if src_hash is None:
+        src_hash = get_file_hash(fn_src)
+    st = os.stat(fn_src)
+    meta = {"crb_version": CACHE_VERSION,
+            "src_file": os.path.basename(fn_src),
+            "src_hash": src_hash,
+            "src_size": str(st.st_size),
+            "src_mtime": str(st.st_mtime_ns)}
+    if x_meta is not None:
+        meta.update({k: str(v) for k, v in x_meta.items()})
+
+    fn_tmp = fn_cache + ".tmp"
+    try:
+        v_stp = 1.1
+        c_dir = os.path.dirname(fn_cache)
+        if c_dir and not os.path.exists(c_dir):
+            v_msg = "Making dir - " + c_dir
+            echo_msg(v_prg, v_stp, v_msg, 3)
+            os.makedirs(c_dir)
+
+        # 2.0 write to a temporary file first so readers never see a 
+        #     partial cache
+        v_stp = 2.0
+        tbl = pa.Table.from_pandas(df, preserve_index=False)
+        tbl = tbl.replace_schema_metadata(
+            {**(tbl.schema.metadata or {}), **meta})
+        pq.write_table(tbl, fn_tmp)
+        os.replace(fn_tmp, fn_cache)
+    except (pa.ArrowException, OSError) as e:
+        v_msg = f"Could not write the cache {fn_cache}: {e}"
+        echo_msg(v_prg, v_stp, v_msg, 1)
+        if os.path.isfile(fn_tmp):
+            os.remove(fn_tmp)
+        return False
+    v_msg = f"Writing {df.shape[0]} records to: {fn_cache}"
+    echo_msg(v_prg, v_stp, v_msg, 2)
+    return True
+
+
+# Test cases
+if __name__ == "__main__":
+    import tempfile
+    import pandas as pd
+    from rulebuilder.read_rule_cache import read_rule_cache
+    os.environ["g_lvl"] = "0"
+    t_dir = tempfile.mkdtemp()
+    fn_src = os.path.join(t_dir, "rules.yaml")
+    with open(fn_src, "w") as f:
+        f.write("- a: 1\n")
+    fn = os.path.join(t_dir, "rules.parquet")
+    # Test case 1: the cache is written and read back
+    df = pd.DataFrame({"Rule ID": ["CG0001", "CG0002"], "v": ["3.2", ""]})
+    assert output_rule_cache(df, fn, fn_src)
+    assert read_rule_cache(fn, fn_src).equals(df)
+
+    # Test case 2: a mixed type column is not cached and does not raise
+    os.remove(fn)
+    df = pd.DataFrame({"Rule ID": ["CG0001", "CG0002"], "v": [3.2, "3.1.1"]})
+    assert not output_rule_cache(df, fn, fn_src)
+    assert os.listdir(t_dir) == ["rules.yaml"]
+    print("All tests are successful!")
+
+
+# End of File
@@ -6,6 +6,14 @@
 #     1. added rule_dir, get_db_rule, db_name, ct_name, and r_ids 
 #     2. updated calling to get_existing_rule parameters in Step 1.3
 #   04/07/2023 (htu) - used echo_msg to display dict datasets 
+#   10/18/2026 (htu) - 
+#     1. read and indexed the yaml_file once by rule id when rule_data is 
+#        not provided in step 1.2 
+#     2. used build_rule_fields to build the json elements and added 
+#        r_fields for the values built for all the rules by get_rule_fields
+#     3. used the shared round-trip YAML codec from get_yaml 
+#     4. got the parsed content from get_rule_content instead of parsing it 
+#        again after get_existing_rule 
 #    
 
 import os 
@@ -16,28 +24,28 @@ import ruamel.yaml as ry
 from rulebuilder.echo_msg import echo_msg
 from rulebuilder.get_existing_rule import get_existing_rule
 from rulebuilder.get_rule_guid import get_rule_guid
-from rulebuilder.get_core import get_core
-from rulebuilder.get_desc import get_desc
-from rulebuilder.get_jmsg import get_jmsg
-from rulebuilder.get_rtype import get_rtype
-from rulebuilder.get_sensitivity import get_sensitivity
+from rulebuilder.get_rule_fields import build_rule_fields
+from rulebuilder.get_yaml import dump_yaml
+from rulebuilder.get_rule_content import get_rule_content
 # from rulebuilder.get_authorities import get_authorities
-from rulebuilder.get_scope import get_scope
-from rulebuilder.get_executability import get_executability
-from rulebuilder.get_check import get_check
 # from rulebuilder.rbuilder import RuleBuilder
 from dotenv import load_dotenv
 from io import StringIO
 
 from rulebuilder.read_rules import read_rules
+from rulebuilder.get_rule_index import get_rule_index
 from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap
-from rulebuilder.get_yaml_authorities import get_yaml_authorities
+
+# {yaml_file: (mtime, df_data, r_idx)} for the rules read in step 1.2
+_rule_idx_cache = {}
+
 
 def proc_each_yaml (rule_id:str=None,rule_data = None, rule_obj = None,
                     rule_dir:str =None, r_ids = None, 
                     get_db_rule:int = 0,
-                    db_name: str = None, ct_name:str=None):
+                    db_name: str = None, ct_name:str=None,
+                    r_fields: dict = None):
     v_prg = __name__
     
     v_stp = 1.0
@@ -63,9 +71,18 @@ def proc_each_yaml (rule_id:str=None,rule_data = None, rule_obj = None,
         v_stp = 1.2
         v_msg = "Get Rule Data from " + yaml_file 
         echo_msg(v_prg, v_stp, v_msg, 3)
-        rule_data = read_rules(yaml_file)
-        rule_data = rule_data[rule_data["Rule ID"]==rule_id]
-        rule_data = rule_data.reset_index(drop=True)
+        mtime = os.path.getmtime(yaml_file) if os.path.isfile(yaml_file) else None
+        c = _rule_idx_cache.get(yaml_file)
+        if c is None or c[0] != mtime:
+            df_data = read_rules(yaml_file)
+            c = (mtime, df_data, get_rule_index(df_data))
+            _rule_idx_cache[yaml_file] = c
+        _, df_data, r_idx = c
+        if rule_id not in r_idx:
+            v_msg = "Could not find Rule ID - " + rule_id + " in " + yaml_file
+            echo_msg(v_prg, v_stp, v_msg, 2)
+            return None
+        rule_data = df_data.iloc[r_idx[rule_id]].reset_index(drop=True)
     # print(f"Rule Data: {rule_data}")
 
     # 1.3 get rule object - existing rule 
@@ -73,10 +90,6 @@ def proc_each_yaml (rule_id:str=None,rule_data = None, rule_obj = None,
     v_msg = "Get rule object from rule folder: " + rule_dir
     echo_msg(v_prg, v_stp, v_msg, 3)
 
-    y1 = YAML()
-    y1.indent(mapping=2, sequence=4, offset=2)
-    y1.preserve_quotes = True
-
     # print (f"Rule Data: {rule_data}")
     # print(f"Schema Data: {rule_tmp.keys()}")
     if rule_obj is None: 
@@ -112,7 +125,8 @@ def proc_each_yaml (rule_id:str=None,rule_data = None, rule_obj = None,
  
     # c1 = yaml.safe_load(rule_obj.get("content"))
     c0 = rule_obj.get("content")
-    c1 = {} if c0 is None else y1.load(c0)
+    # a copy as y2 is updated below 
+    c1 = {} if c0 is None else get_rule_content(c0, copy_obj=True)
     
     v_msg = "---------- Existing Rule Content (C1) ----------"
     echo_msg(v_prg, v_stp, v_msg, 9)
@@ -142,83 +156,24 @@ def proc_each_yaml (rule_id:str=None,rule_data = None, rule_obj = None,
 
     # yt = ry.dump_all(y2, Dumper=ry.RoundTripDumper)
 
-    y_autho = get_yaml_authorities(rule_data,y2)
-    v_msg = "---------- Rule Authorities (Y_AUTHO) ----------"
-    echo_msg(v_prg, v_stp, v_msg, 9)
-    echo_msg(v_prg, v_stp, y_autho, 9)
-    v_msg = "---------- Rule Authorities (json.Check) ----------"
-    echo_msg(v_prg, v_stp, v_msg, 9)
-    echo_msg(v_prg, v_stp, y2.get("Check"), 9)
-
-    # yaml_text = ry.dump_all(y_autho, Dumper=ry.RoundTripDumper)
-    # print(f"YAML AUTHO: {yaml_text}")
-
-    y2["Authorities"] = y_autho 
-
-    # v_autho = get_authorities(rule_data, exist_rule_data=rule_obj)
-    # if v_status == "Published":
-    #     cnt_published += 1
-    #     rule_obj["json"]["Authorities"] = v_autho
-    #     return rule_obj
-    
     # get rule GUID 
     rule_obj["id"] = get_rule_guid(rule_obj)
     
     # format the date and time as a string in the format "2023-03-08T12:00:00Z"
     rule_obj["created"] = rule_obj.get("created")
     # rule_obj["changed"] = json_exist_rule.get("changed") 
-    
-    # # get json Core 
-    # rule_obj["json"]["Core"] = get_core(
-    #      rule_id, exist_rule_data=rule_obj)
-    y2["Core"] = get_core(
-         rule_id, exist_rule_data=rule_obj)
-
-    # # get json Description
-    # # print(f"Rule Data: {rule_data.iloc[0]['Condition']}")
-    # rule_obj["json"]["Description"] = get_desc(
-    #     rule_data, exist_rule_data=rule_obj)
-    y2["Description"] = get_desc(
-         rule_data, exist_rule_data=rule_obj)
-
-    # # get json Message 
-    v_jmsg = get_jmsg(rule_data, exist_rule_data=rule_obj)
-    # rule_obj["json"]["Outcome"] = {"Message": v_jmsg}
-    y2["Outcome"] = {"Message": v_jmsg}
-
-    # # get json Rule_Type
-    # rule_obj["json"]["Rule_Type"] = get_rtype(
-    #     rule_data, exist_rule_data=rule_obj)
-    y2["Rule_Type"] = get_rtype(
-         rule_data, exist_rule_data=rule_obj)
-
-    # # get json Sensitivity
-    # rule_obj["json"]["Sensitivity"] = get_sensitivity(
-    #     rule_data, exist_rule_data=rule_obj)
-    y2["Sensitivity"] = get_sensitivity(
-        rule_data, exist_rule_data=rule_obj)
-
-    # # get json Authorities 
-    # rule_obj["json"]["Authorities"] = v_autho
 
-    # # get json Scope       
-    # rule_obj["json"]["Scope"] = get_scope(rule_data)
-    y2["Scope"] = get_scope(rule_data)
-
-    # # get json Exeutability 
-    # rule_obj["json"]["Executability"] = get_executability(rule_data)
-    y2["Executability"] = get_executability(rule_data)
-
-    # # get checks
-    # # rule_obj["json"]["Check"] = {"Check": get_check(rule_data)}  
-    # rule_obj["json"]["Check"] = get_check(
-    #     rule_data, exist_rule_data=rule_obj)
-    v_msg = "---------- Final check 1 (json.Check) - ---------"
+    # 2.0 build Authorities, Core, Description, Outcome, Rule_Type, 
+    #     Sensitivity, Scope, Executability and Check 
+    v_stp = 2.0
+    v_msg = "---------- Existing Check (json.Check) - ---------"
     echo_msg(v_prg, v_stp, v_msg, 9)
     echo_msg(v_prg, v_stp, y2.get("Check"), 9)
-
-    y2["Check"] = get_check(
-        rule_data, exist_rule_data=y2)
+    build_rule_fields(y2, rule_id, rule_data, rule_obj=rule_obj, 
+                      r_fields=r_fields)
+    v_msg = "---------- Rule Authorities (Y_AUTHO) ----------"
+    echo_msg(v_prg, v_stp, v_msg, 9)
+    echo_msg(v_prg, v_stp, y2.get("Authorities"), 9)
 
 
     # # print out the result 
@@ -226,11 +181,8 @@ def proc_each_yaml (rule_id:str=None,rule_data = None, rule_obj = None,
     rule_obj["json"] = y2
     # rule_obj["content"] = ry.dump(y2, Dumper=ry.RoundTripDumper)
 
-    # use StringIO to preserve the comment and load y2 to content 
-    content = StringIO()
-    y1.dump( y2, content,)
-    rule_obj["content"] = content.getvalue()
-    content.close()
+    # dump with the round-trip codec to preserve the comment in the content 
+    rule_obj["content"] = dump_yaml(y2, "rt")
 
     # rule_obj["content"] = ry.round_trip_load(y2)
     v_msg = "---------- Final check 2 (json.Check) - ---------"
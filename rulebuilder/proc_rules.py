@@ -4,6 +4,27 @@
 #   04/06/2023 (htu) - ported from proc_sdtm_rules as proc_rules module
 #   04/07/2023 (htu) - added r_standard and db_cfg 
 #   04/08/2023 (htu) - added log_cfg 
+#   10/18/2026 (htu) - 
+#     1. used get_rule_index to take the records of each rule instead of 
+#        re-filtering df for every rule 
+#     2. decoded the classes and domains of all the selected records once 
+#        before the loop 
+#     3. built the values that the json elements need for all the selected 
+#        rules with get_rule_fields before the loop 
+#     4. added skip_unchanged and get_rule_fingerprint to skip the rules 
+#        whose inputs have not changed since their last build 
+#     5. built the YAML and JSON forms of each rule in one pass with 
+#        build_rule_forms 
+#     6. prefetched the existing rules from the DB with get_db_rules 
+#        before the loop instead of reading them one at a time 
+#     7. added pub_concurrency to publish the rules after the loop with 
+#        publish_rules_async 
+#     8. added pub_mode 
+#     9. wrote the fingerprints every FPS_EVERY rules and before publishing 
+#        so that a failure later in the run does not lose them 
+#    10. read the existing rules before get_rule_fields so that 
+#        get_rule_types skips the rules that have their values, and added 
+#        r_types for the Condition matches kept with the rule table 
 #  
 
 import os
@@ -16,13 +37,25 @@ from rulebuilder.echo_msg import echo_msg
 from rulebuilder.read_rules import read_rules
 from rulebuilder.get_db_cfg import get_db_cfg
 from rulebuilder.get_doc_stats import get_doc_stats
+from rulebuilder.get_db_rules import get_db_rules
+from rulebuilder.get_rule_index import get_rule_index
+from rulebuilder.decode_classes import decode_classes
+from rulebuilder.get_rule_fields import get_rule_fields
+from rulebuilder.get_rule_fingerprint import get_rule_fingerprint, \
+    read_rule_fingerprints, output_rule_fingerprints
 from rulebuilder.proc_each_yaml import proc_each_yaml
 from rulebuilder.create_log_dir import create_log_dir
-from rulebuilder.publish_a_rule import publish_a_rule
-from rulebuilder.build_rule_yaml import build_rule_yaml
+from rulebuilder.publish_a_rule import publish_a_rule, PUB_MODE
+from rulebuilder.publish_rules_async import publish_rules_async, \
+    PUB_CONCURRENCY
+from rulebuilder.build_rule_forms import build_rule_forms
 from rulebuilder.output_rule2file import output_rule2file
 from rulebuilder.get_existing_rule import get_existing_rule
 
+# the fingerprints are written after every this many rules built, so that a 
+# run that fails part way does not build and publish all its rules again 
+FPS_EVERY = 25
+
 def proc_rules(r_standard,
                df_data=None, in_rule_folder:str=None, 
                 out_rule_folder:str=None, 
@@ -32,7 +65,11 @@ def proc_rules(r_standard,
                 get_db_rule: int = 0,
                 db_name:str=None, ct_name:str=None,
                 db_cfg = None,
-                log_cfg = None  
+                log_cfg = None,
+                skip_unchanged: int = 1,
+                pub_concurrency: int = PUB_CONCURRENCY,
+                pub_mode: str = PUB_MODE,
+                r_types: dict = None
                 ) -> None:
     """
     Process all rule definitions in `df_data`, and output a YAML and JSON
@@ -75,6 +112,22 @@ def proc_rules(r_standard,
         The name of the database to publish/get rules from.
     ct_name: str, default None
         The name of the container to publish/get rules from.
+    skip_unchanged: int, default 1
+        If 1, skip the rules whose definition records and existing rule have
+        not changed since they were last built (and published to the same 
+        container if pub2db is 1). Their report rows are marked "Unchanged".
+    pub_concurrency: int, default PUB_CONCURRENCY (8)
+        If over 1 and `pub2db` is 1, the rules are published after they are 
+        all built, this many at a time, with publish_rules_async. If 1, each 
+        rule is published with publish_a_rule right after it is built.
+    pub_mode: str, default PUB_MODE (recreate)
+        recreate overwrites the rules in the container; replace only writes 
+        a rule if it has not changed in the container since it was read, 
+        and reports a Conflict otherwise. Use replace with get_db_rule = 1.
+    r_types: dict, default None
+        The {Condition: matches} of get_cond_types kept with the rule table, 
+        e.g., RuleBuilder.rule_types. Only the conditions not in it are 
+        searched by get_rule_types.
 
     Returns:
     --------
@@ -233,7 +286,29 @@ def proc_rules(r_standard,
     v_msg = "Group the rules and looping through each rules..."
     echo_msg(v_prg, v_stp, v_msg,1)
 
-    grouped_data = df.groupby("Rule ID")
+    df = decode_classes(df)
+    r_idx = get_rule_index(df)
+
+    # read the existing rules of all the selected rules from the DB at once 
+    r_docs = {}
+    if get_db_rule == 1:
+        v_stp = 3.01
+        r_docs = get_db_rules(list(r_idx.keys()), db_cfg=db_cfg, r_ids=r_ids)
+
+    # read the existing rules before the fields are built, so that the 
+    # values they already have are not built again 
+    v_stp = 3.02
+    r_objs = {}
+    for rule_id in r_idx.keys():
+        os.environ["log_fn"] = f"{log_fdir}/{rule_id}-{job_id}.txt" 
+        r_objs[rule_id] = get_existing_rule(rule_id, in_rule_folder, 
+                                     get_db_rule=get_db_rule, r_ids=r_ids,
+                                     db_name=db_name,ct_name=ct_name,
+                                     db_cfg=db_cfg, r_docs=r_docs,
+                                     use_yaml_content=False)
+    r_exist = {k: v.get("json") or {} for k, v in r_objs.items()}
+    r_fields = get_rule_fields(df, r_idx, 
+                               b_args={"r_exist": r_exist, "c_types": r_types})
 
     # Loop through each Rule ID and print out required information
 
@@ -256,12 +331,21 @@ def proc_rules(r_standard,
     ipt_msg += f" . Publish to DB ({pub2db}): {db_name}.{ct_name}\n"
     ipt_msg += f" . Get DB Rule ({get_db_rule}): {db_name}.{ct_name}"
  
+    # fingerprints of the rules built in previous runs 
+    fn_fps = out_rule_folder + "/rule_fingerprints.json"
+    r_fps = read_rule_fingerprints(fn_fps) if skip_unchanged == 1 else {}
+    pub_key = f"{db_name}.{ct_name}"
+    num_skipped = 0 
+    num_fps = 0                 # the rules built since r_fps was written 
+    pub_jobs = []               # the rules to be published after the loop 
+
     rows = []
-    num_grps = grouped_data.ngroups
+    num_grps = len(r_idx)
     i_grp = 0
     v_stp = 3.1 
-    for rule_id, group in grouped_data:
+    for rule_id, r_pos in r_idx.items():
         i_grp += 1 
+        group = df.iloc[r_pos]
         st_row = dt.datetime.now()
         log_fn = f"{log_fdir}/{rule_id}-{job_id}.txt" 
         os.environ["log_fn"] = log_fn
@@ -294,21 +378,29 @@ def proc_rules(r_standard,
         v_msg = "Select the records for rule id = " + rule_id 
         echo_msg(v_prg, v_stp, v_msg, 3)
         a_json = {} 
-        rule_data = None 
-        # rule_data = df_selected[df_data["Rule ID"] == rule_id]
-        rule_data = df[df["Rule ID"] == rule_id]
-        rule_data = rule_data.reset_index(drop=True)
+        rule_data = group.reset_index(drop=True)
 
-        # 3.4 read in the existing rule
+        # 3.4 take the existing rule read before the loop
         v_stp = 3.4 
-        rule_obj = get_existing_rule(rule_id, in_rule_folder, 
-                                     get_db_rule=get_db_rule, r_ids=r_ids,
-                                     db_name=db_name,ct_name=ct_name,
-                                     db_cfg=db_cfg,
-                                     use_yaml_content=False)
+        rule_obj = r_objs.pop(rule_id)
         echo_msg(v_prg, v_stp, rule_obj, 9)
         # json.dump(rule_obj, sys.stdout, indent=4)
 
+        # 3.41 skip the rule if nothing has changed since its last build 
+        v_stp = 3.41
+        r_hash = get_rule_fingerprint(rule_data, rule_obj)
+        r_fp = r_fps.get(rule_id, {})
+        if (skip_unchanged == 1 and r_hash in r_fp.get("hashes", []) 
+                and all(os.path.isfile(f) for f in r_fp.get("files", []))
+                and (pub2db != 1 or r_fp.get("published_to") == pub_key)):
+            v_msg = f"  Rule ID: {rule_id} has not changed since {r_fp.get('built')}."
+            echo_msg(v_prg, v_stp, v_msg, 2)
+            row.update(r_fp.get("row", {}))
+            row.update({"publish_status": "Unchanged"})
+            rows.append(row)
+            num_skipped += 1
+            continue
+
         # 3.5 process the rule 
         # 
         # a_json = proc_each_sdtm_rule(
@@ -316,7 +408,8 @@ def proc_rules(r_standard,
         v_stp = 3.5 
         a_json = proc_each_yaml(rule_id,rule_data, rule_obj=rule_obj,
                                 rule_dir=in_rule_folder,r_ids=r_ids,
-                                get_db_rule=get_db_rule,db_name=db_name,ct_name=ct_name)
+                                get_db_rule=get_db_rule,db_name=db_name,ct_name=ct_name,
+                                r_fields=r_fields.get(rule_id))
         a = a_json 
         r_status = a.get("status")
         if r_status is None or r_status != "new":
@@ -335,12 +428,12 @@ def proc_rules(r_standard,
             {"version": rule_data["SDTMIG Version"].str.cat(sep="; ")})
 
         v_classes = list(
-            set([c for classes in rule_data['Class'] for c in classes]))
+            set([c for classes in rule_data['Classes_Include'] for c in classes]))
         v_c = ", ".join(v_classes)
         row.update({"class": v_c  })
 
         v_doms = list(
-            set([d for doms in rule_data['Domain'] for d in doms]))
+            set([d for doms in rule_data['Domains_Include'] for d in doms]))
         v_d = ", ".join(v_doms)
         row.update({"domain": v_d })
 
@@ -357,18 +450,48 @@ def proc_rules(r_standard,
         # # Replace "_" with " " for columns
         # d_yaml = rename_keys(dict_yaml, '_', ' ')
         # a_yaml = yaml.dump(d_yaml, default_flow_style=False)
-        a_yaml = build_rule_yaml(rule_data,a_json)
+        a_yaml, j_data = build_rule_forms(rule_data, a_json)
 
         # 3.7 output the rule to json and yaml files
-        output_rule2file(rule_id, a_json, a_yaml, out_rule_folder)
+        r_files = output_rule2file(rule_id, j_data, a_yaml, out_rule_folder,
+                                   rename=False)
 
         # 3.8 publish the rule 
-        if pub2db == 1:
-            a_row= publish_a_rule(rule_id=rule_id,db_cfg=db_cfg,r_ids=r_ids)
+        r_published = None 
+        r_pending = pub2db == 1 and pub_concurrency > 1
+        if r_pending:
+            row.update({"publish_status": "Pending"})
+        elif pub2db == 1:
+            a_row= publish_a_rule(rule_id=rule_id,db_cfg=db_cfg,r_ids=r_ids,
+                                  pub_mode=pub_mode)
             row.update({"publish_status": a_row["publish_status"]})
+            if a_row["publish_status"] in ("Added", "Replaced"):
+                r_published = pub_key
         else:
             row.update({"publish_status": "Not published"})
 
+        # 3.81 save the fingerprint of the rule. Once published, the rule in 
+        #      the container is the one just written, so its fingerprint is 
+        #      also saved for the next run with get_db_rule = 1.
+        v_stp = 3.81
+        r_hashes = [r_hash]
+        if r_published is not None or r_pending:
+            with open(r_files[1], "r") as f:
+                p_doc = json.load(f)
+            p_hash = get_rule_fingerprint(rule_data, p_doc)
+            if r_pending:
+                pub_jobs.append((rule_id, p_doc, p_hash, row))
+            else:
+                r_hashes.append(p_hash)
+        r_fps[rule_id] = {"hashes": r_hashes, "files": list(r_files),
+                          "published_to": r_published, 
+                          "built": dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                          "row": dict(row)}
+        num_fps += 1
+        if skip_unchanged == 1 and num_fps >= FPS_EVERY:
+            output_rule_fingerprints(fn_fps, r_fps)
+            num_fps = 0
+
         # 3.9 Append the status record to rows
         rows.append(row)
         et_row = dt.datetime.now()
@@ -377,14 +500,38 @@ def proc_rules(r_standard,
         v_msg = f"The job {job_id} for {rule_id} was done between: {st} and {et}"
         echo_msg(v_prg, v_stp, v_msg,2)
 
-    # End of for rule_id, group in grouped_data
+    # End of for rule_id, r_pos in r_idx
+
+    # 3.95 publish the rules built in the loop, pub_concurrency at a time; 
+    #      the rules built are saved first, as not published 
+    if len(pub_jobs) > 0:
+        v_stp = 3.95
+        if skip_unchanged == 1 and num_fps > 0:
+            output_rule_fingerprints(fn_fps, r_fps)
+        v_msg = f"Publishing {len(pub_jobs)} rules to {pub_key}..."
+        echo_msg(v_prg, v_stp, v_msg, 1)
+        a_rows = publish_rules_async(docs=[j[1] for j in pub_jobs],
+                                     db_cfg=db_cfg, r_ids=r_ids,
+                                     max_concurrency=pub_concurrency,
+                                     bak_dir=log_fdir,
+                                     pub_mode=pub_mode) or []
+        for (rule_id, p_doc, p_hash, row), a_row in zip(pub_jobs, a_rows):
+            p_status = None if a_row is None else a_row["publish_status"]
+            row.update({"publish_status": p_status})
+            if p_status in ("Added", "Replaced"):
+                r_fps[rule_id]["hashes"].append(p_hash)
+                r_fps[rule_id]["published_to"] = pub_key
+            r_fps[rule_id]["row"] = dict(row)
 
     # Collect basic stats and print them out
     v_stp = 4.0 
     v_msg = "Get statistics..."
-    n_uniq = grouped_data.ngroups
+    n_uniq = len(r_idx)
     v_msg = f"Number of Records Processed: {n_uniq}/{num_records_processed}"
+    v_msg += f"; Unchanged: {num_skipped}"
     echo_msg(v_prg, v_stp, v_msg,1)
+    if skip_unchanged == 1:
+        output_rule_fingerprints(fn_fps, r_fps)
 
     v_stp = 4.1
     v_msg = "Output result to " + rst_fn + "..." 
@@ -30,6 +30,15 @@
 #     2. updated get_existing_rule parameters at step 3.4 
 #     3. updated proc_each_yaml parameters at step 3.5
 #     4. updated docstring
+#   10/18/2026 (htu) - 
+#     1. used get_rule_index to take the records of each rule instead of 
+#        re-filtering df for every rule 
+#     2. decoded the classes and domains of all the selected records once 
+#        before the loop 
+#     3. built the values that the json elements need for all the selected 
+#        rules with get_rule_fields before the loop 
+#     4. built the YAML and JSON forms of each rule in one pass with 
+#        build_rule_forms 
 #  
 
 import os
@@ -40,7 +49,7 @@ from rulebuilder.echo_msg import echo_msg
 from rulebuilder.read_rules import read_rules
 from rulebuilder.get_existing_rule import get_existing_rule
 from rulebuilder.output_rule2file import output_rule2file
-from rulebuilder.build_rule_yaml import build_rule_yaml
+from rulebuilder.build_rule_forms import build_rule_forms
 from rulebuilder.proc_each_yaml import proc_each_yaml
 from dotenv import load_dotenv
 import datetime as dt 
@@ -48,6 +57,9 @@ from rulebuilder.create_log_dir import create_log_dir
 from rulebuilder.get_db_cfg import get_db_cfg
 from rulebuilder.publish_a_rule import publish_a_rule
 from rulebuilder.get_doc_stats import get_doc_stats
+from rulebuilder.get_rule_index import get_rule_index
+from rulebuilder.decode_classes import decode_classes
+from rulebuilder.get_rule_fields import get_rule_fields
 
 def proc_sdtm_rules(df_data=None, in_rule_folder:str=None, 
                     out_rule_folder:str=None, 
@@ -231,7 +243,9 @@ def proc_sdtm_rules(df_data=None, in_rule_folder:str=None,
     v_msg = "Group the rules and looping through each rules..."
     echo_msg(v_prg, v_stp, v_msg,1)
 
-    grouped_data = df.groupby("Rule ID")
+    df = decode_classes(df)
+    r_idx = get_rule_index(df)
+    r_fields = get_rule_fields(df, r_idx)
 
     # Loop through each Rule ID and print out required information
 
@@ -242,10 +256,11 @@ def proc_sdtm_rules(df_data=None, in_rule_folder:str=None,
                                    "publish_status"])
     rows = []
     fn_sufix = now_utc.strftime("%dT%H%M%S.txt")
-    for rule_id, group in grouped_data:
+    for rule_id, r_pos in r_idx.items():
         st_row = dt.datetime.now()
         log_fn = f"{log_fdir}/{rule_id}-{fn_sufix}" 
         os.environ["log_fn"] = log_fn
+        group = df.iloc[r_pos]
         # if rule_id not in rule_ids: continue 
         num_records = group.shape[0]
         row = {"rule_id": None, "core_id": None,  "user_id": None,"guid_id":None, 
@@ -271,10 +286,7 @@ def proc_sdtm_rules(df_data=None, in_rule_folder:str=None,
         v_msg = "Select the records for rule id = " + rule_id 
         echo_msg(v_prg, v_stp, v_msg, 3)
         a_json = {} 
-        rule_data = None 
-        # rule_data = df_selected[df_data["Rule ID"] == rule_id]
-        rule_data = df[df["Rule ID"] == rule_id]
-        rule_data = rule_data.reset_index(drop=True)
+        rule_data = group.reset_index(drop=True)
 
         # 3.4 read in the existing rule
         v_stp = 3.4 
@@ -292,7 +304,8 @@ def proc_sdtm_rules(df_data=None, in_rule_folder:str=None,
         v_stp = 3.5 
         a_json = proc_each_yaml(rule_id,rule_data, rule_obj=rule_obj,
                                 rule_dir=in_rule_folder,r_ids=r_ids,
-                                get_db_rule=get_db_rule,db_name=db_name,ct_name=ct_name)
+                                get_db_rule=get_db_rule,db_name=db_name,ct_name=ct_name,
+                                r_fields=r_fields.get(rule_id))
         a = a_json 
         r_status = a.get("status")
         if r_status is None or r_status != "new":
@@ -311,12 +324,12 @@ def proc_sdtm_rules(df_data=None, in_rule_folder:str=None,
             {"version": rule_data["SDTMIG Version"].str.cat(sep="; ")})
 
         v_classes = list(
-            set([c for classes in rule_data['Class'] for c in classes]))
+            set([c for classes in rule_data['Classes_Include'] for c in classes]))
         v_c = ", ".join(v_classes)
         row.update({"class": v_c  })
 
         v_doms = list(
-            set([d for doms in rule_data['Domain'] for d in doms]))
+            set([d for doms in rule_data['Domains_Include'] for d in doms]))
         v_d = ", ".join(v_doms)
         row.update({"domain": v_d })
 
@@ -333,10 +346,11 @@ def proc_sdtm_rules(df_data=None, in_rule_folder:str=None,
         # # Replace "_" with " " for columns
         # d_yaml = rename_keys(dict_yaml, '_', ' ')
         # a_yaml = yaml.dump(d_yaml, default_flow_style=False)
-        a_yaml = build_rule_yaml(rule_data,a_json)
+        a_yaml, j_data = build_rule_forms(rule_data, a_json)
 
         # 3.7 output the rule to json and yaml files
-        output_rule2file(rule_id, a_json, a_yaml, out_rule_folder)
+        output_rule2file(rule_id, j_data, a_yaml, out_rule_folder, 
+                         rename=False)
 
         # 3.8 publish the rule 
         if pub2db == 1:
@@ -351,12 +365,12 @@ def proc_sdtm_rules(df_data=None, in_rule_folder:str=None,
         v_msg = f"The job {job_id} for {rule_id} was done between: {st} and {et}"
         echo_msg(v_prg, v_stp, v_msg,1)
 
-    # End of for rule_id, group in grouped_data
+    # End of for rule_id, r_pos in r_idx
 
     # Collect basic stats and print them out
     v_stp = 4.0 
     v_msg = "Get statistics..."
-    num_unique_rule_id = grouped_data.ngroups
+    num_unique_rule_id = len(r_idx)
     v_msg = "Number of Records Processed: " + str(num_records_processed)
     v_msg += "\n   Number of Unique Rule ID: " + str(num_unique_rule_id)
     echo_msg(v_prg, v_stp, v_msg,2)
@@ -7,6 +7,18 @@
 #     1. changed "Rule Identifier" to Rule_Identifier
 #     2. added step 4.1 to backup docs before replacing it 
 #   04/07/2023 (htu) - added get_db_rule 
+#   10/18/2026 (htu) - 
+#     1. added store_cfg to read the rule from the rule store 
+#     2. dropped the cached doc stats of the container after publishing 
+#     3. used ct_name for get_db_cfg in the test cases 
+#     4. moved building the status row to get_publish_row so that 
+#        publish_rules_async builds the same row 
+#     5. added r_json to publish a rule document as it is 
+#     6. added pub_mode: replace writes the rule in one call guarded by its 
+#        _etag and reports a Conflict if it has changed in the container; 
+#        recreate, the way rules were published before, is the default 
+#     7. reported a rule deleted since it was read as a Conflict in replace 
+#        mode and guarded the deletes of its other docs with their _etag 
 #
 
 import os
@@ -15,12 +27,71 @@ import json
 from dotenv import load_dotenv
 from rulebuilder.echo_msg import echo_msg
 from rulebuilder.read_fn_rule import read_fn_rule
+from rulebuilder.read_store_rule import read_store_rule
 from rulebuilder.get_db_cfg import get_db_cfg
-from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from rulebuilder.get_doc_snapshot import drop_doc_snapshot
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import CosmosResourceNotFoundError, \
+    CosmosResourceExistsError, CosmosAccessConditionFailedError
+
+# replace: one replace_item guarded by the _etag of the rule as it was read 
+#   from the container, or one create_item for a new rule; a rule changed 
+#   or added in the container since then is reported as a Conflict 
+# recreate: read, delete and create the rule, overwriting the container; 
+#   the default, since the rules built from orig_rules (get_db_rule = 0) 
+#   or from an editor export have a stale or no _etag 
+PUB_MODES = ["recreate", "replace"]
+PUB_MODE = "recreate"
+
+
+def get_write_kw(r_json: dict):
+    """
+    Returns the keyword arguments of replace_item and delete_item that only 
+    write the document if its _etag in the container is still the one in 
+    r_json. 
+    """
+    return {"etag": r_json.get("_etag"),
+            "match_condition": MatchConditions.IfNotModified}
+
+
+def get_publish_row(r_json: dict):
+    """
+    Returns the row that tracks the publishing status of the rule document 
+    r_json, without publish_status. 
+    """
+    df_row = {"rule_id": None, "core_id": None,  "user_id": None, "guid_id": None,
+              "created": None, "changed": None, "status": None, "version": None,
+              "publish_status": None}
+    core_id = r_json.get("json", {}).get("Core", {}).get("Id")
+    r_auth = r_json.get("json", {}).get("Authorities")
+    r_ref = r_auth[0].get("Standards")[0].get("References")
+    r_id = r_ref[0].get("Rule_Identifier",{}).get("Id")
+    core_status = r_json.get("json", {}).get("Core", {}).get("Status")
+    df_row.update({"rule_id": r_id})
+    df_row.update({"core_id": core_id} )
+    df_row.update({"user_id": r_json.get("creator",{}).get("id")})
+    df_row.update({"guid_id": r_json.get("id")})
+    df_row.update({"created": r_json.get("created")})
+    df_row.update({"changed": r_json.get("changed")})
+    df_row.update({"status": core_status})
+    # v_vers = r_json.get("json", {}).get("Authorities", {}).get(
+    #    "Standards", {}).get("Version", {})
+    v_vs = []
+    v_vers = None
+    # print(r_json["json"]) 
+    # for authority in r_json['json']['Authorities']: 
+    for authority in r_auth: 
+        for standard in authority['Standards']:
+            v_vs.append(standard['Version'])
+    v_vers = ", ".join(v_vs)
+    df_row.update({"version": v_vers})
+    return df_row
 
 
 def publish_a_rule(rule_id = None, doc_id:str=None, rule_dir:str=None, 
-                   db_cfg = None, r_ids = None, get_db_rule:int=0):
+                   db_cfg = None, r_ids = None, get_db_rule:int=0,
+                   store_cfg = None, r_json:dict=None,
+                   pub_mode:str=PUB_MODE):
     """
     Publishes a rule to a Cosmos DB container.
 
@@ -30,6 +101,14 @@ def publish_a_rule(rule_id = None, doc_id:str=None, rule_dir:str=None,
         rule_dir (str): The path to the directory where rule JSON files are stored.
         db_cfg (dict): The configuration for the Cosmos DB container.
         r_ids (dict): The stats for existing documents
+        store_cfg (dict): The rule store from get_store_cfg. If provided, 
+            the rule is read from the store instead of rule_dir.
+        r_json (dict): The rule document to publish. If provided, it is not 
+            read from rule_dir or the rule store.
+        pub_mode (str): recreate (default) or replace; see PUB_MODES. With 
+            replace, a rule built from a document read before its last 
+            change in the container gets the status Conflict and is not 
+            written; build it again from the container (get_db_rule=1).
 
     Returns:
         str: A message indicating whether the rule was added or replaced.
@@ -46,6 +125,10 @@ def publish_a_rule(rule_id = None, doc_id:str=None, rule_dir:str=None,
 
     # 1.1 check rul_json_dir 
     v_stp = 1.1
+    if r_json is not None:
+        rule_dir = "."
+    elif store_cfg is not None:
+        rule_dir = store_cfg.get("store_fn")
     if rule_dir is None:
         load_dotenv()
         rule_dir = os.getenv("rule_json_dir")
@@ -59,6 +142,12 @@ def publish_a_rule(rule_id = None, doc_id:str=None, rule_dir:str=None,
     v_msg = f"Rule JSON dir: {rule_dir}"
     echo_msg(v_prg, v_stp, v_msg, 3)
 
+    if pub_mode not in PUB_MODES:
+        v_stp = 1.2
+        v_msg = f"Unknown pub_mode {pub_mode}, not one of {PUB_MODES}."
+        echo_msg(v_prg, v_stp, v_msg, 0)
+        return None
+
     # 1.2 check container connection
     v_stp = 1.3 
     if db_cfg is None:
@@ -79,8 +168,15 @@ def publish_a_rule(rule_id = None, doc_id:str=None, rule_dir:str=None,
     v_stp = 2.0 
     v_msg = "Get json document based on rule_id or doc_id..."
     echo_msg(v_prg, v_stp, v_msg, 3)
-    r_json = read_fn_rule(rule_id=rule_id, doc_id=doc_id, 
-                         rule_dir=rule_dir)
+    if r_json is not None:
+        v_msg = " . Use the rule document provided."
+        echo_msg(v_prg, v_stp, v_msg, 3)
+    elif store_cfg is not None:
+        r_json = read_store_rule(rule_id=rule_id, doc_id=doc_id,
+                                 store_cfg=store_cfg, kind="json")
+    else:
+        r_json = read_fn_rule(rule_id=rule_id, doc_id=doc_id, 
+                              rule_dir=rule_dir)
 
     # 3.0 publish the documnet 
     v_stp = 3.0
@@ -107,31 +203,9 @@ def publish_a_rule(rule_id = None, doc_id:str=None, rule_dir:str=None,
     v_msg = f" . Found Core ID: {core_id} in the document."
     echo_msg(v_prg, v_stp, v_msg, 3)
     r_status = None
-    df_row = {"rule_id": None, "core_id": None,  "user_id": None, "guid_id": None,
-              "created": None, "changed": None, "status": None, "version": None,
-              "publish_status": None}
-    r_auth = r_json.get("json", {}).get("Authorities")
-    r_ref = r_auth[0].get("Standards")[0].get("References")
-    r_id = r_ref[0].get("Rule_Identifier",{}).get("Id")
-    core_status = r_json.get("json", {}).get("Core", {}).get("Status")
-    df_row.update({"rule_id": r_id})
-    df_row.update({"core_id": core_id} )
-    df_row.update({"user_id": r_json.get("creator",{}).get("id")})
-    df_row.update({"guid_id": r_json.get("id")})
-    df_row.update({"created": r_json.get("created")})
-    df_row.update({"changed": r_json.get("changed")})
-    df_row.update({"status": core_status})
-    # v_vers = r_json.get("json", {}).get("Authorities", {}).get(
-    #    "Standards", {}).get("Version", {})
-    v_vs = []
-    v_vers = None
-    # print(r_json["json"]) 
-    # for authority in r_json['json']['Authorities']: 
-    for authority in r_auth: 
-        for standard in authority['Standards']:
-            v_vs.append(standard['Version'])
-    v_vers = ", ".join(v_vs)
-    df_row.update({"version": v_vers})
+    df_row = get_publish_row(r_json)
+    r_id = df_row["rule_id"]
+    core_status = df_row["status"]
 
     # 4.0 add or replace document
     v_stp = 4.0 
@@ -142,6 +216,7 @@ def publish_a_rule(rule_id = None, doc_id:str=None, rule_dir:str=None,
     v_msg = "Backing up the docuemnt first..."
     fn_path = os.path.dirname(log_fn)
     echo_msg(v_prg, v_stp, v_msg, 3)
+    d_docs = []                 # the docs deleted after a replace 
     if r_ids is not None:
         v_stp = 4.11
         docs = r_ids[r_id]["ids"] if r_id in r_ids.keys() else None
@@ -156,6 +231,11 @@ def publish_a_rule(rule_id = None, doc_id:str=None, rule_dir:str=None,
                     v_msg = "Backing up the rule to: " + fn
                     echo_msg(v_prg, v_stp, v_msg, 3)
                     json.dump(e_doc, f, indent=4)
+                if pub_mode == "replace":
+                    # the document itself is replaced, not deleted 
+                    if d_id != document_id:
+                        d_docs.append((e_doc, d_id))
+                    continue
                 # Delete the existing document
                 v_stp = 4.112
                 ctc.delete_item(item=e_doc, partition_key=d_id)
@@ -170,6 +250,51 @@ def publish_a_rule(rule_id = None, doc_id:str=None, rule_dir:str=None,
     v_stp = 4.2
     v_msg = "Let's publish the document..."
     echo_msg(v_prg, v_stp, v_msg, 3)
+    if pub_mode == "replace":
+        w_status = None
+        try:
+            if new_document.get("_etag") is not None:
+                v_stp = 4.23
+                ctc.replace_item(item=document_id, body=new_document,
+                                 **get_write_kw(new_document))
+                w_status = "Replaced"
+            else:
+                v_stp = 4.24
+                ctc.create_item(body=new_document)
+                w_status = "Added"
+        except CosmosAccessConditionFailedError:
+            w_status = "Conflict"
+            v_msg = f"Document {document_id} has changed since it was read."
+        except CosmosResourceExistsError:
+            w_status = "Conflict"
+            v_msg = f"Document {document_id} was added since it was read."
+        except CosmosResourceNotFoundError:
+            w_status = "Conflict"
+            v_msg = f"Document {document_id} was deleted since it was read."
+        if w_status == "Conflict":
+            echo_msg(v_prg, v_stp, v_msg, 1)
+            r_status = w_status
+        else:
+            v_msg = f" . Document with id {document_id} {w_status.lower()}."
+            echo_msg(v_prg, v_stp, v_msg, 3)
+            for e_doc, d_id in d_docs:
+                v_stp = 4.26
+                try:
+                    ctc.delete_item(item=e_doc, partition_key=d_id,
+                                    **get_write_kw(e_doc))
+                    v_msg = f" . Document with id {d_id} deleted."
+                    echo_msg(v_prg, v_stp, v_msg, 3)
+                except (CosmosAccessConditionFailedError,
+                        CosmosResourceNotFoundError):
+                    v_msg = f"Document {d_id} has changed since it was " \
+                        "read and is not deleted."
+                    echo_msg(v_prg, v_stp, v_msg, 1)
+            if r_status is None: 
+                r_status = w_status
+        df_row.update({"publish_status": r_status})
+        drop_doc_snapshot(db, ct)
+        return df_row
+
     try:
         v_stp = 4.21
         # Check if the document exists
@@ -213,6 +338,10 @@ def publish_a_rule(rule_id = None, doc_id:str=None, rule_dir:str=None,
 
     df_row.update({"publish_status": r_status})
 
+    # 4.3 the docs of the container have changed 
+    v_stp = 4.3
+    drop_doc_snapshot(db, ct)
+
     return df_row 
 
 
@@ -223,7 +352,7 @@ if __name__ == "__main__":
     os.environ["g_lvl"] = "5"
     db_name="library"
     ct_name = "core_rules_dev"
-    cfg = get_db_cfg(db_name=db_name, container_name=ct_name)
+    cfg = get_db_cfg(db_name=db_name, ct_name=ct_name)
     ct_conn = cfg["ct_conn"]
 
 
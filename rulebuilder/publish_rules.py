@@ -4,6 +4,8 @@
 #   03/31/2023 (htu) - initial coding based on
 #     https://learn.microsoft.com/en-us/python/api/overview/azure/cosmos-readme?view=azure-python#create-a-container
 #   04/03/2023 (htu) - called to publish_a_rule and added write2log
+#   10/18/2026 (htu) - added max_concurrency to publish the rules with 
+#     publish_rules_async and fixed the check of doc_ids; added pub_mode 
 #
 import os 
 import pandas as pd
@@ -12,12 +14,16 @@ from rulebuilder.echo_msg import echo_msg
 from rulebuilder.create_log_dir import create_log_dir
 from datetime import datetime, timezone
 from rulebuilder.get_db_cfg import get_db_cfg
-from rulebuilder.publish_a_rule import publish_a_rule
+from rulebuilder.publish_a_rule import publish_a_rule, PUB_MODE
+from rulebuilder.publish_rules_async import publish_rules_async, \
+    PUB_CONCURRENCY
 
 
 def publish_rules (rule_ids:list=["CG0001"], doc_ids:list=[],
                    rule_dir:str=None, db_cfg = None,
-                   write2log:int = 0 
+                   write2log:int = 0,
+                   max_concurrency:int = PUB_CONCURRENCY,
+                   pub_mode:str = PUB_MODE
                    ):
     v_prg = __name__
     # 1.0 check input parameters
@@ -28,7 +34,7 @@ def publish_rules (rule_ids:list=["CG0001"], doc_ids:list=[],
     now_utc = datetime.now(timezone.utc)
     job_id = now_utc.strftime("%Y%m%d_%H%M%S")
 
-    if len(rule_ids) == 0 and len(doc_ids == 0):
+    if len(rule_ids) == 0 and len(doc_ids) == 0:
         v_stp = 1.1
         v_msg = "No rule id nor doc id is provided. "
         echo_msg(v_prg, v_stp, v_msg, 0)
@@ -74,12 +80,23 @@ def publish_rules (rule_ids:list=["CG0001"], doc_ids:list=[],
     v_msg = "Loop through rule list..."
     echo_msg(v_prg, v_stp, v_msg, 1)
 
+    if max_concurrency > 1:
+        v_stp = 2.01
+        v_msg = f" . Publishing {max_concurrency} rules at a time"
+        echo_msg(v_prg, v_stp, v_msg, 2)
+        rows = publish_rules_async(rule_ids=rule_ids, doc_ids=doc_ids,
+                                   rule_dir=rule_dir, db_cfg=db_cfg,
+                                   max_concurrency=max_concurrency,
+                                   pub_mode=pub_mode) or []
+        rule_ids, doc_ids = [], []
+
     if len(rule_ids) > 0:
         v_stp = 2.1 
         for r in rule_ids: 
             v_msg = f" . Rule ID: {r}"
             echo_msg(v_prg, v_stp, v_msg, 2)
-            df_row = publish_a_rule(rule_id=r, rule_dir=rule_dir,db_cfg=db_cfg)
+            df_row = publish_a_rule(rule_id=r, rule_dir=rule_dir,db_cfg=db_cfg,
+                                    pub_mode=pub_mode)
             rows.append(df_row)
     else:
         v_stp = 2.2 
@@ -96,7 +113,7 @@ def publish_rules (rule_ids:list=["CG0001"], doc_ids:list=[],
             v_msg = f" . Doc ID: {d}"
             echo_msg(v_prg, v_stp, v_msg, 2)
             df_row=publish_a_rule(
-                doc_id=d, rule_dir=rule_dir, db_cfg=db_cfg)
+                doc_id=d, rule_dir=rule_dir, db_cfg=db_cfg, pub_mode=pub_mode)
             rows.append(df_row)
     else:
         v_stp = 3.1 
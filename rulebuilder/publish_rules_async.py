@@ -0,0 +1,482 @@
+# Purpose: Publish many rules to a Cosmos DB at the same time
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding based on publish_a_rule to publish the
+#     rules with azure.cosmos.aio and a limit on the number of rules being
+#     published at the same time
+#   10/18/2026 (htu) - added pub_mode as in publish_a_rule 
+#   10/18/2026 (htu) - reported any error of a rule in its row so that the 
+#     other rules of the batch are still published and reported 
+#   10/18/2026 (htu) - reported a rule deleted since it was read as a 
+#     Conflict in replace mode and guarded the deletes of its other docs 
+#     with their _etag, as in publish_a_rule 
+#
+
+import os
+import json
+import asyncio
+from dotenv import load_dotenv
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.read_fn_rule import read_fn_rule
+from rulebuilder.read_store_rule import read_store_rule
+from rulebuilder.publish_a_rule import publish_a_rule, get_publish_row, \
+    get_write_kw, PUB_MODE
+from rulebuilder.get_doc_snapshot import drop_doc_snapshot
+from azure.cosmos.exceptions import CosmosResourceNotFoundError, \
+    CosmosHttpResponseError, CosmosResourceExistsError, \
+    CosmosAccessConditionFailedError
+
+# the number of rules published at the same time; the throughput (RU/s) of
+# the container is the limit beyond this
+PUB_CONCURRENCY = 8
+
+
+async def publish_a_doc(ctc, r_json: dict, r_ids=None, bak_dir: str = None,
+                        pub_mode: str = PUB_MODE):
+    """
+    =============
+    publish_a_doc
+    =============
+    This coroutine publishes one rule document to an async container client
+    in the same steps as publish_a_rule: the existing docs of the rule in
+    r_ids are backed up to bak_dir and deleted, then the document is added
+    or replaces the one with the same id. With pub_mode replace, the other
+    docs are only deleted once the document is written.
+
+    Parameters:
+    -----------
+    ctc: ContainerProxy
+        the container client from azure.cosmos.aio
+    r_json: dict
+        the rule document
+    r_ids: dict
+        the doc stats from get_doc_stats; no docs are backed up if None
+    bak_dir: str
+        the folder the existing docs are backed up to
+    pub_mode: str
+        recreate or replace; see PUB_MODES in publish_a_rule
+
+    returns
+    -------
+        df_row: the status row of the rule as publish_a_rule returns it
+
+    """
+    v_prg = __name__ + ".publish_a_doc"
+    df_row = get_publish_row(r_json)
+    r_id = df_row["rule_id"]
+    core_status = df_row["status"]
+    document_id = r_json.get("id")
+    r_status = None
+    d_docs = []                 # the docs deleted after a replace
+
+    # 1.0 back up and delete the existing docs of the rule
+    if r_ids is not None:
+        v_stp = 1.1
+        docs = r_ids[r_id]["ids"] if r_id in r_ids.keys() else None
+        doc_cnt = 0
+        for d_id in docs or []:
+            doc_cnt += 1
+            e_doc = await ctc.read_item(item=d_id, partition_key=d_id)
+            if bak_dir is not None:
+                fn = f"{bak_dir}/{r_id}-{core_status}-{doc_cnt}.json"
+                with open(fn, 'w') as f:
+                    json.dump(e_doc, f, indent=4)
+                v_msg = "Backing up the rule to: " + fn
+                echo_msg(v_prg, v_stp, v_msg, 3)
+            if pub_mode == "replace":
+                if d_id != document_id:
+                    d_docs.append((e_doc, d_id))
+                continue
+            await ctc.delete_item(item=e_doc, partition_key=d_id)
+            v_msg = f" . Document with id {d_id} deleted."
+            echo_msg(v_prg, v_stp, v_msg, 3)
+        r_status = "Added" if doc_cnt == 0 else "Replaced"
+
+    # 2.0 write the document in one call guarded by its _etag
+    if pub_mode == "replace":
+        v_stp = 2.0
+        try:
+            if r_json.get("_etag") is not None:
+                await ctc.replace_item(item=document_id, body=r_json,
+                                       **get_write_kw(r_json))
+                w_status = "Replaced"
+            else:
+                await ctc.create_item(body=r_json)
+                w_status = "Added"
+        except CosmosAccessConditionFailedError:
+            w_status = "Conflict"
+            v_msg = f"Document {document_id} has changed since it was read."
+        except CosmosResourceExistsError:
+            w_status = "Conflict"
+            v_msg = f"Document {document_id} was added since it was read."
+        except CosmosResourceNotFoundError:
+            w_status = "Conflict"
+            v_msg = f"Document {document_id} was deleted since it was read."
+        if w_status == "Conflict":
+            echo_msg(v_prg, v_stp, v_msg, 1)
+            r_status = w_status
+        else:
+            for e_doc, d_id in d_docs:
+                try:
+                    await ctc.delete_item(item=e_doc, partition_key=d_id,
+                                          **get_write_kw(e_doc))
+                except (CosmosAccessConditionFailedError,
+                        CosmosResourceNotFoundError):
+                    v_msg = f"Document {d_id} has changed since it was " \
+                        "read and is not deleted."
+                    echo_msg(v_prg, v_stp, v_msg, 1)
+            if r_status is None:
+                r_status = w_status
+        df_row.update({"publish_status": r_status})
+        return df_row
+
+    # 2.1 read, delete and create the document
+    try:
+        v_stp = 2.1
+        e_doc = await ctc.read_item(item=document_id,
+                                    partition_key=document_id)
+        await ctc.delete_item(item=e_doc, partition_key=document_id)
+        await ctc.create_item(body=r_json)
+        v_msg = f" . Document with id {document_id} replaced."
+        echo_msg(v_prg, v_stp, v_msg, 3)
+        if r_status is None:
+            r_status = "Replaced"
+    except CosmosResourceNotFoundError:
+        v_stp = 2.2
+        await ctc.create_item(body=r_json)
+        v_msg = f"  Document with id {document_id} created."
+        echo_msg(v_prg, v_stp, v_msg, 3)
+        if r_status is None:
+            r_status = "Added"
+    df_row.update({"publish_status": r_status})
+    return df_row
+
+
+def _get_failed_row(r_json: dict, r_status: str):
+    # the status row of a rule that could not be published; built without
+    # get_publish_row, which fails on a rule without Authorities
+    df_row = dict.fromkeys(["rule_id", "core_id", "user_id", "guid_id",
+                            "created", "changed", "status", "version",
+                            "publish_status"])
+    try:
+        df_row.update(get_publish_row(r_json))
+    except Exception:
+        if isinstance(r_json, dict):
+            core = (r_json.get("json") or {}).get("Core") or {}
+            df_row.update({"core_id": core.get("Id"),
+                           "status": core.get("Status"),
+                           "guid_id": r_json.get("id")})
+    df_row.update({"publish_status": r_status})
+    return df_row
+
+
+async def _publish_docs(ctc, r_docs: list, r_ids, bak_dir: str,
+                        max_concurrency: int, pub_mode: str = PUB_MODE):
+    # publishes the docs with at most max_concurrency at a time and returns
+    # their rows in the order of r_docs
+    v_prg = __name__ + "._publish_docs"
+    sem = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _publish(r_json):
+        async with sem:
+            try:
+                return await publish_a_doc(ctc, r_json, r_ids, bak_dir,
+                                           pub_mode)
+            except CosmosHttpResponseError as e:
+                v_stp = 3.1
+                v_msg = f"Could not publish {r_json.get('id')}: {e}"
+                echo_msg(v_prg, v_stp, v_msg, 0)
+                return _get_failed_row(r_json, f"Failed: {e.status_code}")
+            except Exception as e:
+                # e.g., a network error, a backup that could not be written 
+                # or a rule without Authorities: the other rules go on 
+                v_stp = 3.2
+                v_msg = f"Could not publish {r_json.get('id')}: {e!r}"
+                echo_msg(v_prg, v_stp, v_msg, 0)
+                return _get_failed_row(r_json,
+                                       f"Failed: {type(e).__name__}")
+
+    return await asyncio.gather(*[_publish(r) for r in r_docs])
+
+
+async def _publish_db(db_cfg: dict, r_docs: list, r_ids, bak_dir: str,
+                      max_concurrency: int, pub_mode: str = PUB_MODE):
+    # opens an async client to the container in db_cfg for this batch
+    from azure.cosmos.aio import CosmosClient
+    async with CosmosClient(db_cfg["url"], credential=db_cfg["key"]) as cln:
+        ctc = cln.get_database_client(db_cfg["db_name"]).get_container_client(
+            db_cfg["ct_name"])
+        return await _publish_docs(ctc, r_docs, r_ids, bak_dir,
+                                   max_concurrency, pub_mode)
+
+
+def publish_rules_async(rule_ids: list = [], doc_ids: list = [],
+                        docs: list = [], rule_dir: str = None,
+                        db_cfg=None, r_ids=None, store_cfg=None,
+                        max_concurrency: int = PUB_CONCURRENCY,
+                        bak_dir: str = None, pub_mode: str = PUB_MODE):
+    """
+    ===================
+    publish_rules_async
+    ===================
+    This method publishes a list of rules to a Cosmos DB container with
+    azure.cosmos.aio, max_concurrency rules at a time, and returns the
+    status rows in the order of the rules. Each rule is published in the
+    same steps as publish_a_rule. If azure.cosmos.aio can not be used (it
+    needs aiohttp), the rules are published one at a time with
+    publish_a_rule.
+
+    Parameters:
+    -----------
+    rule_ids: list
+        the ids of the rules to be read from rule_dir or the rule store
+    doc_ids: list
+        the doc ids (GUIDs) of the rules to be read from rule_dir or the
+        rule store
+    docs: list
+        the rule documents to publish as they are, e.g., the ones just
+        built by proc_rules
+    rule_dir: str
+        the folder of the rule json files; the default is rule_json_dir or
+        output_dir/rules_json
+    db_cfg: dict
+        the DB configuration from get_db_cfg
+    r_ids: dict
+        the doc stats from get_doc_stats; the existing docs of a rule in it
+        are backed up and deleted first
+    store_cfg: dict
+        the rule store from get_store_cfg to read the rules from instead of
+        rule_dir
+    max_concurrency: int
+        the number of rules published at the same time
+    bak_dir: str
+        the folder the existing docs are backed up to; the default is the
+        folder of log_fn
+    pub_mode: str
+        recreate (default) or replace; see PUB_MODES in publish_a_rule
+
+    returns
+    -------
+        rows: the status rows of rule_ids, doc_ids and docs in that order;
+            a row is None if its rule could not be read
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    v_msg = "Publishing rules..."
+    echo_msg(v_prg, v_stp, v_msg, 2)
+
+    # 1.1 check the container connection
+    v_stp = 1.1
+    if db_cfg is None or db_cfg.get("ct_conn") is None:
+        v_msg = "No container connection is provided."
+        echo_msg(v_prg, v_stp, v_msg, 0)
+        return None
+    db = db_cfg.get("db_name")
+    ct = db_cfg.get("ct_name")
+    if bak_dir is None and os.getenv("log_fn") is not None:
+        bak_dir = os.path.dirname(os.getenv("log_fn"))
+
+    # 1.2 fall back to publish_a_rule without azure.cosmos.aio
+    v_stp = 1.2
+    try:
+        import aiohttp  # noqa: F401
+        import azure.cosmos.aio  # noqa: F401
+    except ImportError as e:
+        v_msg = f"Publishing one rule at a time: {e}"
+        echo_msg(v_prg, v_stp, v_msg, 1)
+        max_concurrency = 0
+
+    # 2.0 read the rules
+    v_stp = 2.0
+    if (rule_ids or doc_ids) and store_cfg is None and rule_dir is None:
+        load_dotenv()
+        rule_dir = os.getenv("rule_json_dir")
+        if rule_dir is None:
+            rule_dir = os.getenv("output_dir") + "/rules_json"
+    r_docs = []
+    for k, r in [("rule_id", r) for r in rule_ids] + \
+            [("doc_id", d) for d in doc_ids]:
+        if store_cfg is not None:
+            r_docs.append(read_store_rule(store_cfg=store_cfg, kind="json",
+                                          **{k: r}))
+        else:
+            r_docs.append(read_fn_rule(rule_dir=rule_dir, **{k: r}))
+    r_docs.extend(docs)
+
+    # 3.0 publish the rules
+    v_stp = 3.0
+    rows = [None] * len(r_docs)
+    i_pub = [i for i, r in enumerate(r_docs) if r.get("id") is not None]
+    if max_concurrency <= 0:
+        for i in i_pub:
+            rows[i] = publish_a_rule(db_cfg=db_cfg, r_ids=r_ids,
+                                     r_json=r_docs[i], pub_mode=pub_mode)
+        return rows
+    v_msg = f" . Publishing {len(i_pub)} rules to {db}.{ct}, " + \
+        f"{max_concurrency} at a time..."
+    echo_msg(v_prg, v_stp, v_msg, 2)
+    a_rows = asyncio.run(_publish_db(db_cfg, [r_docs[i] for i in i_pub],
+                                     r_ids, bak_dir, max_concurrency,
+                                     pub_mode))
+    for i, a_row in zip(i_pub, a_rows):
+        rows[i] = a_row
+
+    # 3.1 the docs of the container have changed
+    v_stp = 3.1
+    drop_doc_snapshot(db, ct)
+    return rows
+
+
+# Test cases
+if __name__ == "__main__":
+    class _Container:
+        # an async container that keeps the docs in a dict
+        def __init__(self, docs):
+            self.docs = {d["id"]: d for d in docs}
+            self.n_max = self.n_now = 0
+
+        async def _call(self):
+            self.n_now += 1
+            self.n_max = max(self.n_max, self.n_now)
+            await asyncio.sleep(0.01)
+            self.n_now -= 1
+
+        async def read_item(self, item, partition_key):
+            await self._call()
+            if item not in self.docs:
+                raise CosmosResourceNotFoundError(message="not found")
+            return dict(self.docs[item])
+
+        async def delete_item(self, item, partition_key, etag=None,
+                              match_condition=None):
+            if partition_key not in self.docs:
+                raise CosmosResourceNotFoundError(message="not found")
+            if etag is not None and self.docs[partition_key]["_etag"] != etag:
+                raise CosmosAccessConditionFailedError(message="changed")
+            del self.docs[partition_key]
+
+        async def create_item(self, body):
+            await self._call()
+            if body["id"] in self.docs:
+                raise CosmosResourceExistsError(message="exists")
+            self.docs[body["id"]] = dict(body, _etag="e1")
+
+        async def replace_item(self, item, body, etag, match_condition):
+            await self._call()
+            if item not in self.docs:
+                raise CosmosResourceNotFoundError(message="not found")
+            if self.docs[item].get("_etag") != etag:
+                raise CosmosAccessConditionFailedError(message="changed")
+            self.docs[item] = dict(body, _etag=etag + "1")
+
+    def _doc(i):
+        ref = [{"Rule_Identifier": {"Id": f"CG{i:04d}"}}]
+        return {"id": f"g{i}", "json": {"Core": {"Id": f"X{i}", "Status":
+                "Draft"}, "Authorities": [{"Standards": [
+                    {"Version": "3.4", "References": ref}]}]}}
+
+    class _SyncContainer:
+        # the same container for publish_a_rule
+        def __init__(self, docs):
+            self.docs = {d["id"]: d for d in docs}
+
+        def read_item(self, item, partition_key):
+            if item not in self.docs:
+                raise CosmosResourceNotFoundError(message="not found")
+            return dict(self.docs[item], _self=item)
+
+        def delete_item(self, item, partition_key, etag=None,
+                        match_condition=None):
+            if partition_key not in self.docs:
+                raise CosmosResourceNotFoundError(message="not found")
+            if etag is not None and self.docs[partition_key]["_etag"] != etag:
+                raise CosmosAccessConditionFailedError(message="changed")
+            del self.docs[partition_key]
+
+        def create_item(self, body, partition_key=None):
+            if body["id"] in self.docs:
+                raise CosmosResourceExistsError(message="exists")
+            self.docs[body["id"]] = dict(body, _etag="e1")
+
+        def replace_item(self, item, body, etag, match_condition):
+            if item not in self.docs:
+                raise CosmosResourceNotFoundError(message="not found")
+            if self.docs[item].get("_etag") != etag:
+                raise CosmosAccessConditionFailedError(message="changed")
+            self.docs[item] = dict(body, _etag=etag + "1")
+
+    import tempfile
+    os.environ["g_lvl"] = "0"
+    os.environ["log_fn"] = os.path.join(tempfile.mkdtemp(), "log.txt")
+    ctc = _Container([dict(_doc(i), _etag="e1") for i in range(0, 20, 2)])
+    r_docs = [dict(_doc(i), _etag="e1") if i % 2 == 0 else _doc(i)
+              for i in range(20)]
+    # Test case 1: the rows are in order and at most 4 are published at once
+    rows = asyncio.run(_publish_docs(ctc, r_docs, None, None, 4, "replace"))
+    assert [r["rule_id"] for r in rows] == [f"CG{i:04d}" for i in range(20)]
+    assert [r["publish_status"] for r in rows[:2]] == ["Replaced", "Added"]
+    assert ctc.n_max == 4 and len(ctc.docs) == 20
+
+    # Test case 2: a rule changed or added since it was read is a Conflict
+    rows = asyncio.run(_publish_docs(ctc, r_docs[:2], None, None, 4,
+                                     "replace"))
+    assert [r["publish_status"] for r in rows] == ["Conflict", "Conflict"]
+    assert ctc.docs["g0"]["_etag"] == "e11"
+
+    # Test case 3: the default, recreate, publishes the rules built from
+    #   orig_rules (get_db_rule = 0) with a stale or no _etag as before
+    rows = asyncio.run(_publish_docs(ctc, r_docs[:2], None, None, 4))
+    assert [r["publish_status"] for r in rows] == ["Replaced", "Replaced"]
+    s_ctc = _SyncContainer([dict(_doc(i), _etag="e2") for i in range(2)])
+    cfg = {"db_name": "library", "ct_name": "test", "ct_conn": s_ctc}
+    rows = publish_rules_async(docs=r_docs[:3], db_cfg=cfg, max_concurrency=0)
+    assert [r["publish_status"] for r in rows] == \
+        ["Replaced", "Replaced", "Added"]
+
+    # Test case 4: a rule that fails with any error does not stop the others
+    class _BadContainer(_Container):
+        async def create_item(self, body):
+            if body["id"] == "g3":
+                raise OSError("connection reset")
+            await super().create_item(body)
+
+    ctc = _BadContainer([])
+    bad = {"id": "g9", "json": {"Core": {"Id": "X9", "Status": "Draft"}}}
+    rows = asyncio.run(_publish_docs(ctc, r_docs[2:5] + [bad], None, None, 4))
+    assert [r["publish_status"] for r in rows] == \
+        ["Added", "Failed: OSError", "Added", "Failed: TypeError"]
+    assert rows[3]["core_id"] == "X9" and sorted(ctc.docs) == ["g2", "g4"]
+
+    # Test case 5: in replace mode a rule deleted since it was read is a
+    #   Conflict and is not added back
+    ctc = _Container([])
+    rows = asyncio.run(_publish_docs(ctc, r_docs[:1], None, None, 4,
+                                     "replace"))
+    assert rows[0]["publish_status"] == "Conflict" and ctc.docs == {}
+    s_ctc = _SyncContainer([])
+    cfg = {"db_name": "library", "ct_name": "test", "ct_conn": s_ctc}
+    rows = publish_rules_async(docs=r_docs[:1], db_cfg=cfg,
+                               max_concurrency=0, pub_mode="replace")
+    assert rows[0]["publish_status"] == "Conflict" and s_ctc.docs == {}
+
+    # Test case 6: another doc of the rule that has changed since it was
+    #   read is not deleted after the replace
+    class _EditContainer(_Container):
+        async def replace_item(self, item, body, etag, match_condition):
+            await super().replace_item(item, body, etag, match_condition)
+            self.docs["d0"]["_etag"] = "e9"
+
+    ctc = _EditContainer([dict(_doc(0), _etag="e1"),
+                          dict(_doc(0), id="d0", _etag="e1"),
+                          dict(_doc(1), _etag="e1"),
+                          dict(_doc(1), id="d1", _etag="e1")])
+    ids = {f"CG000{i}": {"ids": [f"g{i}", f"d{i}"]} for i in range(2)}
+    for i in range(2):
+        rows = asyncio.run(_publish_docs(ctc, [dict(_doc(i), _etag="e1")],
+                                         ids, None, 4, "replace"))
+        assert rows[0]["publish_status"] == "Replaced"
+    assert "d0" in ctc.docs and "d1" not in ctc.docs
+    print("All tests are successful!")
+
+# End of File
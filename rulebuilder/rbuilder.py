@@ -4,22 +4,30 @@
 #   03/23/2023 (htu) - initial coding
 #   04/06/2023 (htu) - added r_standard, rule_files and read_rule_definitions 
 #   04/07/2023 (htu) - added r_standard in process method 
+#   10/18/2026 (htu) - 
+#     1. replaced the pickled file with a versioned parquet cache
+#     2. used read_xlsx to stream the xlsx file 
+#     3. made log_cfg and rule_data lazy and deferred the heavy imports 
+#        to the methods that use them
+#     4. added rule_index and used it in build_a_rule 
+#     5. added skip_unchanged to process 
+#     6. read the YAML file with the shared safe YAML codec 
+#     7. added full_scan to get_doc_stats 
+#     8. added pub_concurrency to process 
+#     9. added pub_mode to process 
+#    10. added rule_types, kept in the parquet cache, and passed it and 
+#        the existing rules to get_rule_types through proc_rules 
 #   
 
 import os
-import re 
 # from abc import ABC, abstractmethod
-import pickle 
-import pandas as pd 
 import datetime as dt
-import ruamel.yaml as yaml
 from abc import ABC
 from dotenv import load_dotenv
 from rulebuilder.echo_msg import echo_msg
-from rulebuilder.proc_rules import proc_rules
-from rulebuilder.get_doc_stats import get_doc_stats
-from rulebuilder.proc_each_yaml import proc_each_yaml
 from rulebuilder.create_log_dir import create_log_dir
+# pandas, ruamel.yaml, pyarrow and azure.cosmos are imported in the methods 
+# that need them so that creating a RuleBuilder stays cheap
 
 class RuleBuilder(ABC):
     def __init__(self, 
@@ -42,7 +50,7 @@ class RuleBuilder(ABC):
         rule_files = {
             "FDA_VR1_6": {"file_name": 'FDA_VR_v1.6.xlsx',
                           "rule_sheet": 'FDA Validator Rules v1.6',
-                          "yaml":"fda_vr1_6.yaml", "pick":"fda_vr1_6.pick"},
+                          "yaml":"fda_vr1_6.yaml"},
             "SDTM_V2_0": {"file_name": 'SDTM_and_SDTMIG_Conformance_Rules_v2.0.xlsx',
                           "rule_sheet": 'SDTMIG Conformance Rules v2.0'},
             "SEND_V4_0": {"file_name": 'SEND_Conformance_Rules_v4.0.xlsx',
@@ -58,15 +66,20 @@ class RuleBuilder(ABC):
 
         v_stp = 1.1
         self.rule_files = rule_files 
-        log_cfg = create_log_dir()
-        r_dir = log_cfg["r_dir"]
+        self._log_cfg = None 
+        self._rule_data = None 
+        self._rule_index = None 
+        self._rule_types = None 
+        if r_dir is None:
+            load_dotenv()
+            r_dir = os.getenv("r_dir")
+        r_dir = "." if r_dir is None else r_dir
         if r_standard is None:
             v_msg = "Standard name is not provided."
             echo_msg(v_prg, v_stp, v_msg, 0)
             return 
         r_std = r_standard.upper()
         self.r_standard = r_std
-        self.log_cfg = log_cfg
         v_msg = f"Initializing rule builder for {r_std}..."
         echo_msg(v_prg, v_stp, v_msg, 2)
 
@@ -75,11 +88,11 @@ class RuleBuilder(ABC):
         self.sheet_name = rule_files.get(r_std,{}).get("rule_sheet")
         self.fn_xlsx = rule_files.get(r_std, {}).get("file_name")
         self.fn_yaml = r_std.lower() + ".yaml"
-        self.fn_pick = r_std.lower() + ".pick"
+        self.fn_cache = r_std.lower() + ".parquet"
         self.i_fn = self.fn_xlsx                            # keep for compatability
         self.fp_xlsx = r_dir + "/data/source/xlsx/" + self.fn_xlsx
         self.fp_yaml = r_dir + "/data/source/yaml/" + self.fn_yaml
-        self.fp_pick = r_dir + "/data/source/pick/" + self.fn_pick
+        self.fp_cache = r_dir + "/data/source/cache/" + self.fn_cache
 
         self.core_base_url = core_base_url
         self.creator_url = creator_url
@@ -89,41 +102,96 @@ class RuleBuilder(ABC):
         self.existing_rule_dir = r_dir + "/data/output/orig_rules"
         self.stat_cnts = {"total": 0, "renamed": 0, "skipped": 0, "dupped": 0, 
                           "ruleid_used": 0, "coreid_used": 0}
-        v_stp = 1.3 
-        # self.rule_data = read_rules(self.yaml_file)
-        self.rule_data = self.read_rule_definitions()
+        # log_cfg and rule_data are set up on first access 
+
+    @property
+    def log_cfg(self):
+        """
+        The log configuration from create_log_dir, created on first access.
+        """
+        if self._log_cfg is None:
+            self._log_cfg = create_log_dir()
+        return self._log_cfg
+
+    @log_cfg.setter
+    def log_cfg(self, value):
+        self._log_cfg = value
+
+    @property
+    def rule_data(self):
+        """
+        The rule definitions from read_rule_definitions, read on first access.
+        """
+        if self._rule_data is None:
+            self.log_cfg                    # set up the log files first
+            self._rule_data = self.read_rule_definitions()
+        return self._rule_data
+
+    @rule_data.setter
+    def rule_data(self, value):
+        self._rule_data = value
+        self._rule_index = None 
+        self._rule_types = None 
+
+    @property
+    def rule_index(self):
+        """
+        The row positions of each rule in rule_data from get_rule_index.
+        """
+        if self._rule_index is None:
+            from rulebuilder.get_rule_index import get_rule_index
+            self._rule_index = get_rule_index(self.rule_data)
+        return self._rule_index
+
+    @property
+    def rule_types(self):
+        """
+        The Rule_Type and Sensitivity matches of each Condition in rule_data
+        from get_cond_types. They are kept in the parquet cache with the 
+        rule table and only searched again when the cache is rebuilt.
+        """
+        if self._rule_types is None:
+            from rulebuilder.get_rule_types import get_cond_types
+            df = self.rule_data             # read with the cache 
+            if self._rule_types is None and "Condition" in df.columns:
+                self._rule_types = get_cond_types(df["Condition"])
+        return self._rule_types
   
     def read_rule_definitions (self):
         """
-        Read the rule definitions for the specified standard from a pickled file, 
-        a YAML file, or the original Excel file.
+        Read the rule definitions for the specified standard from a parquet 
+        cache, a YAML file, or the original Excel file. The cache is rebuilt 
+        whenever the YAML or Excel file it was built from has changed.
 
         Returns:
             A pandas DataFrame containing the rule definitions.
         """
+        import pandas as pd 
+        from rulebuilder.get_yaml import get_yaml
+        from rulebuilder.read_xlsx import read_xlsx
+        from rulebuilder.read_rule_cache import read_rule_cache, \
+            read_cache_meta
+        from rulebuilder.output_rule_cache import output_rule_cache
+        from rulebuilder.get_rule_types import get_cond_types, \
+            cond_types2meta, meta2cond_types
         v_prg = __name__ + ".read_rule_definition"
         v_stp = 1.0
         v_msg = f"Reading rule definition for {self.r_standard}..."
         echo_msg(v_prg, v_stp, v_msg, 1)
-        # 1.1 read from a pickled file 
-        fn = self.fp_pick
+        # the cache is built from the YAML file if it exists, otherwise from 
+        # the original xlsx file 
+        fn_src = self.fp_yaml if os.path.isfile(self.fp_yaml) else self.fp_xlsx
+
+        # 1.1 read from the cache file 
         v_stp = 1.1
-        if os.path.isfile(fn):
-            v_msg = f" . from {fn}..."
-            echo_msg(v_prg, v_stp, v_msg, 2)
-            with open(fn, 'rb') as f:
-                # Deserialize the object from the file
-                data = pickle.load(f)
-            # Create a DataFrame from the loaded data
-            df = pd.DataFrame(data)
+        df = read_rule_cache(self.fp_cache, fn_src)
+        if df is not None:
+            self._rule_types = meta2cond_types(
+                read_cache_meta(self.fp_cache).get("rule_types"))
             v_msg = f" . The dataset has {df.shape[0]} records. "
             echo_msg(v_prg, v_stp, v_msg, 2)
             return df 
-        else:
-            v_msg = f" . Could not find pickled file: {fn}."
-        echo_msg(v_prg, v_stp, v_msg, 2)
 
-        
         # 1.2 read from a yaml file 
         fn = self.fp_yaml 
         v_stp = 1.2
@@ -131,11 +199,14 @@ class RuleBuilder(ABC):
             v_msg = f" . from {fn}..."
             echo_msg(v_prg, v_stp, v_msg, 2)
             with open(fn, "r") as f:
-                data = yaml.safe_load(f)
+                data = get_yaml("safe").load(f)
             # Create DataFrame from YAML data
             df = pd.DataFrame(data)
             v_msg = f" . The dataset has {df.shape[0]} records. "
             echo_msg(v_prg, v_stp, v_msg, 2)
+            self._rule_types = get_cond_types(df.get("Condition", []))
+            output_rule_cache(df, self.fp_cache, fn, x_meta={
+                "rule_types": cond_types2meta(self._rule_types)})
             return df
         else:
             v_msg = f" . Could not find yaml file: {fn}."
@@ -149,23 +220,15 @@ class RuleBuilder(ABC):
             echo_msg(v_prg, v_stp, v_msg, 2)
 
             s_name = self.sheet_name
-            if fn.startswith('FDA'):
-                df = pd.read_excel(fn, sheet_name=s_name,
-                           header=1, engine='openpyxl')
-            else:
-                df = pd.read_excel(fn, sheet_name=s_name, engine='openpyxl')
-            # remove newline breaks in column names
-            df.columns = df.columns.str.replace('\n', '')
-            df.columns = df.columns.str.lstrip()           # remove leading spaces
-            df.columns = df.columns.str.rstrip()           # remove trailing spaces
-            # remove newline breaks in data
-            df = df.fillna('')                              # fill na with ''
-            df = df.applymap(lambda x: re.sub(r'\n\n+', '\n', str(x)))
-
-            # Convert the dataframe to a dictionary
-            df = df.to_dict(orient='records')
+            # the column names are in the 2nd row of the FDA workbook
+            v_hdr = 1 if os.path.basename(fn).startswith('FDA') else 0
+            df = read_xlsx(fn, s_name=s_name, header=v_hdr)
+
             v_msg = f" . The dataset has {df.shape[0]} records. "
             echo_msg(v_prg, v_stp, v_msg, 2)
+            self._rule_types = get_cond_types(df.get("Condition", []))
+            output_rule_cache(df, self.fp_cache, fn, x_meta={
+                "rule_types": cond_types2meta(self._rule_types)})
             return df
         else:
             v_msg = f" . Could not find xlsx file: {fn}."
@@ -186,15 +249,26 @@ class RuleBuilder(ABC):
         Returns:
             A JSON object representing the specified rule.
         """
-        df_data = self.rule_data
-        rule_data = df_data[df_data["Rule ID"] == rule_id]
-        a_json = proc_each_yaml(rule_id=rule_id,
-            rule_data=rule_data, rule_tmp = self.rule_obj, 
+        from rulebuilder.proc_each_yaml import proc_each_yaml
+        v_prg = __name__ + ".build_a_rule"
+        v_stp = 1.0
+        r_pos = self.rule_index.get(rule_id)
+        if r_pos is None:
+            v_msg = f"Could not find rule definitions for {rule_id}."
+            echo_msg(v_prg, v_stp, v_msg, 0)
+            return None
+        rule_data = self.rule_data.iloc[r_pos].reset_index(drop=True)
+        a_json = proc_each_yaml(rule_id=rule_id, rule_data=rule_data, 
             rule_dir = self.existing_rule_dir,get_db_rule=1)
         return a_json 
     
-    def get_doc_stats (self, db_name:str=None, ct_name:str=None):
-        get_doc_stats(db = db_name, ct = ct_name, wrt2file=1)
+    def get_doc_stats (self, db_name:str=None, ct_name:str=None, 
+                       wrt2file:int=1, full_scan:int=0):
+        from rulebuilder.get_doc_stats import get_doc_stats
+        if wrt2file == 1:
+            self.log_cfg                    # the stats file goes to log_dir
+        return get_doc_stats(db = db_name, ct = ct_name, wrt2file=wrt2file,
+                             full_scan=full_scan)
 
 
     def process(self, r_standard: str = None, 
@@ -202,7 +276,10 @@ class RuleBuilder(ABC):
                 s_class: list = [], s_domain: list = [],           
                 wrt2log: int = 1, pub2db: int = 0,
                 get_db_rule: int = 1,
-                db_name: str = None, ct_name: str = "core_rules_dev"
+                db_name: str = None, ct_name: str = "core_rules_dev",
+                skip_unchanged: int = 1,
+                pub_concurrency: int = 8,
+                pub_mode: str = "recreate"
                 ):
         """
         Process the rule definitions for the specified standard.
@@ -218,7 +295,11 @@ class RuleBuilder(ABC):
             get_db_rule (int): A flag indicating whether to get rules from a database (default: 1).
             db_name (str): The name of the database to use (default: None).
             ct_name (str): The name of the container to use (default: "core_rules_dev").
+            skip_unchanged (int): A flag indicating whether to skip the rules that have not changed since their last build (default: 1).
+            pub_concurrency (int): The number of rules published at the same time; 1 publishes each rule right after it is built (default: 8).
+            pub_mode (str): recreate to overwrite the rules in the database or replace to only write the rules that have not changed there since they were read (default: "recreate").
         """
+        from rulebuilder.proc_rules import proc_rules
         v_prg = __name__ + ".process"
         v_stp = 1.0
         v_msg = "Processing CORE rule definitions..."
@@ -263,7 +344,11 @@ class RuleBuilder(ABC):
                     pub2db=pub2db,
                     get_db_rule=get_db_rule,
                     db_name=db_name, ct_name=ct_name,
-                    log_cfg=self.log_cfg
+                    log_cfg=self.log_cfg,
+                    skip_unchanged=skip_unchanged,
+                    pub_concurrency=pub_concurrency,
+                    pub_mode=pub_mode,
+                    r_types=self.rule_types
                     )
 
 
@@ -2,18 +2,23 @@
 # -----------------------------------------------------------------------------
 # History: MM/DD/YYYY (developer) - description
 #   04/05/2023 (htu) - initial coding 
+#   10/18/2026 (htu) - 
+#     1. added r_docs to use the docs prefetched by get_db_rules
+#     2. used the cached doc stats from get_doc_snapshot if r_ids is None 
+#     3. refreshed the doc stats once if the rule is not in them or its 
+#        doc is not found 
 #
 import os
 import sys
 import json 
 from rulebuilder.get_db_cfg import get_db_cfg
 from rulebuilder.echo_msg import echo_msg
-from rulebuilder.get_doc_stats import get_doc_stats
+from rulebuilder.get_doc_snapshot import get_doc_snapshot
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
 
 
 def read_db_rule(rule_id: str, db_cfg = None, r_ids = None, 
-                 db_name:str=None, ct_name:str=None):
+                 db_name:str=None, ct_name:str=None, r_docs = None):
     v_prg = __name__
 
     # 1.0 check parameters
@@ -38,36 +43,97 @@ def read_db_rule(rule_id: str, db_cfg = None, r_ids = None,
     db  = db_cfg.get("db_name")
     ct  = db_cfg.get("ct_name")
 
-    # 1.3 get rule stats
+    # 1.3 get rule stats without scanning the container for every rule
+    n_try = 1
     if r_ids is None:
-        r_ids = get_doc_stats(db=db,ct=ct)
+        r_ids = get_doc_snapshot(db=db, ct=ct, db_cfg=db_cfg) or {}
+        # the snapshot can be older than the container; read it again once 
+        # if the rule is not in it or its doc is gone 
+        n_try = 2
 
     # 2.0 read the doc associated with the rule_id
+    p_docs = {} if r_docs is None else r_docs
     r_json = {}
-    if rule_id in r_ids.keys():
+    for i_try in range(n_try):
+        if i_try > 0:
+            v_stp = 2.3
+            v_msg = f"Refreshing the doc stats of {db}.{ct} for {rule_id}..."
+            echo_msg(v_prg, v_stp, v_msg, 2)
+            r_ids = get_doc_snapshot(db=db, ct=ct, db_cfg=db_cfg,
+                                     refresh=True) or {}
+        v_lvl = 0 if i_try == n_try - 1 else 2
+        if rule_id not in r_ids.keys():
+            v_stp = 2.2
+            v_msg = f"Could not find {rule_id} in {db}.{ct}"
+            echo_msg(v_prg, v_stp, v_msg, v_lvl)
+            continue
         v_stp = 2.1
         r_docs = r_ids.get(rule_id, {}).get("ids")
         d_id = r_docs[0]
+        if d_id in p_docs:
+            # each prefetched doc is handed out once, as read_item would 
+            # return a new doc for each call 
+            v_stp = 2.10
+            v_msg = f"Using prefetched {rule_id} ({d_id}) from {db}.{ct}"
+            echo_msg(v_prg, v_stp, v_msg, 2)
+            return p_docs.pop(d_id)
         try:
             v_stp = 2.11
             v_msg = f"Reading {rule_id} ({d_id}) in {db}.{ct}"
             r_json = ctc.read_item(item=d_id, partition_key=d_id)
             echo_msg(v_prg, v_stp, v_msg, 2)
+            return r_json
         except CosmosResourceNotFoundError:
             v_stp = 2.12
             v_msg = f"Could not read {rule_id} ({d_id}) from {db}.{ct}"
-            echo_msg(v_prg, v_stp, v_msg, 0)
-    else:
-        v_stp = 2.2
-        
-        v_msg = f"Could not find {rule_id} in {db}.{ct}"
-        echo_msg(v_prg, v_stp, v_msg, 0)
+            echo_msg(v_prg, v_stp, v_msg, v_lvl)
     
     return r_json
 
 
 # Test cases
 if __name__ == "__main__":
+    from rulebuilder.get_doc_snapshot import drop_doc_snapshot
+
+    class _Container:
+        # a container whose docs have changed since the snapshot was read
+        def __init__(self):
+            self.docs = {"g1": {"id": "g1"}}
+            self.n_qry = 0
+
+        def read_item(self, item, partition_key):
+            if item not in self.docs:
+                raise CosmosResourceNotFoundError(message="not found")
+            return dict(self.docs[item])
+
+        def query_items(self, query, **kwargs):
+            # the doc stats of get_stat_docs; no output_dir, no watermark
+            self.n_qry += 1
+            return [{"id": d, "core_status": "Draft",
+                     "r_id": d.replace("g", "CG000"), "_ts": 1}
+                    for d in self.docs]
+
+    os.environ["g_lvl"] = "0"
+    os.environ.pop("output_dir", None)
+    ctc = _Container()
+    cfg = {"db_name": "library", "ct_name": "test", "ct_conn": ctc}
+    drop_doc_snapshot("library", "test")
+    assert read_db_rule("CG0001", db_cfg=cfg)["id"] == "g1"
+    # Test case 1: a doc deleted and a rule added since the snapshot are
+    #   read after the snapshot is refreshed once
+    ctc.docs = {"g2": {"id": "g2"}, "g3": {"id": "g3"}}
+    assert read_db_rule("CG0002", db_cfg=cfg)["id"] == "g2"
+    assert ctc.n_qry == 2
+    ctc.docs["g1"] = {"id": "g1"}
+    del ctc.docs["g3"]
+    assert read_db_rule("CG0001", db_cfg=cfg)["id"] == "g1"
+    assert read_db_rule("CG0003", db_cfg=cfg) == {}
+    assert ctc.n_qry == 4
+    # Test case 2: the r_ids of the caller are not refreshed
+    assert read_db_rule("CG0003", db_cfg=cfg, r_ids={}) == {}
+    assert ctc.n_qry == 4
+    print("All tests are successful!")
+
     # set input parameters
     os.environ["g_lvl"] = "3"
     v_prg = __name__ + "::read_db_rule"
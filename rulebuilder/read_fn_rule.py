@@ -5,6 +5,9 @@
 #   04/06/2023 (htu) - removed unused packages: transformer.transformer, 
 #     ruamel.yaml, datetime, sys, uuid, yaml.safe_load
 #   04/08/2023 (htu) - renamed read_a_rule to read_fn_rule 
+#   10/18/2026 (htu) - looked up the rule file by exact rule id or doc id in 
+#     the index from get_rule_file_index instead of listing the folder and 
+#     reading the files one by one 
 #
 
 import os
@@ -12,6 +15,8 @@ import json
 # from io import StringIO
 from dotenv import load_dotenv
 from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_rule_file_index import get_rule_file_index, \
+    check_rule_file
 
 
 def read_fn_rule(rule_id:str=None, doc_id: str = None, rule_dir: str = None):
@@ -48,35 +53,41 @@ def read_fn_rule(rule_id:str=None, doc_id: str = None, rule_dir: str = None):
 
     cnt = {"All":0, "Searched": 0, "Matched": 0}
     r_json = {}
-    rule_guid = None
-    all_files = os.listdir(rule_dir)
-    cnt["All"] = len(all_files)
-    for filename in all_files:
-        cnt["Searched"] += 1
-        filepath = os.path.join(rule_dir, filename)
-        # 2.1 search the file using rule_id 
-        if rule_id is not None and rule_id in filename:
-            cnt["Matched"] += 1
-            v_stp = 2.1
-            v_msg = f" . Reading rule_id ({rule_id}) file: {filename}"
-            echo_msg(v_prg, v_stp, v_msg, 4)
-            with open(filepath, 'r') as f:
-                r_json = json.load(f)
-                rule_guid = r_json.get('id')
-            break
-        if doc_id is not None and doc_id != rule_guid: 
-            v_stp = 2.2
-            with open(filepath, 'r') as f:
-               r_json = json.load(f)
-               rule_guid = r_json.get('id')
-               core_id = r_json.get("json",{}).get("Core",{}).get("Id")
-               v_msg = f" . Reading file {filename}: {core_id}"
-               echo_msg(v_prg, v_stp, v_msg, 4)
-            if doc_id == rule_guid: 
-                v_msg = f" . Matched: ({doc_id})=({rule_guid})"
-                echo_msg(v_prg, v_stp, v_msg, 4)
-                cnt["Matched"] += 1
+    if not os.path.isdir(rule_dir):
+        v_msg = f"Could not find rule_dir: {rule_dir}"
+        echo_msg(v_prg, v_stp, v_msg, 0)
+        return {}
+    idx = get_rule_file_index(rule_dir, with_ids=(rule_id is None))
+    cnt["All"] = len(idx["files"])
+
+    # 2.1 search the file using rule_id; then using doc_id 
+    fp = None
+    if rule_id is not None:
+        v_stp = 2.1
+        for filename in list(idx["rules"].get(rule_id, [])):
+            cnt["Searched"] += 1
+            if check_rule_file(rule_dir, filename) is not None:
+                fp = os.path.join(rule_dir, filename)
+                break
+    if fp is None and doc_id is not None:
+        v_stp = 2.2
+        if rule_id is not None:
+            idx = get_rule_file_index(rule_dir, with_ids=True)
+        for filename in list(idx["docs"].get(doc_id, [])):
+            cnt["Searched"] += 1
+            e = check_rule_file(rule_dir, filename, with_ids=True)
+            if e is not None and e["id"] == doc_id:
+                fp = os.path.join(rule_dir, filename)
                 break
+    if fp is not None:
+        cnt["Matched"] += 1
+        v_msg = f" . Reading rule file: {os.path.basename(fp)}"
+        echo_msg(v_prg, v_stp, v_msg, 4)
+        with open(fp, 'r') as f:
+            r_json = json.load(f)
+        if doc_id is not None and rule_id is None:
+            v_msg = f" . Matched: ({doc_id})=({r_json.get('id')})"
+            echo_msg(v_prg, v_stp, v_msg, 4)
 
     v_stp = 2.3
     v_msg = f" . Result(Matched/Searched/All): {cnt['Matched']}/{cnt['Searched']}/{cnt['All']}. "
@@ -0,0 +1,99 @@
+# Purpose: Read rule definitions from a columnar (Parquet) cache file
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - 
+#     1. initial coding to replace the pickled rule definitions
+#     2. added read_cache_meta 
+#
+
+import os
+import pyarrow.parquet as pq
+from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_file_hash import get_file_hash
+
+# bump this whenever the layout of the cached rule table changes
+CACHE_VERSION = "1"
+
+
+def read_cache_meta(fn_cache: str):
+    """
+    Returns the key/value metadata stamped on a cache file, or an empty
+    dict if the cache file does not exist.
+    """
+    if fn_cache is None or not os.path.isfile(fn_cache):
+        return {}
+    meta = pq.read_schema(fn_cache).metadata or {}
+    return {k.decode(): v.decode() for k, v in meta.items()}
+
+
+def read_rule_cache(fn_cache: str, fn_src: str):
+    """
+    ===============
+    read_rule_cache
+    ===============
+    This method reads the rule definitions from a Parquet cache file. The
+    cache is only used when its schema version matches CACHE_VERSION and
+    it was built from the current content of the source file.
+
+    Parameters:
+    -----------
+    fn_cache: str
+        the cache file name with full path
+    fn_src: str
+        the source file (.yaml or .xlsx) the cache was built from
+
+    returns
+    -------
+        df: a data frame containing the rule definitions or None if the
+            cache does not exist or is stale
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    if fn_cache is None or not os.path.isfile(fn_cache):
+        v_msg = f" . Could not find cache file: {fn_cache}."
+        echo_msg(v_prg, v_stp, v_msg, 2)
+        return None
+
+    # 1.1 check the cache version and its source
+    v_stp = 1.1
+    meta = read_cache_meta(fn_cache)
+    if meta.get("crb_version") != CACHE_VERSION:
+        v_msg = f" . Cache version {meta.get('crb_version')} is not {CACHE_VERSION}."
+        echo_msg(v_prg, v_stp, v_msg, 2)
+        return None
+    if fn_src is None or not os.path.isfile(fn_src):
+        v_msg = f" . Could not find source file: {fn_src}."
+        echo_msg(v_prg, v_stp, v_msg, 2)
+        return None
+    if meta.get("src_file") != os.path.basename(fn_src):
+        v_msg = f" . Cache was built from {meta.get('src_file')}."
+        echo_msg(v_prg, v_stp, v_msg, 2)
+        return None
+
+    # 1.2 only hash the source when its size or mtime has changed
+    v_stp = 1.2
+    st = os.stat(fn_src)
+    if (meta.get("src_size") != str(st.st_size) or
+            meta.get("src_mtime") != str(st.st_mtime_ns)):
+        if get_file_hash(fn_src) != meta.get("src_hash"):
+            v_msg = f" . Cache is older than {fn_src}."
+            echo_msg(v_prg, v_stp, v_msg, 2)
+            return None
+
+    # 2.0 read the rule table
+    v_stp = 2.0
+    v_msg = f" . from {fn_cache}..."
+    echo_msg(v_prg, v_stp, v_msg, 2)
+    df = pq.read_table(fn_cache).to_pandas()
+    return df
+
+
+# Test cases
+if __name__ == "__main__":
+    os.environ["g_lvl"] = "3"
+    # Test case 1: the cache file does not exist
+    assert read_rule_cache("./no_such_file.parquet", __file__) is None
+    print("All tests are successful!")
+
+# End of File
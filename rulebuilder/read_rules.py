@@ -3,13 +3,14 @@
 # History: MM/DD/YYYY (developer) - description
 #   03/17/2023 (htu) - Extracted out from sdtmrulebuilder 
 #                    - added docstring and echo_msg 
+#   10/18/2026 (htu) - read the YAML file with the shared safe YAML codec 
 #
 
 import os 
 import pandas as pd
-import ruamel.yaml as yaml
 from dotenv import load_dotenv
 from rulebuilder.echo_msg import echo_msg
+from rulebuilder.get_yaml import get_yaml
 
 
 def read_rules(yaml_file=None):
@@ -43,7 +44,7 @@ def read_rules(yaml_file=None):
     echo_msg(v_prg, v_step, v_msg, 2)
     # 1.2 Read rule definition file (YAML file)
     with open(yaml_file, "r") as f:
-        yaml_data = yaml.safe_load(f)
+        yaml_data = get_yaml("safe").load(f)
     # print(yaml_data[0])
 
     # Create DataFrame from YAML data
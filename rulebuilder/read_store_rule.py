@@ -0,0 +1,96 @@
+# Purpose: Read a rule document from the local SQLite rule store
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding based on read_fn_rule
+#
+
+import os
+import json
+from rulebuilder.echo_msg import echo_msg
+
+
+def read_store_rule(rule_id: str = None, doc_id: str = None,
+                    store_cfg: dict = None, kind: str = "orig"):
+    """
+    ===============
+    read_store_rule
+    ===============
+    This method reads a rule document from the rule store by rule id or by
+    doc id (GUID), in the same way read_fn_rule reads it from a folder. If
+    more than one document matches, the latest one written is returned.
+
+    Parameters:
+    -----------
+    rule_id: str
+        the rule id, e.g., CG0001, or the name of the rule, e.g., CG0001-Draft
+    doc_id: str
+        the GUID of the rule document; used if rule_id is not found
+    store_cfg: dict
+        the rule store from get_store_cfg
+    kind: str
+        orig for the existing rules or json for the built rules
+
+    returns
+    -------
+        r_json: the rule document or {} if it is not found
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    v_msg = "Read a rule from the rule store..."
+    echo_msg(v_prg, v_stp, v_msg, 2)
+    if rule_id is None and doc_id is None:
+        v_stp = 1.1
+        v_msg = "No rule id nor doc id is provided. "
+        echo_msg(v_prg, v_stp, v_msg, 0)
+        return {}
+    conn = (store_cfg or {}).get("st_conn")
+    if conn is None:
+        v_stp = 1.2
+        v_msg = "No rule store is provided."
+        echo_msg(v_prg, v_stp, v_msg, 0)
+        return {}
+
+    # 2.0 search the rule in the store
+    v_stp = 2.0
+    row = None
+    if rule_id is not None:
+        v_stp = 2.1
+        # one query for each column so that each uses its index
+        row = conn.execute(
+            "SELECT doc FROM rules WHERE kind = ? AND rule_id = ? "
+            "ORDER BY updated DESC LIMIT 1", (kind, rule_id)).fetchone()
+        if row is None:
+            row = conn.execute(
+                "SELECT doc FROM rules WHERE kind = ? AND name = ?",
+                (kind, rule_id)).fetchone()
+    if row is None and doc_id is not None:
+        v_stp = 2.2
+        row = conn.execute(
+            "SELECT doc FROM rules WHERE kind = ? AND guid = ? "
+            "ORDER BY updated DESC LIMIT 1", (kind, doc_id)).fetchone()
+    v_msg = f" . Found {kind} rule ({rule_id} / {doc_id}): {row is not None}"
+    echo_msg(v_prg, v_stp, v_msg, 3)
+    return {} if row is None else json.loads(row[0])
+
+
+# Test cases
+if __name__ == "__main__":
+    import tempfile
+    from rulebuilder.get_store_cfg import get_store_cfg
+    from rulebuilder.output_rule2store import output_rule2store
+    os.environ["g_lvl"] = "0"
+    cfg = get_store_cfg(os.path.join(tempfile.mkdtemp(), "rules.sqlite"))
+    doc = {"id": "g1", "json": {"Core": {"Id": "X", "Status": "Draft"}}}
+    output_rule2store(cfg, "orig", "CG0001-Draft", doc)
+    # Test case 1: read by rule id, by name and by doc id
+    assert read_store_rule("CG0001", store_cfg=cfg)["id"] == "g1"
+    assert read_store_rule("CG0001-Draft", store_cfg=cfg)["id"] == "g1"
+    assert read_store_rule(doc_id="g1", store_cfg=cfg)["id"] == "g1"
+
+    # Test case 2: exact match only and kinds are separate
+    assert read_store_rule("CG000", store_cfg=cfg) == {}
+    assert read_store_rule("CG0001", store_cfg=cfg, kind="json") == {}
+    print("All tests are successful!")
+
+# End of File
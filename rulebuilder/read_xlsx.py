@@ -0,0 +1,169 @@
+# Purpose: Read rule definitions from a sheet in an Excel workbook
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding based on read_xlsx in scripts/cvt_files
+#     to stream rows in read-only mode and clean up the data by column
+#   10/18/2026 (htu) - dropped the empty columns at the end of the sheet 
+#     dimension as pd.read_excel does and added test cases 
+#
+
+import os
+import pandas as pd
+from openpyxl import load_workbook
+from rulebuilder.echo_msg import echo_msg
+
+
+def read_xlsx(fn: str, s_name: str = None, header: int = 0,
+              chunk_size: int = 5000):
+    """
+    =========
+    read_xlsx
+    =========
+    This method streams the rows of a sheet with openpyxl in read-only mode
+    and returns them in a data frame. Newline breaks and leading/trailing
+    spaces are removed from the column names, empty cells are filled with ''
+    and repeated newline breaks in the data are collapsed into one. Rows are
+    cleaned up a chunk at a time so only one chunk of raw cell values is
+    kept in memory.
+
+    Parameters:
+    -----------
+    fn: str
+        the Excel file name with full path
+    s_name: str
+        the sheet name (default is the active sheet)
+    header: int
+        the 0-based row number of the column names (default is 0)
+    chunk_size: int
+        number of rows cleaned up at a time (default is 5000)
+
+    returns
+    -------
+        df: a data frame with all the cells as strings
+
+    """
+    v_prg = __name__
+    v_stp = 1.0
+    if fn is None or not os.path.isfile(fn):
+        v_msg = f"Could not find xlsx file: {fn}."
+        echo_msg(v_prg, v_stp, v_msg, 0)
+        return pd.DataFrame()
+    v_msg = f"Reading from {fn}...\n  . Sheet: {s_name}"
+    echo_msg(v_prg, v_stp, v_msg, 2)
+
+    def cvt_cell(x):
+        # keep the same text pd.read_excel gives for whole numbers
+        if x is None:
+            return ''
+        if isinstance(x, float) and x.is_integer():
+            return str(int(x))
+        return str(x)
+
+    def clean_chunk(rows, cols):
+        d = pd.DataFrame(rows, columns=cols, dtype=object)
+        for c in cols:
+            d[c] = d[c].str.replace(r'\n\n+', '\n', regex=True)
+        return d
+
+    # 2.0 stream the rows
+    v_stp = 2.0
+    wb = load_workbook(fn, read_only=True, data_only=True)
+    try:
+        ws = wb[s_name] if s_name is not None else wb.active
+        r_iter = ws.iter_rows(values_only=True)
+        for _ in range(header):
+            next(r_iter, None)
+        h_row = next(r_iter, None) or ()
+
+        # 2.1 clean up column names
+        v_stp = 2.1
+        cols = []
+        for i, h in enumerate(h_row):
+            c = f"Unnamed: {i}" if h is None else str(h).replace('\n', '').strip()
+            k = c
+            j = 0
+            while k in cols:
+                j += 1
+                k = f"{c}.{j}"
+            cols.append(k)
+        n_col = len(cols)
+        # the number of columns with a name or a value; read-only mode also 
+        # returns the empty columns at the end of the sheet dimension 
+        n_use = max((i + 1 for i, h in enumerate(h_row) if h is not None),
+                    default=0)
+
+        # 2.2 collect and clean up the data a chunk at a time
+        v_stp = 2.2
+        chunks = []
+        rows = []
+        for r in r_iter:
+            if all(x is None for x in r):
+                continue                    # skip blank rows
+            r = r[:n_col]
+            for i in range(len(r) - 1, n_use - 1, -1):
+                if r[i] is not None:
+                    n_use = i + 1
+                    break
+            r = [cvt_cell(x) for x in r]
+            r += [''] * (n_col - len(r))
+            rows.append(r)
+            if len(rows) >= chunk_size:
+                chunks.append(clean_chunk(rows, cols))
+                rows = []
+        if rows or not chunks:
+            chunks.append(clean_chunk(rows, cols))
+    finally:
+        wb.close()
+
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    if n_use < n_col:
+        df = df.iloc[:, :n_use]
+    v_stp = 3.0
+    v_msg = f" . The dataset has {df.shape[0]} records. "
+    echo_msg(v_prg, v_stp, v_msg, 2)
+    return df
+
+
+# Test cases
+if __name__ == "__main__":
+    import tempfile
+    from openpyxl import Workbook
+    os.environ["g_lvl"] = "0"
+    # Test case 1: the file does not exist
+    df = read_xlsx("./no_such_file.xlsx", "Sheet1")
+    assert df.empty
+
+    # a sheet with a title row, a missing and a repeated column name, 
+    # numbers, blank rows and two empty columns at the end of its dimension
+    fn = os.path.join(tempfile.mkdtemp(), "rules.xlsx")
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Rules"
+    ws.append(["Conformance Rules"])
+    ws.append(["Rule ID", None, "Item", "Item", "Version"])
+    ws.append(["CG0001", "a", 1, 2.0, 3.2])
+    ws.append([None] * 5)
+    for i in range(2, 7):
+        ws.append([f"CG{i:04d}", None, "x\ny", None, i * 1.0])
+    ws.cell(row=10, column=7, value=None).number_format = "0.00"
+    wb.save(fn)
+
+    # Test case 2: the same data frame as pd.read_excel without the blank 
+    #   rows, in one chunk and in many 
+    x = pd.read_excel(fn, "Rules", header=1, dtype=str).fillna('')
+    x = x[(x != '').any(axis=1)].reset_index(drop=True).astype(object)
+    for n in (5000, 2):
+        df = read_xlsx(fn, "Rules", header=1, chunk_size=n)
+        assert list(df.columns) == \
+            ["Rule ID", "Unnamed: 1", "Item", "Item.1", "Version"]
+        assert df.equals(x), (df, x)
+    assert df["Version"].tolist() == ["3.2", "2", "3", "4", "5", "6"]
+
+    # Test case 3: the header row is the first row by default
+    df = read_xlsx(fn, "Rules")
+    assert list(df.columns) == ["Conformance Rules", "Unnamed: 1",
+                                "Unnamed: 2", "Unnamed: 3", "Unnamed: 4"]
+    assert df.shape == (7, 5)
+    print("All tests are successful!")
+
+# End of File
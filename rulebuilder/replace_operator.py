@@ -3,10 +3,48 @@
 # History: MM/DD/YYYY (developer) - description
 #   03/21/2023 (htu) - initial coding 
 #   03/24/2023 (htu) - modified i_dict 
+#   10/18/2026 (htu) - 
+#     1. moved the default dict to OPERATOR_MAP 
+#     2. added get_rewriter to compile and cache the pattern for each dict
 #    
 #
 
 import re
+from functools import lru_cache
+
+OPERATOR_MAP = {r"\s+=\s+":    " not equal to ", 
+                r"\s+^=\s+":   " is ", 
+                r"in\s+\(":    " not in (",
+                r"\s+no\s+":   " have ", 
+                r"\s+>\s+":    "  equal to or less than ",
+                r"\s+<=\s+":   " granter than "
+                }
+
+
+@lru_cache(maxsize=32)
+def _compile_rewriter(i_items: tuple):
+    i_dict = dict(i_items)
+    pattern = re.compile("|".join(map(re.escape, i_dict.keys())))
+    return pattern, lambda x: i_dict[x.group()]
+
+
+def get_rewriter(i_dict = None):
+    """
+    Returns the compiled pattern and the replacement function for a dictionary. 
+    They are compiled once for each dictionary and can be used with re.sub or 
+    Series.str.replace.
+
+    Args:
+        i_dict (dict): A dictionary with operators as keys and their replacements as values.
+            OPERATOR_MAP is used if it is None or empty.
+
+    Returns:
+        tuple: (pattern, repl)
+    """
+    if i_dict is None or (isinstance(i_dict, dict) and not bool(i_dict)):
+        i_dict = OPERATOR_MAP
+    return _compile_rewriter(tuple(i_dict.items()))
+
 
 def replace_operator(i_str, i_dict = None):
     """
@@ -22,17 +60,8 @@ def replace_operator(i_str, i_dict = None):
     if i_str is None:
         return None
     
-    if i_dict is None or (isinstance(i_dict, dict) and not bool(i_dict)):
-        i_dict = {"\s+=\s+":    " not equal to ", 
-                  "\s+^=\s+":   " is ", 
-                  "in\s+\(":    " not in (",
-                  "\s+no\s+":   " have ", 
-                  "\s+>\s+":    "  equal to or less than ",
-                  "\s+<=\s+":   " granter than "
-                  }
-
-    pattern = re.compile("|".join(map(re.escape, i_dict.keys())))
-    return pattern.sub(lambda x: i_dict[x.group()], i_str)
+    pattern, repl = get_rewriter(i_dict)
+    return pattern.sub(repl, i_str)
 
 if __name__ == "__main__":
     s1 = "a = b and c ^= d and e in (1,2,3)"
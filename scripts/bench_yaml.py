@@ -0,0 +1,142 @@
+# Purpose: Compare the YAML codec paths used to read and write rules
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding to compare a new YAML() on each call
+#     with the shared round-trip and safe codecs from get_yaml
+#
+# Examples:
+# python scripts/bench_yaml.py
+# python scripts/bench_yaml.py --n 2000 --rule_file ./data/output/rules_yaml/CG0001.yaml
+
+import os
+import sys
+import time
+import click
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from io import StringIO
+from ruamel.yaml import YAML
+from rulebuilder.get_yaml import load_yaml, dump_yaml
+
+# a typical rule content with comments and quoted strings
+RULE_CONTENT = """# Variable: AESER
+# Condition: AESER = 'Y'
+# Rule: AEOUT ^= 'NOT RECOVERED/NOT RESOLVED'
+Authorities:
+  - Organization: CDISC
+    Standards:
+      - Name: SDTMIG
+        Version: '3.4'
+        References:
+          - Citations:
+              - Cited Guidance: 'Variable AESER is required'
+                Document: IG v3.4
+                Section: '6.2'
+            Origin: SDTM and SDTMIG Conformance Rules
+            Rule Identifier:
+              Id: CG0001
+              Version: '1'
+            Version: '2.0'
+Check:
+  all:
+    - name: AESER
+      operator: equal_to
+      value: "Y"
+    - name: AEOUT
+      operator: not_equal_to
+      value: NOT RECOVERED/NOT RESOLVED
+Core:
+  Id: CDISC.SDTMIG.CG0001
+  Status: Draft
+  Version: '1'
+Description: Raise an error when AESER = 'Y' and AEOUT ^= 'NOT RECOVERED'
+Executability: Fully Executable
+Outcome:
+  Message: AESER = 'Y' and AEOUT ^= 'NOT RECOVERED/NOT RESOLVED'
+Rule Type: Record Data
+Scope:
+  Classes:
+    Include:
+      - EVENTS
+  Domains:
+    Include:
+      - AE
+Sensitivity: Record
+"""
+
+
+def _new_rt():
+    y = YAML()
+    y.indent(mapping=2, sequence=4, offset=2)
+    y.preserve_quotes = True
+    return y
+
+
+def _per_call(s):
+    d = _new_rt().load(s)
+    buf = StringIO()
+    _new_rt().dump(d, buf)
+    return buf.getvalue()
+
+
+def _pooled(s, typ):
+    return dump_yaml(load_yaml(s, typ), typ)
+
+
+def bench_yaml(s: str = RULE_CONTENT, n: int = 500):
+    """
+    ==========
+    bench_yaml
+    ==========
+    This method loads and dumps the rule content s n times with each codec
+    path and prints the seconds per rule.
+
+    Parameters:
+    -----------
+    s: str
+        the rule content in YAML
+    n: int
+        number of loads and dumps for each path
+
+    returns
+    -------
+        a dict of {path: seconds per rule}
+
+    """
+    paths = {
+        "new YAML() per call": _per_call,
+        "shared round-trip": lambda x: _pooled(x, "rt"),
+        "shared safe": lambda x: _pooled(x, "safe"),
+    }
+    from ruamel.yaml.main import CParser
+    print(f"ruamel.yaml.clib (C-based safe codec) is installed: {CParser is not None}")
+    r = {}
+    print(f"{'Path':<24} {'ms/rule':>10} {'Speedup':>8}")
+    for k, f in paths.items():
+        f(s)
+        t0 = time.perf_counter()
+        for _ in range(n):
+            f(s)
+        r[k] = (time.perf_counter() - t0) / n
+    base = r["new YAML() per call"]
+    for k, sec in r.items():
+        print(f"{k:<24} {sec * 1000:10.3f} {base / sec:7.2f}x")
+    return r
+
+
+@click.command()
+@click.option('--n', default=500, help='Number of loads and dumps for each path.')
+@click.option('--rule_file', default=None, help='A rule YAML file to use instead of the sample rule.')
+def main(n, rule_file):
+    s = RULE_CONTENT
+    if rule_file is not None:
+        with open(rule_file, "r") as f:
+            s = f.read()
+    bench_yaml(s, n)
+
+
+if __name__ == "__main__":
+    main()
+
+# End of File
@@ -0,0 +1,117 @@
+# Purpose: Check the startup time of the rulebuilder command line
+# -----------------------------------------------------------------------------
+# History: MM/DD/YYYY (developer) - description
+#   10/18/2026 (htu) - initial coding to keep the CLI subcommands and the
+#     RuleBuilder construction within their startup time budgets
+#
+# Examples:
+# python scripts/check_startup.py
+# python scripts/check_startup.py --runs 5 --scale 2.0
+
+import os
+import sys
+import time
+import subprocess
+import statistics
+import click
+
+# wall-clock budgets in seconds, including the Python interpreter start;
+# none of these should need pandas, pyarrow or azure.cosmos
+BUDGETS = {
+    "--help": 0.5,
+    "initialize --help": 0.5,
+    "build-rule --help": 0.5,
+    "get-doc-statistics --help": 0.5,
+    "process --help": 0.5,
+    "RuleBuilder()": 0.5,
+}
+
+HEAVY_MODULES = ["pandas", "pyarrow", "azure.cosmos", "openpyxl"]
+
+
+def time_cmd(args: list, r_dir: str, runs: int = 3):
+    """
+    Returns the median wall-clock seconds of running args in r_dir.
+    """
+    secs = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(args, cwd=r_dir, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        secs.append(time.perf_counter() - t0)
+    return statistics.median(secs)
+
+
+def check_startup(r_dir: str = None, runs: int = 3, scale: float = 1.0):
+    """
+    ===============
+    check_startup
+    ===============
+    This method times each CLI subcommand with --help and the construction
+    of a RuleBuilder in a new interpreter, and checks that constructing a
+    RuleBuilder does not import any of the heavy modules.
+
+    Parameters:
+    -----------
+    r_dir: str
+        the root directory of the repository (default is the parent of
+        this script)
+    runs: int
+        number of runs for each command; the median is reported
+    scale: float
+        a factor applied to all the budgets, e.g., for a slow build machine
+
+    returns
+    -------
+        a list of the checks that are over budget
+
+    """
+    if r_dir is None:
+        r_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    py = sys.executable
+    cli = os.path.join(r_dir, "rulebuilder.py")
+    code = ("import sys; from rulebuilder.rbuilder import RuleBuilder; "
+            "RuleBuilder(); "
+            "print('HEAVY:' + ','.join(m for m in "
+            f"{HEAVY_MODULES!r} if m in sys.modules))")
+
+    over = []
+    print(f"{'Check':<28} {'Seconds':>8} {'Budget':>8}")
+    for k, budget in BUDGETS.items():
+        if k == "RuleBuilder()":
+            args = [py, "-c", code]
+        else:
+            args = [py, cli] + k.split()
+        sec = time_cmd(args, r_dir, runs)
+        budget *= scale
+        flag = "" if sec <= budget else "  OVER"
+        print(f"{k:<28} {sec:8.3f} {budget:8.3f}{flag}")
+        if flag:
+            over.append(k)
+
+    r = subprocess.run([py, "-c", code], cwd=r_dir, capture_output=True,
+                       text=True, check=True)
+    heavy = [x[6:] for x in r.stdout.splitlines() if x.startswith("HEAVY:")]
+    heavy = heavy[-1] if heavy else ""
+    if heavy:
+        print(f"RuleBuilder() imported: {heavy}")
+        over.append("RuleBuilder() imports")
+    return over
+
+
+@click.command()
+@click.option('--r_dir', default=None, help='The root directory of the repository.')
+@click.option('--runs', default=3, help='Number of runs for each command.')
+@click.option('--scale', default=1.0, help='A factor applied to all the budgets.')
+def main(r_dir, runs, scale):
+    over = check_startup(r_dir=r_dir, runs=runs, scale=scale)
+    if over:
+        print(f"Over budget: {', '.join(over)}")
+        sys.exit(1)
+    print("All checks are within budget.")
+
+
+if __name__ == "__main__":
+    main()
+
+# End of File
@@ -2,17 +2,34 @@
 # History: MM/DD/YYYY (developer) - description
 #   04/06/2023 (htu) - initial coding based on proc_xlsx 
 #     and added pickle output 
+#   10/18/2026 (htu) - 
+#     1. used rulebuilder.read_xlsx to stream the xlsx file 
+#     2. replaced pickle output with the parquet rule cache and added 
+#        cvt_all to convert standards in parallel and skip unchanged ones
+#     3. added the repo root to sys.path so that the script runs as is 
+#     4. kept the Condition matches of get_rule_types with the cache 
 #
+#  python scripts/cvt_files.py --stds "SDTM_V2_0,SEND_V4_0" --workers 2
 #  python -c "import pandas as pd; print(pd.__version__)"
 #  python -c "import openpyxl as xl; print(xl.__version__)"
 #  pip install --force-reinstall -v "openpyxl==3.1.0"
 #
 
 
-import re 
-import pandas as pd
+import os
+import sys
+import time
+import click
 import yaml
-import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rulebuilder.read_xlsx import read_xlsx as stream_xlsx
+from rulebuilder.get_file_hash import get_file_hash
+from rulebuilder.read_rule_cache import read_rule_cache, read_cache_meta
+from rulebuilder.output_rule_cache import output_rule_cache
+from rulebuilder.get_rule_types import get_cond_types, cond_types2meta
 
 # define source data files
 source_data_files = {
@@ -34,7 +51,7 @@ rule_mapping_files = {
     "category_sheet": "Categories"
 }
 
-def read_xlsx(f_name:str, s_name:str, r_dir:str = None):
+def read_xlsx(f_name:str, s_name:str, r_dir:str = None, as_df:bool = False):
     if r_dir is None: 
         s_dir = "./data/source/xlsx"
     else:
@@ -43,18 +60,11 @@ def read_xlsx(f_name:str, s_name:str, r_dir:str = None):
 
     print(f"  Reading from {f_path}...\n  . Sheet: {s_name}")
 
-    if f_name.startswith('FDA'):
-        df = pd.read_excel(f_path, sheet_name=s_name,
-                           header=1, engine='openpyxl')
-    else:
-       df = pd.read_excel(f_path, sheet_name=s_name, engine='openpyxl')
-    # remove newline breaks in column names
-    df.columns = df.columns.str.replace('\n', '')
-    df.columns = df.columns.str.lstrip()           # remove leading spaces
-    df.columns = df.columns.str.rstrip()           # remove trailing spaces
-    # remove newline breaks in data
-    df = df.fillna('')                              # fill na with ''
-    df = df.applymap(lambda x: re.sub(r'\n\n+', '\n', str(x)))
+    # the column names are in the 2nd row of the FDA workbook
+    v_hdr = 1 if f_name.startswith('FDA') else 0
+    df = stream_xlsx(f_path, s_name=s_name, header=v_hdr)
+    if as_df:
+        return df
 
     # Convert the dataframe to a dictionary
     data = df.to_dict(orient='records')
@@ -66,46 +76,88 @@ def output2yaml(df, f_name):
         # Serialize the object and write it to the file
         yaml.dump(df, f)
 
-def output2pick(df, f_name): 
-    # Open a file for writing binary data
-    with open(f_name, 'wb') as f:
-        print(f"Writing to file: {f_name}...")
-        # Serialize the object and write it to the file
-        pickle.dump(df, f)
-
-def read_pick(fn):
-    # Open the file for reading binary data
-    with open(fn, 'rb') as f:
-        # Deserialize the object from the file
-        data = pickle.load(f)
-    # Create a DataFrame from the loaded data
-    df = pd.DataFrame(data)
-    print(df) 
-    return df   
-
 def cvt_xlsx(std: str = "SDTM_V2_0", r_dir: str = None, 
-                  s_files: dict = source_data_files):
-    
+                  s_files: dict = source_data_files, force: bool = False):
+    """
+    Converts the xlsx file of a standard to a YAML file and a parquet rule 
+    cache. The conversion is skipped if the cache says it was built from 
+    the same xlsx content, unless force is True.
+
+    Returns a dict with std, status, number of records and elapsed seconds.
+    """
+    st = time.time()
     if r_dir is None:
         s_dir = "./data/source"
     else:
         s_dir = r_dir 
     x_dir = s_dir + "/xlsx"
     y_dir = s_dir + "/yaml"
-    p_dir = s_dir + "/pick"
+    c_dir = s_dir + "/cache"
 
     fn = s_files[std]["file_name"]
     sn = s_files[std]["rule_sheet"]
-
-    df = read_xlsx(f_name=fn,s_name=sn, r_dir=x_dir)
-
-    opf = y_dir + "/" + std.lower() + ".yaml"
-    output2yaml(df, opf)
-
-    opf = p_dir + "/" + std.lower() + ".pick"
-    output2pick(df, opf)
-
-    read_pick(opf)
+    fp_xlsx = x_dir + "/" + fn
+    fp_yaml = y_dir + "/" + std.lower() + ".yaml"
+    fp_cache = c_dir + "/" + std.lower() + ".parquet"
+    r_stat = {"std": std, "status": None, "records": None, "seconds": None}
+
+    x_hash = get_file_hash(fp_xlsx)
+    if x_hash is None:
+        r_stat.update({"status": "missing", "seconds": time.time() - st})
+        return r_stat
+
+    # skip it if the YAML and its cache were built from the same xlsx 
+    if not force and read_cache_meta(fp_cache).get("xlsx_hash") == x_hash:
+        df = read_rule_cache(fp_cache, fp_yaml)
+        if df is not None:
+            r_stat.update({"status": "unchanged", "records": df.shape[0], 
+                           "seconds": time.time() - st})
+            return r_stat
+
+    df = read_xlsx(f_name=fn, s_name=sn, r_dir=x_dir, as_df=True)
+
+    output2yaml(df.to_dict(orient='records'), fp_yaml)
+    output_rule_cache(df, fp_cache, fp_yaml, x_meta={
+        "xlsx_hash": x_hash,
+        "rule_types": cond_types2meta(get_cond_types(df.get("Condition", [])))})
+
+    r_stat.update({"status": "converted", "records": df.shape[0], 
+                   "seconds": time.time() - st})
+    return r_stat
+
+
+def cvt_all(stds: list = None, r_dir: str = None, 
+            s_files: dict = source_data_files, workers: int = None,
+            force: bool = False):
+    """
+    Converts the standards in stds (default is all in s_files) concurrently
+    in a process pool and prints a timing summary per standard.
+
+    Returns a list of the dicts returned by cvt_xlsx in the order of stds.
+    """
+    st = time.time()
+    stds = list(s_files.keys()) if not stds else stds
+    workers = min(len(stds), os.cpu_count() or 1) if workers is None else workers
+    rsts = {}
+    with ProcessPoolExecutor(max_workers=max(workers, 1)) as ex:
+        futs = {ex.submit(cvt_xlsx, s, r_dir, s_files, force): s for s in stds}
+        for f in as_completed(futs):
+            s = futs[f]
+            try:
+                rsts[s] = f.result()
+            except Exception as e:
+                rsts[s] = {"std": s, "status": f"failed: {e}", 
+                           "records": None, "seconds": None}
+            print(f"  {s}: {rsts[s]['status']}")
+
+    rows = [rsts[s] for s in stds]
+    print(f"{'Standard':<12} {'Status':<12} {'Records':>8} {'Seconds':>8}")
+    for r in rows:
+        n = "" if r["records"] is None else r["records"]
+        t = "" if r["seconds"] is None else f"{r['seconds']:.2f}"
+        print(f"{r['std']:<12} {r['status']:<12} {n:>8} {t:>8}")
+    print(f"Total: {time.time() - st:.2f} seconds with {workers} worker(s)")
+    return rows
 
 
 # python -c "import pandas as pd; print(pd.__version__)"
@@ -113,8 +165,15 @@ def cvt_xlsx(std: str = "SDTM_V2_0", r_dir: str = None,
 # python -c "import yaml as y; print(y.__version__)"
 
 
+@click.command()
+@click.option('--stds', default=None, help='A list of standards to convert (default: all).')
+@click.option('--r_dir', default=None, help='The source directory (default: ./data/source).')
+@click.option('--workers', default=None, type=int, help='Number of worker processes (default: one per standard up to the number of cores).')
+@click.option('--force', is_flag=True, help='Convert even if the xlsx file has not changed.')
+def main(stds, r_dir, workers, force):
+    v_stds = None if stds is None else [s.strip().upper() for s in stds.split(',')]
+    cvt_all(stds=v_stds, r_dir=r_dir, workers=workers, force=force)
+
 
 if __name__ == '__main__':
-    for s in source_data_files.keys(): 
-        print(f"Converting Standard - {s}...")
-        df = cvt_xlsx(s, s_files=source_data_files)
+    main()
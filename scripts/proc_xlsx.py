@@ -5,16 +5,22 @@
 #   02/27/2023 (htu) - tested and made it to work
 #   03/06/2023 (htu) - added rule_mapping_files and get_rule_mapping
 #   03/07/2023 (htu) - added code to remove leading and trailing spaces in column names
+#   10/18/2026 (htu) - used rulebuilder.read_xlsx to stream the xlsx file 
+#   10/18/2026 (htu) - added the repo root to sys.path so that the script 
+#     runs as is 
 #
 #  python -c "import pandas as pd; print(pd.__version__)"
 #  python -c "import openpyxl as xl; print(xl.__version__)"
 #  pip install --force-reinstall -v "openpyxl==3.1.0"
 #
 #
-import pandas as pd
 import yaml
 import os
-import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rulebuilder.read_xlsx import read_xlsx
 
 # define source data files
 source_data_files = {
@@ -56,17 +62,9 @@ def cvt_xlsx2yaml(file_name: str, sheet_name: str, root_dir: str = '.'):
     # df = pd.read_excel(fn_src_path, sheet_name=None, engine='openpyxl')
     # df.items()
 
-    if file_name.startswith('FDA'):
-        df = pd.read_excel(fn_src_path, sheet_name=rs_name,header=1, engine='openpyxl')
-    else: 
-       df = pd.read_excel(fn_src_path, sheet_name=rs_name, engine='openpyxl') 
-    # remove newline breaks in column names
-    df.columns = df.columns.str.replace('\n', '')                   
-    df.columns = df.columns.str.lstrip();           # remove leading spaces
-    df.columns = df.columns.str.rstrip();           # remove trailing spaces
-    # remove newline breaks in data
-    df = df.fillna('')                              # fill na with ''
-    df = df.applymap(lambda x: re.sub(r'\n\n+', '\n', str(x)))
+    # the column names are in the 2nd row of the FDA workbook
+    v_hdr = 1 if file_name.startswith('FDA') else 0
+    df = read_xlsx(fn_src_path, s_name=rs_name, header=v_hdr)
 
     # Convert the dataframe to a dictionary
     data = df.to_dict(orient='records')
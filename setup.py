@@ -21,6 +21,7 @@ setup(
     python_requires=">=3.6",
     install_requires=[
         "pandas==1.5.3",
+        "pyarrow",
         "python-dotenv==1.0.0",
         "ruamel.yaml == 0.17.21"
     ],